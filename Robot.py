@@ -6,6 +6,7 @@ import sys
 import os
 from string import Template
 from .commands import *
+from .commands.worker import stop_worker
 
 if sys.version_info < (3, 3):
     raise RuntimeError('Plugin only works with Sublime Text 3')
@@ -25,3 +26,7 @@ def plugin_loaded():
             menu.write(template.safe_substitute({
                 'package_folder': os.path.basename(package_folder)
             }))
+
+
+def plugin_unloaded():
+    stop_worker()
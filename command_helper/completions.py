@@ -1,12 +1,24 @@
 import re
 import difflib
-from json import load as json_load
+from os import path
+from collections import Counter
 try:
     from db_json_settings import DBJsonSetting
+    from parser_utils.util import get_index_table_name
     from utils.get_text import get_prefix
+    from utils.util import get_cached_index_data
+    from utils.index_cache import IndexCache
+    from utils.completion_index import KeywordCompletionIndex
 except:
     from ..setting.db_json_settings import DBJsonSetting
+    from ..dataparser.parser_utils.util import get_index_table_name
     from ..command_helper.utils.get_text import get_prefix
+    from ..command_helper.utils.util import get_cached_index_data
+    from ..command_helper.utils.index_cache import IndexCache
+    from ..command_helper.utils.completion_index import \
+        KeywordCompletionIndex
+
+KEYWORD_USAGE = Counter()
 
 
 def check_prefix(line, column, prefix):
@@ -28,7 +40,7 @@ def check_prefix(line, column, prefix):
 
 
 def get_completion_list(view_index, prefix, column, object_name,
-                        one_line, rf_cell):
+                        one_line, rf_cell, limit=None):
     """Returns completion list for variables and keywords
 
     ``view_index`` -- Path to open tab index file in database.
@@ -37,6 +49,8 @@ def get_completion_list(view_index, prefix, column, object_name,
     ``object_name`` -- Library or resource object name
     ``one_line`` -- How keyword arguments are formatted
     ``rf_cell`` -- RF_CELL value from .tmPreferences
+    ``limit`` -- Maximum number of keyword completions. If given,
+                 keyword completions are ranked and best ones returned.
 
     Entry point for getting Robot Framework completion in using
     on_query_completions API from Sublime Text 3."""
@@ -48,7 +62,8 @@ def get_completion_list(view_index, prefix, column, object_name,
             prefix=prefix,
             rf_cell=rf_cell,
             object_name=object_name,
-            one_line=one_line
+            one_line=one_line,
+            limit=limit
         )
 
 
@@ -65,47 +80,23 @@ def get_kw_re_string(prefix):
 
 
 def get_kw_completion_list(view_index, prefix, rf_cell,
-                           object_name, one_line):
+                           object_name, one_line, limit=None):
     pattern = re.compile(get_kw_re_string(prefix))
     match_keywords = []
-    match_objects = []
-    for keyword in get_keywords(view_index):
-        kw = keyword[0]
-        args = keyword[1]
-        lib = keyword[2]
-        lib_alias = keyword[4]
-        if not object_name:
-            if pattern.search(kw):
-                kw = create_kw_completion_item(
-                    kw, args, rf_cell, lib, one_line
-                )
-                match_keywords.append(kw)
-        elif lib == object_name and lib != kw:
-            if pattern.search(kw):
-                kw = create_kw_completion_item(
-                    kw, args, rf_cell, lib, one_line
-                )
-                match_keywords.append(kw)
-        elif lib_alias == object_name and lib_alias != kw:
-            if pattern.search(kw):
-                kw = create_kw_completion_item(
-                    kw, args, rf_cell, lib_alias, one_line
-                )
-                match_keywords.append(kw)
-        if not object_name and lib_alias and pattern.search(lib_alias):
-            if lib_alias not in match_objects:
-                lib_comletion = create_kw_completion_item(
-                    lib_alias, '.', '', lib_alias, True
-                )
-                match_objects.append(lib_alias)
-                match_keywords.append(lib_comletion)
-        elif not object_name and pattern.search(lib):
-            if lib not in match_objects:
-                lib_comletion = create_kw_completion_item(
-                    lib, '.', '', lib, True
-                )
-                match_objects.append(lib)
-                match_keywords.append(lib_comletion)
+    kw_index = get_keyword_index(view_index)
+    if limit is None:
+        matches = kw_index.search(pattern, prefix, object_name)
+    else:
+        matches = kw_index.rank(
+            pattern, prefix, object_name, limit, KEYWORD_USAGE)
+    for keyword, source in matches:
+        if keyword:
+            kw = create_kw_completion_item(
+                keyword[0], keyword[1], rf_cell, source, one_line
+            )
+        else:
+            kw = create_kw_completion_item(source, '.', '', source, True)
+        match_keywords.append(kw)
     with_name = add_with_name(prefix, object_name, rf_cell)
     if with_name:
         match_keywords.append(with_name)
@@ -197,18 +188,67 @@ def create_var_completion_item(var, mode):
 
 
 def _get_data(view_index):
-    with open(view_index) as f:
-        return json_load(f)
+    return get_cached_index_data(view_index)
+
+
+def _create_keyword_index(view_index):
+    table = get_index_table_name(path.basename(view_index))
+    return KeywordCompletionIndex(get_keywords(view_index), table)
+
+
+KEYWORD_INDEX_CACHE = IndexCache(_create_keyword_index)
 
 
 def get_keywords(view_index):
     return _get_data(view_index)[DBJsonSetting.keywords]
 
 
+def get_keyword_index(view_index):
+    return KEYWORD_INDEX_CACHE.get(view_index)
+
+
 def get_variables(view_index):
     return _get_data(view_index)[DBJsonSetting.variables]
 
 
+def record_keyword_usage(keyword):
+    """Records that ``keyword`` was inserted from the completions.
+
+    Frequently used keywords are ranked higher in the completions.
+    """
+    KEYWORD_USAGE[keyword] += 1
+
+
+def get_inserted_items(completions):
+    """Returns the text inserted by the keyword completions mapped to
+    the keyword names.
+
+    Completions of the library and resource names, which end to a dot,
+    are not keywords and are left out.
+    """
+    items = {}
+    for trigger, completion in completions:
+        if completion.endswith('.'):
+            continue
+        items[completion.replace('\\$', '$')] = trigger.split('\t')[0]
+    return items
+
+
+def get_inserted_keyword(items, text):
+    """Returns the keyword which completion was inserted.
+
+    ``items`` -- Inserted text mapped to keyword names, as returned by
+                 the ``get_inserted_items``.
+    ``text`` -- Text before the cursor after the completion is inserted.
+
+    Returns None if the text does not end to any of the completions.
+    """
+    for completion in sorted(items, key=len, reverse=True):
+        if text.endswith(completion):
+            return items[completion]
+    return None
+
+
 def add_with_name(prefix, object_name, rf_cell):
     with_name = 'WITH NAME'
     if not object_name:
@@ -3,15 +3,19 @@ from os import path
 try:
     from parser_utils.file_formatter import rf_table_name
     from parser_utils.util import get_index_name, normalise_path
+    from parser_utils.util import get_keyword_key
     from normalize_cell import get_data_from_json
     from db_json_settings import DBJsonSetting
-    from utils.util import kw_equals_kw_candite
+    from utils.util import find_keyword
+    from utils.keyword_matcher import KeywordMatcher
 except:
     from ..dataparser.parser_utils.file_formatter import rf_table_name
     from ..dataparser.parser_utils.util import get_index_name, normalise_path
+    from ..dataparser.parser_utils.util import get_keyword_key
     from ..command_helper.normalize_cell import get_data_from_json
     from ..setting.db_json_settings import DBJsonSetting
-    from ..command_helper.utils.util import kw_equals_kw_candite
+    from ..command_helper.utils.util import find_keyword
+    from ..command_helper.utils.keyword_matcher import KeywordMatcher
 
 
 class GetKeywordDocumentation(object):
@@ -47,7 +51,8 @@ class GetKeywordDocumentation(object):
             documentation = self.get_keyword_documentation(
                 table_path,
                 kw_details.kw_object_name,
-                kw_details.kw
+                kw_details.kw,
+                kw_details.kw_key
             )
         return documentation
 
@@ -56,56 +61,46 @@ class GetKeywordDocumentation(object):
 
         ``keyword``     -- Keyword documentation to search from database.
         ``object_name`` -- Library or resource object name.
+
+        Also the key of the keyword in the table is returned, so that
+        the keyword can be read from the table without searching it.
         """
-        return_kw = None
-        return_table_name = None
-        kw_object_name = None
         KwDetails = collections.namedtuple(
             'KwDetails',
             [
                 'table_name',
                 'kw',
-                'kw_object_name'
+                'kw_object_name',
+                'kw_key'
             ]
         )
         open_tab = normalise_path(self.open_tab)
         index_name = get_index_name(rf_table_name(open_tab))
-        index_data = get_data_from_json(
-            path.join(self.index_dir, index_name)
-        )
-        for keyword_ in index_data[DBJsonSetting.keywords]:
-            kw_canditate = keyword_[0]
-            kw_object_name_alias = keyword_[4]
-            kw_table_name = keyword_[3]
-            kw_object_name = keyword_[2]
-            if (object_name and
-                    object_name == kw_object_name_alias or
-                    object_name == kw_object_name):
-                # Test kw if object names are equal
-                if kw_equals_kw_candite(keyword, kw_canditate):
-                    return_kw = kw_canditate
-                    return_table_name = kw_table_name
-                    break
-            elif not object_name:
-                if kw_equals_kw_candite(keyword, kw_canditate):
-                    return_kw = kw_canditate
-                    return_table_name = kw_table_name
-                    break
+        index_file = path.join(self.index_dir, index_name)
+        keyword_ = find_keyword(index_file, object_name, keyword)
+        if not keyword_:
+            return KwDetails(
+                table_name=None, kw=None, kw_object_name=None, kw_key=None)
         return KwDetails(
-            table_name=return_table_name,
-            kw=return_kw,
-            kw_object_name=kw_object_name
+            table_name=keyword_[3],
+            kw=keyword_[0],
+            kw_object_name=keyword_[2],
+            kw_key=get_keyword_key(keyword_[0])
         )
 
-    def get_keyword_documentation(self, table_path, object_name, keyword):
+    def get_keyword_documentation(
+            self, table_path, object_name, keyword, keyword_key=None):
         """Returns the keyword documentation from the table
 
         ``table_name``  -- Filename where the documentation is searched.
         ``keyword``     -- Keyword documentation to search from database.
         ``object_name`` -- Library or resource object name.
+        ``keyword_key`` -- Key of the keyword in the table, if known.
 
         """
         keywords = get_data_from_json(table_path)[DBJsonSetting.keywords]
-        for keyword_ in keywords:
-            if kw_equals_kw_candite(keyword, keyword_):
-                return keywords[keyword_][DBJsonSetting.documentation]
+        if keyword_key in keywords:
+            return keywords[keyword_key][DBJsonSetting.documentation]
+        keyword_ = KeywordMatcher(list(keywords)).find_first(keyword)
+        if keyword_:
+            return keywords[keyword_][DBJsonSetting.documentation]
@@ -5,12 +5,12 @@ try:
     from get_documentation import GetKeywordDocumentation
     from db_json_settings import DBJsonSetting
     from normalize_cell import get_data_from_json
-    from utils.util import kw_equals_kw_candite
+    from utils.keyword_matcher import KeywordMatcher
 except:
     from .get_documentation import GetKeywordDocumentation
     from ..setting.db_json_settings import DBJsonSetting
     from ..command_helper.normalize_cell import get_data_from_json
-    from ..command_helper.utils.util import kw_equals_kw_candite
+    from ..command_helper.utils.keyword_matcher import KeywordMatcher
 
 
 class GetKeyword(object):
@@ -44,6 +44,18 @@ class GetKeyword(object):
         Can be used to get the keyword from the robot data or from the
         Python libraries.
         """
+        regex, file_path, _ = self.return_file_and_location(
+            object_name, keyword)
+        return regex, file_path
+
+    def return_file_and_location(self, object_name, keyword):
+        """Returns regex, filename and location of the keyword
+
+        Like the ``return_file_and_patter``, but returns also the line
+        and column where the keyword is defined in the file. Location is
+        None if it is not found from the database, then the regex must
+        be used to search the keyword from the file.
+        """
         regex = None
         file_path = None
         kw_details = self.get_doc.get_table_name_from_index(
@@ -51,7 +63,7 @@ class GetKeyword(object):
             keyword
         )
         if not kw_details.table_name:
-            return regex, file_path
+            return regex, file_path, None
         table_path = path.join(self.table_dir, kw_details.table_name)
         data = get_data_from_json(table_path)
         if DBJsonSetting.file_path in data:
@@ -61,32 +73,76 @@ class GetKeyword(object):
         if self.rf_data(file_path_table):
             regex = self.get_regex_resource(kw_details.kw)
             file_path = file_path_table
-            return regex, file_path
         else:
-            return self.get_lib_keyword(
+            regex, file_path = self.get_lib_keyword(
                 table_path,
                 kw_details.kw_object_name,
-                kw_details.kw
+                kw_details.kw,
+                kw_details.kw_key,
+                data
             )
-
-    def get_lib_keyword(self, table_path, object_name, keyword):
+        location = None
+        if file_path:
+            location = self.get_keyword_location(
+                data, kw_details.kw, kw_details.kw_key)
+        return regex, file_path, location
+
+    def get_lib_keyword(
+            self, table_path, object_name, keyword, keyword_key=None,
+            data=None):
         regex = self.get_regex_library(keyword)
         file_path = self.get_lib_keyword_file(
             table_path,
             object_name,
-            keyword
+            keyword,
+            keyword_key,
+            data
         )
         return regex, file_path
 
-    def get_lib_keyword_file(self, table_path, object_name, keyword):
-        """Returns file path from db where library keyword is defined"""
-        data = get_data_from_json(table_path)
-        table_keywords = data[DBJsonSetting.keywords]
+    def get_lib_keyword_file(
+            self, table_path, object_name, keyword, keyword_key=None,
+            data=None):
+        """Returns file path from db where library keyword is defined
+
+        If the ``keyword_key`` is known, the keyword is read with it
+        instead of searching the keyword. Already read table ``data``
+        is used instead of reading the table again.
+        """
+        if data is None:
+            data = get_data_from_json(table_path)
         table_kw_object = data[DBJsonSetting.library_module]
-        for table_kw_data in table_keywords:
-            if kw_equals_kw_candite(keyword, table_kw_data):
-                if not object_name or object_name == table_kw_object:
-                    return table_keywords[table_kw_data][DBJsonSetting.keyword_file]
+        if object_name and object_name != table_kw_object:
+            return None
+        table_kw_data = self.get_table_keyword(data, keyword, keyword_key)
+        if table_kw_data:
+            return table_kw_data[DBJsonSetting.keyword_file]
+
+    def get_table_keyword(self, data, keyword, keyword_key=None):
+        """Returns the keyword from the table ``data`` or None.
+
+        Keyword is read with the ``keyword_key`` if it is known and
+        otherwise searched with the ``keyword``.
+        """
+        table_keywords = data[DBJsonSetting.keywords]
+        if keyword_key in table_keywords:
+            return table_keywords[keyword_key]
+        table_kw = KeywordMatcher(list(table_keywords)).find_first(keyword)
+        if table_kw:
+            return table_keywords[table_kw]
+
+    def get_keyword_location(self, data, keyword, keyword_key=None):
+        """Returns line and column of the keyword definition or None
+
+        Tables created before the location was stored, and libraries
+        parsed from the libdoc xml files, do not have the location.
+        """
+        table_kw = self.get_table_keyword(data, keyword, keyword_key)
+        if table_kw and table_kw.get(DBJsonSetting.keyword_line):
+            return (
+                table_kw[DBJsonSetting.keyword_line],
+                table_kw.get(DBJsonSetting.keyword_column) or 0
+            )
 
     def get_regex_library(self, keyword):
         """Returns the regex patters for library keywords"""
@@ -0,0 +1,111 @@
+import threading
+from collections import deque
+
+
+class Job(object):
+    """Single job of the JobRunner.
+
+    ``result`` is the return value of the ``function`` and ``error`` the
+    exception raised by it. ``cancelled`` is set when the job is
+    cancelled before or while it is run.
+    """
+
+    def __init__(self, key, name, function, args, kwargs, cancel):
+        self.key = key
+        self.name = name
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+        self.cancel = cancel
+        self.cancelled = False
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+    def wait(self, timeout=None):
+        """Waits until the job is done and returns True if it is done"""
+        return self.done.wait(timeout)
+
+
+class JobRunner(object):
+    """Runs jobs one at a time in a background thread.
+
+    ``on_done`` -- Called with the job, in the background thread, when
+                   the job is done, failed or cancelled.
+
+    Jobs are run in the order they are submitted. Job which has the same
+    key as a job waiting in the queue is not added again. The thread is
+    started when a job is submitted and it stops when the queue is
+    empty.
+    """
+
+    def __init__(self, on_done=None):
+        self.on_done = on_done
+        self.pending = deque()
+        self.current = None
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def submit(self, key, name, function, args=(), kwargs=None,
+               cancel=None):
+        """Adds the job to the queue and returns it.
+
+        ``key``      -- Jobs with equal key are duplicates.
+        ``name``     -- Name of the job shown to the user.
+        ``function`` -- Called with the ``args`` and ``kwargs``.
+        ``cancel``   -- Called without arguments to stop the ``function``
+                        if the job is cancelled while it is running.
+
+        If a job with the same ``key`` is already waiting, that job is
+        returned instead.
+        """
+        with self.lock:
+            for job in self.pending:
+                if job.key == key:
+                    return job
+            job = Job(key, name, function, args, kwargs or {}, cancel)
+            self.pending.append(job)
+            if not self.thread:
+                self.thread = threading.Thread(target=self._run)
+                self.thread.daemon = True
+                self.thread.start()
+        return job
+
+    def cancel(self):
+        """Cancels the waiting jobs and the running job"""
+        with self.lock:
+            pending = list(self.pending)
+            self.pending.clear()
+            current = self.current
+        for job in pending:
+            job.cancelled = True
+            self._finish(job)
+        if current:
+            current.cancelled = True
+            if current.cancel:
+                current.cancel()
+
+    def status(self):
+        """Returns the running job and number of the waiting jobs"""
+        with self.lock:
+            return self.current, len(self.pending)
+
+    def _run(self):
+        while True:
+            with self.lock:
+                if not self.pending:
+                    self.thread = None
+                    return
+                job = self.current = self.pending.popleft()
+            try:
+                job.result = job.function(*job.args, **job.kwargs)
+            except Exception as error:
+                job.error = error
+            with self.lock:
+                self.current = None
+            self._finish(job)
+
+    def _finish(self, job):
+        job.done.set()
+        if self.on_done:
+            self.on_done(job)
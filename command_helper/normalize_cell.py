@@ -1,10 +1,11 @@
 import re
-import collections
 try:
-    from utils.util import get_data_from_json, kw_equals_kw_candite
+    from utils.util import get_data_from_json
+    from utils.util import get_cached_index_data, get_keyword_matcher
     from db_json_settings import DBJsonSetting
 except:
-    from .utils.util import get_data_from_json, kw_equals_kw_candite
+    from .utils.util import get_data_from_json
+    from .utils.util import get_cached_index_data, get_keyword_matcher
     from ..setting.db_json_settings import DBJsonSetting
 
 
@@ -66,61 +67,56 @@ class ReturnKeywordAndObject(object):
         """
         self._get_data()
         keywords = self.data[DBJsonSetting.keywords]
-        object_best_match = ''
-        keyword_best_match = ''
+        matcher = get_keyword_matcher(self.current_index)
+        objects = set()
         for kw_detail in keywords:
-            object_name = kw_detail[2]
-            object_alias = kw_detail[4]
-            kw_canditate = kw_detail[0]
-            if rf_cell.startswith(object_name):
-                match_found = self._separate_worker(
-                    object_best_match,
-                    object_name,
-                    rf_cell,
-                    kw_canditate
+            objects.add(kw_detail[2])
+            if kw_detail[4]:
+                objects.add(kw_detail[4])
+        # The longest object wins, from the equally long objects
+        # the last keyword in the index.
+        best_match = None
+        for object_canditate in objects:
+            if not rf_cell.startswith(object_canditate):
+                continue
+            keyword_from_line = self._keyword_from_line(
+                object_canditate, rf_cell)
+            if not keyword_from_line:
+                continue
+            for id_ in matcher.find(keyword_from_line):
+                if self._kw_object(keywords[id_], rf_cell) != \
+                        object_canditate:
+                    continue
+                match = (
+                    len(object_canditate),
+                    id_,
+                    object_canditate,
+                    keyword_from_line
                 )
-            elif object_alias and rf_cell.startswith(object_alias):
-                match_found = self._separate_worker(
-                    object_best_match,
-                    object_alias,
-                    rf_cell,
-                    kw_canditate
-                )
-            else:
-                MatchFound = self.get_MatchFound()
-                match_found = MatchFound(object=None, keyword=None)
-            if match_found.keyword:
-                object_best_match = match_found.object
-                keyword_best_match = match_found.keyword
-        return object_best_match, keyword_best_match
+                if not best_match or match > best_match:
+                    best_match = match
+        if not best_match:
+            return '', ''
+        return best_match[2], best_match[3]
 
-    def _separate_worker(self, object_best_match, object_canditate,
-                         rf_cell, kw_canditate):
-        MatchFound = self.get_MatchFound()
-        object_ = ''
-        keyword = ''
-        if len(object_best_match) <= len(object_canditate):
-            object_re = object_canditate.replace('.', '\\.')
-            object_re = '(?:{0}\\.)(.+)'.format(object_re)
-            match = re.search(object_re, rf_cell)
-            if match:
-                keyword_from_line = match.group(1)
-            else:
-                keyword_from_line = ''
-            if kw_equals_kw_candite(keyword_from_line, kw_canditate):
-                object_ = object_canditate
-                keyword = keyword_from_line
-        return MatchFound(object=object_, keyword=keyword)
+    def _kw_object(self, kw_detail, rf_cell):
+        """Returns the object name or alias of the keyword which
+        the rf_cell starts with."""
+        object_name = kw_detail[2]
+        object_alias = kw_detail[4]
+        if rf_cell.startswith(object_name):
+            return object_name
+        elif object_alias and rf_cell.startswith(object_alias):
+            return object_alias
+        return None
 
-    def get_MatchFound(self):
-        MatchFound = collections.namedtuple(
-            'MatchFound',
-            [
-                'object',
-                'keyword'
-            ]
-        )
-        return MatchFound
+    def _keyword_from_line(self, object_canditate, rf_cell):
+        object_re = object_canditate.replace('.', '\\.')
+        object_re = '(?:{0}\\.)(.+)'.format(object_re)
+        match = re.search(object_re, rf_cell)
+        if match:
+            return match.group(1)
+        return ''
 
     def _get_data(self):
-        self.data = get_data_from_json(self.current_index)
+        self.data = get_cached_index_data(self.current_index)
@@ -0,0 +1,56 @@
+import threading
+
+
+class SaveQueue(object):
+    """Collects the saved files and updates the database for them in
+    batches.
+
+    ``scan``  -- Called with the list of the saved files, must return
+                 the names of the tables created for the files.
+    ``index`` -- Called with the list of the changed table names.
+
+    Files saved while an update is waiting are scanned by the same
+    update. If files are saved while an update is scanning, the update
+    does not index the tables. Instead the tables are indexed, together
+    with the newer saves, by the next update. Files which failed to
+    scan and tables which failed to index are scanned and indexed
+    again by the next update.
+    """
+
+    def __init__(self, scan, index):
+        self.scan = scan
+        self.index = index
+        self.files = set()
+        self.tables = set()
+        self.lock = threading.Lock()
+
+    def add(self, file_path):
+        with self.lock:
+            self.files.add(file_path)
+
+    def update(self):
+        """Scans the saved files and indexes the changed tables"""
+        with self.lock:
+            files = sorted(self.files)
+            self.files.clear()
+        if files:
+            try:
+                tables = self.scan(files)
+            except Exception:
+                with self.lock:
+                    self.files.update(files)
+                raise
+            with self.lock:
+                self.tables.update(tables)
+                if self.files:
+                    return
+        with self.lock:
+            tables = sorted(self.tables)
+            self.tables.clear()
+        if tables:
+            try:
+                self.index(tables)
+            except Exception:
+                with self.lock:
+                    self.tables.update(tables)
+                raise
@@ -0,0 +1,259 @@
+import heapq
+from os import path
+
+BOUNDARY_CHARS = ' _.'
+RESOURCE_EXTENSIONS = ('.robot', '.resource', '.txt', '.tsv', '.rst')
+LOCAL, RESOURCE, LIBRARY = range(3)
+LOCALITY_SCORE = {LOCAL: 20, RESOURCE: 10, LIBRARY: 0}
+USAGE_SCORE = 3
+MAX_USAGE = 10
+
+
+def _bitset(ids):
+    """Returns the ``ids`` as an integer where bit of each id is set"""
+    if not ids:
+        return 0
+    bits = bytearray(ids[-1] // 8 + 1)
+    for id_ in ids:
+        bits[id_ >> 3] |= 1 << (id_ & 7)
+    return int.from_bytes(bytes(bits), 'little')
+
+
+def _iter_bits(bits):
+    """Yields the set bits of the ``bits`` in ascending order"""
+    binary = bin(bits)[:1:-1]
+    position = binary.find('1')
+    while position >= 0:
+        yield position
+        position = binary.find('1', position + 1)
+
+
+def match_score(name, prefix):
+    """Returns how well the ``prefix`` matches to the ``name``.
+
+    Prefix characters are matched from left to right. Each character
+    matching to the start of a word and each character following the
+    previous match gives points and each skipped character in the name
+    takes one point. Name which starts with the prefix gets the most
+    points.
+    """
+    lower_name = name.lower()
+    lower_prefix = prefix.lower()
+    score = 0
+    if lower_name.startswith(lower_prefix):
+        score += 100
+    previous = -1
+    for char in lower_prefix:
+        position = lower_name.find(char, previous + 1)
+        if position < 0:
+            return score
+        if position == 0 or name[position - 1] in BOUNDARY_CHARS or \
+                (name[position].isupper() and name[position - 1].islower()):
+            score += 10
+        if position == previous + 1:
+            score += 5
+        else:
+            score -= position - previous - 1
+        previous = position
+    return score
+
+
+def table_locality(table, own_table):
+    """Returns is the ``table`` the ``own_table``, a resource or a library"""
+    if table == own_table:
+        return LOCAL
+    source = table.rsplit('-', 1)[0]
+    if path.splitext(source)[1].lower() in RESOURCE_EXTENSIONS:
+        return RESOURCE
+    return LIBRARY
+
+
+class NameIndex(object):
+    """Character index of the names for the fuzzy matching.
+
+    Name can match to the completion prefix only if the name contains
+    all characters of the prefix. The names containing each character
+    are stored as a bit set, which allows finding the candidates for
+    the prefix without going through all the names. Candidates are
+    then matched with the completion pattern.
+    """
+
+    def __init__(self, names):
+        self.names = names
+        self.all = (1 << len(names)) - 1
+        ids = {}
+        non_ascii = []
+        for id_, name in enumerate(names):
+            for char in set(name.lower()):
+                ids.setdefault(char, []).append(id_)
+            if not all(ord(char) < 128 for char in name):
+                non_ascii.append(id_)
+        self.chars = dict((char, _bitset(ids[char])) for char in ids)
+        # Case insensitive match of the non ascii names is left for
+        # the pattern.
+        self.non_ascii = _bitset(non_ascii)
+
+    def candidates(self, prefix):
+        """Returns bit set of the names which may match to the prefix"""
+        if '\\' in prefix:
+            return self.all
+        bits = self.all
+        for char in set(prefix.lower()):
+            if ord(char) < 128 and char.isalnum():
+                bits &= self.chars.get(char, 0) | self.non_ascii
+                if not bits:
+                    break
+        return bits
+
+    def search(self, pattern, prefix, bits=None):
+        """Returns ids of the names matching the ``pattern``.
+
+        ``pattern`` -- Compiled completion pattern created from ``prefix``
+        ``bits`` -- Bit set of the names where the search is limited
+
+        Ids are returned in the same order as the names.
+        """
+        candidates = self.candidates(prefix)
+        if bits is not None:
+            candidates &= bits
+        return [
+            id_ for id_ in _iter_bits(candidates)
+            if pattern.search(self.names[id_])
+        ]
+
+
+class KeywordCompletionIndex(object):
+    """Completion index for the keywords of the index file.
+
+    ``keywords`` -- Keywords from the index file.
+    ``table`` -- Name of the table where the index is created.
+
+    Index is created when the index file is loaded and it is used to
+    find keywords and library or resource object names matching the
+    completion prefix.
+    """
+
+    def __init__(self, keywords, table=None):
+        self.keywords = keywords
+        self.locality = [table_locality(kw[3], table) for kw in keywords]
+        self.names = NameIndex([kw[0] for kw in keywords])
+        object_ids = {}
+        self.object_order = []
+        pairs = set()
+        for id_, kw in enumerate(keywords):
+            lib, lib_alias = kw[2], kw[4]
+            object_ids.setdefault(lib, []).append(id_)
+            if lib_alias and lib_alias != lib:
+                object_ids.setdefault(lib_alias, []).append(id_)
+            if (lib, lib_alias) not in pairs:
+                pairs.add((lib, lib_alias))
+                self.object_order.append((id_, lib, lib_alias))
+        self.object_ids = dict(
+            (name, _bitset(object_ids[name])) for name in object_ids)
+        self.objects = NameIndex(list(object_ids))
+
+    def search(self, pattern, prefix, object_name=None):
+        """Returns keywords and object names matching the ``pattern``.
+
+        Returns list of (keyword, source) tuples in the order of the
+        keywords in the index. Source is the object name which is
+        shown in the completion hint. For the object name completions
+        the keyword is None.
+
+        If ``object_name`` is given, only keywords of that library or
+        resource are returned. Otherwise also the object names matching
+        the ``pattern`` are returned after the first keyword of the
+        object.
+        """
+        return [
+            (keyword, source)
+            for _, keyword, source in self._search(
+                pattern, prefix, object_name)
+        ]
+
+    def rank(self, pattern, prefix, object_name=None, limit=None,
+             usage=None):
+        """Returns ``limit`` best keywords and object names matching the
+        ``pattern``.
+
+        ``usage`` -- Mapping from keyword name to how many times the
+        keyword completion has been used.
+
+        Matches are returned in the same format as in ``search``, best
+        match first. Matches are ranked by the ``match_score`` of the
+        name and by the locality of the keyword: keywords of the table
+        itself are preferred over keywords from resources, which are
+        preferred over keywords from libraries. Frequently used keywords
+        are preferred over other keywords. Only the ``limit`` best matches
+        are kept while ranking.
+        """
+        usage = usage or {}
+
+        def score(match):
+            id_, keyword, source = match
+            name = keyword[0] if keyword else source
+            score = match_score(name, prefix)
+            score += LOCALITY_SCORE[self.locality[id_]]
+            if keyword:
+                used = min(usage.get(keyword[0], 0), MAX_USAGE)
+                score += used * USAGE_SCORE
+            return -score, id_, keyword is None
+
+        matches = self._search(pattern, prefix, object_name)
+        if limit is None:
+            matches = sorted(matches, key=score)
+        else:
+            matches = heapq.nsmallest(limit, matches, key=score)
+        return [(keyword, source) for _, keyword, source in matches]
+
+    def _search(self, pattern, prefix, object_name):
+        """Returns (id, keyword, source) of the matches. For the object
+        names the id is the first keyword of the object."""
+        if object_name:
+            return self._object_keywords(pattern, prefix, object_name)
+        matches = []
+        objects = self._objects(pattern, prefix)
+        for id_ in self.names.search(pattern, prefix):
+            while objects and objects[0][0] < id_:
+                matches.append((objects[0][0], None, objects.pop(0)[1]))
+            keyword = self.keywords[id_]
+            matches.append((id_, keyword, keyword[2]))
+        for id_, name in objects:
+            matches.append((id_, None, name))
+        return matches
+
+    def _object_keywords(self, pattern, prefix, object_name):
+        matches = []
+        bits = self.object_ids.get(object_name, 0)
+        for id_ in self.names.search(pattern, prefix, bits):
+            keyword = self.keywords[id_]
+            kw, lib, lib_alias = keyword[0], keyword[2], keyword[4]
+            if lib == object_name and lib != kw:
+                matches.append((id_, keyword, lib))
+            elif lib_alias == object_name and lib_alias != kw:
+                matches.append((id_, keyword, lib_alias))
+        return matches
+
+    def _objects(self, pattern, prefix):
+        """Returns (id, object name) of the objects matching the pattern.
+
+        Id is the first keyword of the object. Library alias is
+        preferred over the library name.
+        """
+        match = set(
+            self.objects.names[id_]
+            for id_ in self.objects.search(pattern, prefix)
+        )
+        found = set()
+        objects = []
+        for id_, lib, lib_alias in self.object_order:
+            if lib_alias and lib_alias in match:
+                name = lib_alias
+            elif lib in match:
+                name = lib
+            else:
+                continue
+            if name not in found:
+                found.add(name)
+                objects.append((id_, name))
+        return objects
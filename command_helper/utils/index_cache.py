@@ -0,0 +1,75 @@
+import os
+from collections import OrderedDict
+from threading import Lock
+try:
+    from parser_utils.util import get_shared_index_dir
+    from storage.storage import is_sqlite_path
+except:
+    from ...dataparser.parser_utils.util import get_shared_index_dir
+    from ...dataparser.storage.storage import is_sqlite_path
+
+
+class IndexCache(object):
+    """Process wide cache of the parsed index files.
+
+    ``loader`` -- Function which reads the index data from the index file.
+    ``max_size`` -- Maximum number of the index files kept in memory.
+
+    Index data is keyed by the path of the index file and it is read
+    again when the modification time or size of the index file, or
+    the shared index sets, changes. Least recently used index is
+    dropped when there are more than ``max_size`` indexes in the cache.
+    The returned data is shared and must not be modified by the caller.
+    """
+    max_size = 8
+
+    def __init__(self, loader, max_size=None):
+        self.loader = loader
+        if max_size is not None:
+            self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, index_file):
+        signature = self.signature(index_file)
+        with self.lock:
+            entry = self.entries.get(index_file)
+            if entry and entry[0] == signature:
+                self.entries.move_to_end(index_file)
+                return entry[1]
+        data = self.loader(index_file)
+        with self.lock:
+            self.entries[index_file] = (signature, data)
+            self.entries.move_to_end(index_file)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return data
+
+    def invalidate(self, index_file=None):
+        """Removes the ``index_file`` or all indexes from the cache"""
+        with self.lock:
+            if index_file is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(index_file, None)
+
+    def signature(self, index_file):
+        """Returns modification time and size of the files where the
+        index data is read.
+
+        SQLite database is written to the write ahead log before it
+        is moved to the database file, therefore both are checked.
+        """
+        index_path = os.path.dirname(index_file)
+        if is_sqlite_path(index_path):
+            files = [index_path, '{0}-wal'.format(index_path)]
+        else:
+            files = [index_file, get_shared_index_dir(index_path)]
+        return tuple(self._stat(file_) for file_ in files)
+
+    def _stat(self, file_):
+        try:
+            stat = os.stat(file_)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,73 @@
+import re
+from functools import lru_cache
+try:
+    from parser_utils.util import normalize_keyword
+except:
+    from ...dataparser.parser_utils.util import normalize_keyword
+
+EMBEDDED_ARG = re.compile(r'(?i)\$\{[\w ]*\}')
+
+
+def embedded_arg_pattern(keyword, arg_pattern=r'(\S+)'):
+    """Returns regex pattern for the keyword with embedded arguments.
+
+    Pattern matches to the normalized keyword name and each embedded
+    argument is replaced with the ``arg_pattern``.
+    """
+    parts = EMBEDDED_ARG.split(normalize_keyword(keyword))
+    return arg_pattern.join(re.escape(part) for part in parts)
+
+
+@lru_cache(maxsize=1024)
+def embedded_arg_matcher(keyword):
+    """Returns compiled regex for the keyword with embedded arguments"""
+    return re.compile(embedded_arg_pattern(keyword))
+
+
+class KeywordMatcher(object):
+    """Finds the keyword names matching to the keyword.
+
+    ``names`` -- Keyword names where the keyword is searched.
+
+    Names without embedded arguments are stored in dictionary by the
+    normalized name. Names with embedded arguments are combined to
+    single regex, which is used to check is there any match before
+    the regex of each name is tried.
+    """
+
+    def __init__(self, names):
+        self.names = names
+        self.exact = {}
+        self.embedded = []
+        for id_, name in enumerate(names):
+            if '$' in name:
+                self.embedded.append((id_, embedded_arg_matcher(name)))
+            else:
+                normalized = normalize_keyword(name).lstrip('.')
+                self.exact.setdefault(normalized, []).append(id_)
+        self.combined = None
+        if self.embedded:
+            self.combined = re.compile('|'.join(
+                '(?:{0})'.format(embedded_arg_pattern(names[id_], r'\S+'))
+                for id_, _ in self.embedded
+            ))
+
+    def find(self, keyword):
+        """Returns ids of the names matching to the ``keyword``.
+
+        Ids are returned in the same order as the names.
+        """
+        normalized = normalize_keyword(keyword)
+        ids = list(self.exact.get(normalized, []))
+        if self.combined and self.combined.search(normalized):
+            ids.extend(
+                id_ for id_, matcher in self.embedded
+                if matcher.search(normalized)
+            )
+            ids.sort()
+        return ids
+
+    def find_first(self, keyword):
+        """Returns first name matching to the ``keyword`` or None"""
+        ids = self.find(keyword)
+        return self.names[ids[0]] if ids else None
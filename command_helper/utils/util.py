@@ -1,24 +1,260 @@
-import re
+import os
+import threading
+from os import path
 from json import load as json_load
+from contextlib import contextmanager
+try:
+    from parser_utils.util import get_index_table_name, get_keyword_lookup
+    from storage.storage import get_storage, is_sqlite_path
+    from storage.storage import is_ndjson_path
+    from db_json_settings import DBJsonSetting
+    from utils.index_cache import IndexCache
+    from utils.keyword_matcher import KeywordMatcher, embedded_arg_matcher
+    from utils.keyword_matcher import normalize_keyword
+except:
+    from ...dataparser.parser_utils.util import get_index_table_name
+    from ...dataparser.parser_utils.util import get_keyword_lookup
+    from ...dataparser.storage.storage import get_storage, is_sqlite_path
+    from ...dataparser.storage.storage import is_ndjson_path
+    from ...setting.db_json_settings import DBJsonSetting
+    from .index_cache import IndexCache
+    from .keyword_matcher import KeywordMatcher, embedded_arg_matcher
+    from .keyword_matcher import normalize_keyword
+
+
+SQLITE_STORAGES = {}
+SQLITE_LOCK = threading.Lock()
+
+
+@contextmanager
+def open_storage(db_path, index_path=None):
+    """Returns the storage of the ``db_path`` as a context manager.
+
+    SQLite storage is opened once and kept open, so that the connection
+    is not created, and the schema is not checked, for every read. The
+    storage is opened again if the database file is replaced. Only one
+    thread at the time can use it. Other storages are closed at the end
+    of the ``with`` block.
+    """
+    if not is_sqlite_path(db_path):
+        storage = get_storage(db_path, index_path)
+        try:
+            yield storage
+        finally:
+            storage.close()
+        return
+    with SQLITE_LOCK:
+        file_id = _file_id(db_path)
+        storage, opened_id = SQLITE_STORAGES.get(db_path, (None, None))
+        if storage is not None and opened_id != file_id:
+            storage.close()
+            storage = None
+        if storage is None:
+            storage = get_storage(db_path, check_same_thread=False)
+            SQLITE_STORAGES[db_path] = (storage, _file_id(db_path))
+        yield storage
+
+
+def _file_id(file_path):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
 
 
 def get_data_from_json(json_file):
+    """Returns data from the json file.
+
+    If the folder of the ``json_file`` is a SQLite or NDJSON database,
+    the table with same name is read from the database.
+    """
+    db_path = path.dirname(json_file)
+    if is_sqlite_path(db_path) or is_ndjson_path(db_path):
+        with open_storage(db_path) as storage:
+            return storage.read_table(path.basename(json_file))
     f = open(json_file)
     data = json_load(f)
     f.close()
     return data
 
 
+def index_exists(index_file):
+    index_path, index_name = path.split(index_file)
+    if not is_sqlite_path(index_path):
+        return path.exists(index_file)
+    if not path.isfile(index_path):
+        return False
+    with open_storage(index_path) as storage:
+        return storage.has_index(get_index_table_name(index_name))
+
+
+def get_index_data(index_file):
+    """Returns the index keywords and variables.
+
+    Keywords and variables found from the shared sets are added to the
+    keywords and variables of the index and the keyword lookups of the
+    shared sets are merged to the lookup of the index. Index files
+    without references to the shared sets are returned as is. If the
+    folder of the ``index_file`` is a SQLite database, the index is
+    read from the database. Lookup is created for the indexes and shared
+    sets which were written without it.
+    """
+    index_path, index_name = path.split(index_file)
+    with open_storage(index_path, index_path) as storage:
+        data = storage.read_index(get_index_table_name(index_name))
+        if DBJsonSetting.shared_tables not in data:
+            if DBJsonSetting.keyword_lookup not in data:
+                data[DBJsonSetting.keyword_lookup] = get_keyword_lookup(
+                    data[DBJsonSetting.keywords])
+            return data
+        library_alias = data[DBJsonSetting.library_alias]
+        keywords = list(data[DBJsonSetting.keywords])
+        variables = list(data[DBJsonSetting.variables])
+        lookup = _get_lookup(data)
+        for table in data[DBJsonSetting.shared_tables]:
+            try:
+                shared = storage.read_shared(table)
+            except (IOError, ValueError):
+                continue
+            alias = library_alias.get(table)
+            _merge_lookup(lookup, _get_lookup(shared, len(keywords)), alias)
+            for kw in shared[DBJsonSetting.keywords]:
+                keywords.append(kw[:4] + [alias])
+            variables.extend(shared[DBJsonSetting.variables])
+    return {
+        DBJsonSetting.keywords: keywords,
+        DBJsonSetting.variables: variables,
+        DBJsonSetting.keyword_lookup: lookup
+    }
+
+
+def _get_lookup(data, offset=0):
+    lookup = data.get(DBJsonSetting.keyword_lookup)
+    if lookup is None:
+        return get_keyword_lookup(data[DBJsonSetting.keywords], offset)
+    return {
+        object_: {name: position + offset for name, position in names.items()}
+        for object_, names in lookup.items()
+    }
+
+
+def _merge_lookup(lookup, shared, alias):
+    """Adds the keywords of the shared set to the ``lookup``, also
+    with the library ``alias``. Existing keywords are not replaced."""
+    for object_, names in shared.items():
+        objects = [object_]
+        if alias and object_:
+            objects.append(alias)
+        for object_ in objects:
+            current = lookup.setdefault(object_, {})
+            for name, position in names.items():
+                current.setdefault(name, position)
+
+
+INDEX_CACHE = IndexCache(get_index_data)
+
+
+def get_cached_index_data(index_file):
+    """Returns the index data from the process wide index cache.
+
+    Index is read with ``get_index_data`` when it is not in the cache
+    or when it has changed after it was read. Returned data must not
+    be modified.
+    """
+    return INDEX_CACHE.get(index_file)
+
+
+def _create_keyword_matcher(index_file):
+    keywords = get_cached_index_data(index_file)[DBJsonSetting.keywords]
+    return KeywordMatcher([kw[0] for kw in keywords])
+
+
+KEYWORD_MATCHER_CACHE = IndexCache(_create_keyword_matcher)
+
+
+def get_keyword_matcher(index_file):
+    """Returns KeywordMatcher for the keywords of the index.
+
+    Ids returned by the matcher are indexes of the keywords in the
+    index data returned by ``get_cached_index_data``.
+    """
+    return KEYWORD_MATCHER_CACHE.get(index_file)
+
+
+def find_keyword(index_file, object_name, keyword):
+    """Returns the keyword record matching to the ``object_name`` and
+    ``keyword`` from the index, or None if there is no match.
+
+    The keyword is first searched from the keyword lookup of the index
+    and then with the KeywordMatcher, which also finds the keywords
+    with embedded arguments. If ``object_name`` is empty, the first
+    keyword matching to the ``keyword`` is returned. If the index is in
+    a SQLite database, the keyword is first searched with the indexed
+    queries, without reading all the shared sets of the index.
+    """
+    if is_sqlite_path(path.dirname(index_file)):
+        keyword_ = _find_indexed_keyword(index_file, object_name, keyword)
+        if keyword_:
+            return keyword_
+    data = get_cached_index_data(index_file)
+    keywords = data[DBJsonSetting.keywords]
+    names = data[DBJsonSetting.keyword_lookup].get(object_name or '', {})
+    position = names.get(normalize_keyword(keyword))
+    if position is not None:
+        return keywords[position]
+    for id_ in get_keyword_matcher(index_file).find(keyword):
+        keyword_ = keywords[id_]
+        if (not object_name or
+                object_name == keyword_[4] or
+                object_name == keyword_[2]):
+            return keyword_
+    return None
+
+
+def _find_indexed_keyword(index_file, object_name, keyword):
+    """Returns the keyword record from the index in a SQLite database.
+
+    Only the index and the shared sets which contain the keyword, as
+    found by the ``find_keyword`` query of the storage, are read.
+    Returns None if the keyword is not found by its name.
+    """
+    index_path, index_name = path.split(index_file)
+    name = normalize_keyword(keyword)
+    object_name = object_name or ''
+    with open_storage(index_path) as storage:
+        data = storage.read_index(get_index_table_name(index_name))
+        position = _get_lookup(data).get(object_name, {}).get(name)
+        if position is not None:
+            return data[DBJsonSetting.keywords][position]
+        if DBJsonSetting.shared_tables not in data:
+            return None
+        tables = data[DBJsonSetting.shared_tables]
+        found = set(storage.find_keyword(keyword, tables))
+        library_alias = data[DBJsonSetting.library_alias]
+        for table in tables:
+            if table not in found:
+                continue
+            try:
+                shared = storage.read_shared(table)
+            except (IOError, ValueError):
+                continue
+            alias = library_alias.get(table)
+            lookup = {}
+            _merge_lookup(lookup, _get_lookup(shared), alias)
+            position = lookup.get(object_name, {}).get(name)
+            if position is not None:
+                return shared[DBJsonSetting.keywords][position][:4] + [alias]
+    return None
+
+
 def _keyword_with_embedded_arg(kw, kw_candite):
-    kw = kw.lower().replace(' ', '').replace('_', '')
-    kw_candite = kw_candite.lower().replace(' ', '').replace('_', '')
-    kw_re = re.sub(r'(?i)(\$\{[\w ]*\})', r'(?i)(\\S+)', kw_candite)
-    return re.search(kw_re, kw)
+    return embedded_arg_matcher(kw_candite).search(normalize_keyword(kw))
 
 
 def _keyword_no_embedded_arg(kw, kw_candite):
-    kw = kw.lower().replace(' ', '').replace('_', '')
-    kw_candite = kw_candite.lower().replace(' ', '').replace('_', '')
+    kw = normalize_keyword(kw)
+    kw_candite = normalize_keyword(kw_candite)
     kw_candite = kw_candite.lstrip('.')
     return kw == kw_candite
 
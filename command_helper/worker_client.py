@@ -0,0 +1,112 @@
+import json
+import subprocess
+import threading
+from platform import system
+
+
+class WorkerClient(object):
+    """Client for the scanning and indexing worker process.
+
+    ``python_binary`` -- Python used to run the worker.
+    ``worker_runner`` -- Path to the dataparser/run_worker.py.
+    ``log_file``      -- File where output of the worker is appended.
+
+    The worker is started on the first call and it is started again
+    if it has stopped. Jobs are sent to the worker as JSON-RPC requests
+    one at a time, concurrent callers wait until the previous job is
+    done.
+    """
+
+    def __init__(self, python_binary, worker_runner, log_file):
+        self.python_binary = python_binary
+        self.worker_runner = worker_runner
+        self.log_file = log_file
+        self.process = None
+        self.log = None
+        self.request_id = 0
+        self.lock = threading.Lock()
+
+    def call(self, method, **params):
+        """Runs the ``method`` in the worker and returns the result.
+
+        Raises ValueError if the job fails or the worker stops.
+        """
+        with self.lock:
+            self._start()
+            self.request_id += 1
+            request = {
+                'jsonrpc': '2.0',
+                'id': self.request_id,
+                'method': method,
+                'params': params
+            }
+            try:
+                self.process.stdin.write(json.dumps(request) + '\n')
+                self.process.stdin.flush()
+                line = self.process.stdout.readline()
+            except (IOError, ValueError):
+                line = None
+            if not line:
+                self._kill()
+                raise ValueError(
+                    'Worker stopped while running: {0}'.format(method))
+            response = json.loads(line)
+            if 'error' in response:
+                raise ValueError(
+                    'Error in {0}: {1}'.format(
+                        method, response['error']['message']))
+            return response.get('result')
+
+    def is_running(self):
+        return self.process is not None and self.process.poll() is None
+
+    def cancel(self):
+        """Kills the worker to stop the running job. The job raises
+        ValueError and the worker is started again by the next call."""
+        process = self.process
+        if process and process.poll() is None:
+            process.kill()
+
+    def stop(self, timeout=10):
+        """Asks the worker to shut down and waits ``timeout`` seconds
+        before the process is killed."""
+        with self.lock:
+            if self.is_running():
+                request = {'jsonrpc': '2.0', 'method': 'shutdown'}
+                try:
+                    self.process.stdin.write(json.dumps(request) + '\n')
+                    self.process.stdin.flush()
+                    self.process.wait(timeout)
+                except (IOError, ValueError, subprocess.TimeoutExpired):
+                    pass
+            self._kill()
+
+    def _start(self):
+        if self.is_running():
+            return
+        self._kill()
+        startupinfo = None
+        if system() == 'Windows':
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        self.log = open(self.log_file, 'a')
+        self.process = subprocess.Popen(
+            [self.python_binary, self.worker_runner],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=self.log,
+            universal_newlines=True,
+            startupinfo=startupinfo
+        )
+
+    def _kill(self):
+        if self.is_running():
+            self.process.kill()
+            self.process.wait()
+        if self.process:
+            self.process.stdin.close()
+            self.process.stdout.close()
+        if self.log:
+            self.log.close()
+        self.process = None
+        self.log = None
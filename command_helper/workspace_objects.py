@@ -1,9 +1,8 @@
-from os import listdir, path
 try:
-    from .normalize_cell import get_data_from_json
+    from utils.util import open_storage
     from db_json_settings import DBJsonSetting
 except:
-    from ..command_helper.normalize_cell import get_data_from_json
+    from .utils.util import open_storage
     from ..setting.db_json_settings import DBJsonSetting
 
 
@@ -38,10 +37,17 @@ class WorkSpaceObjects(object):
             raise ValueError('Invalid import_type: {0}'.format(import_type))
         return imports
 
+    def read_tables(self, table_type):
+        """Returns the tables of the ``table_type``.
+
+        SQLite database finds the tables of the type with an indexed query.
+        """
+        with open_storage(self.view_db) as storage:
+            return list(storage.read_tables(table_type))
+
     def get_libraries(self):
         libraries = []
-        for file in listdir(self.view_db):
-            data = get_data_from_json(path.join(self.view_db, file))
+        for data in self.read_tables(DBJsonSetting.library):
             if self.is_library(data):
                 if 'BuiltIn' not in data[DBJsonSetting.library_module]:
                     libraries.append(self.get_library_import(data))
@@ -66,8 +72,7 @@ class WorkSpaceObjects(object):
 
     def get_resources(self):
         resources = []
-        for file in listdir(self.view_db):
-            data = get_data_from_json(path.join(self.view_db, file))
+        for data in self.read_tables(DBJsonSetting.resource_file):
             if self.is_resource(data):
                 resources.append(self.get_resource_or_variable_import(data))
         return resources
@@ -87,8 +92,7 @@ class WorkSpaceObjects(object):
 
     def get_variables(self):
         variables = []
-        for file in listdir(self.view_db):
-            data = get_data_from_json(path.join(self.view_db, file))
+        for data in self.read_tables(DBJsonSetting.variable_file):
             if self.is_variable_file(data):
                 variables.append(self.get_resource_or_variable_import(data))
         return variables
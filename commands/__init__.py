@@ -1,3 +1,4 @@
+from .cancel_jobs import CancelJobsCommand
 from .command_logging import LogCommands
 from .index_open_tab import IndexOpenTabCommand
 from .jump_to_keyword import JumpToKeyword
@@ -13,6 +14,7 @@ from .setting_import_helper import SettingImporter
 from .show_documentation import ShowKeywordDocumentation
 
 __all__ = [
+    'CancelJobsCommand',
     'IndexOpenTabCommand',
     'InsertImport',
     'JumpToKeyword',
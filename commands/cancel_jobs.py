@@ -0,0 +1,10 @@
+import sublime_plugin
+from .worker import cancel_jobs
+
+
+class CancelJobsCommand(sublime_plugin.TextCommand):
+
+    def run(self, edit):
+        """Command to cancel the running and queued scanning and
+        indexing jobs"""
+        cancel_jobs()
@@ -47,11 +47,13 @@ class JumpToKeyword(sublime_plugin.TextCommand):
                 open_tab=open_tab,
                 rf_extension=rf_extension
             )
-            regex, file_path = get_kw.return_file_and_patter(
+            regex, file_path, location = get_kw.return_file_and_location(
                 object_name=object_name,
                 keyword=keyword
             )
-            if file_path:
+            if file_path and location:
+                self.go_to_location(file_path, location)
+            elif file_path:
                 self.go_to_kw(file_path, regex)
             else:
                 sublime.status_message(
@@ -72,6 +74,14 @@ class JumpToKeyword(sublime_plugin.TextCommand):
         else:
             return line
 
+    def go_to_location(self, file_path, location):
+        """Opens the file at the line and column of the keyword"""
+        line, column = location
+        self.view.window().open_file(
+            '{0}:{1}:{2}'.format(file_path, line, column + 1),
+            sublime.ENCODED_POSITION
+        )
+
     def go_to_kw(self, file_path, regex):
         new_view = self.view.window().open_file(file_path)
         sublime.set_timeout(lambda: self.select_keyword(new_view, regex), 10)
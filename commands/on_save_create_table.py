@@ -2,12 +2,56 @@ import sublime_plugin
 import sublime
 from ..setting.setting import get_setting
 from ..setting.setting import SettingObject
+from ..command_helper.save_queue import SaveQueue
+from .scan import scan_params
+from .scan_and_index import index_params
+from .scan_open_tab import file_in_workspace
+from .worker import get_worker
+from .worker import submit_function
+
+# Milliseconds to wait for more saves before the database is updated
+DEBOUNCE = 500
+
+
+def scan_saved(files):
+    params = scan_params()
+    params['file_paths'] = files
+    return get_worker().call('scan_files', **params)
+
+
+def index_saved(tables):
+    params = index_params()
+    params['changed_tables'] = tables
+    get_worker().call('index_changed', **params)
+
+
+SAVED = SaveQueue(scan_saved, index_saved)
+GENERATION = 0
 
 
 class OnSaveCreateTable(sublime_plugin.EventListener):
-    """Enables automatic database table creation after file is saved"""
+    """Enables automatic database table creation after file is saved.
+
+    Saves are collected for the ``DEBOUNCE`` time, after which the saved
+    files are scanned and the tables depending on them are indexed in
+    one background job.
+    """
 
     def on_post_save_async(self, view):
-        if get_setting(SettingObject.automatic_database_update):
-            view.run_command('scan_open_tab')
-            view.run_command('index_open_tab')
+        global GENERATION
+        if not get_setting(SettingObject.automatic_database_update):
+            return
+        file_name = view.file_name()
+        if not file_name or not file_in_workspace(file_name):
+            return
+        SAVED.add(file_name)
+        GENERATION += 1
+        generation = GENERATION
+        sublime.set_timeout_async(
+            lambda: self.update_database(generation), DEBOUNCE)
+
+    def update_database(self, generation):
+        if generation == GENERATION:
+            submit_function(
+                'Updating database', SAVED.update,
+                cancel=get_worker().cancel)
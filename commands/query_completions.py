@@ -1,17 +1,30 @@
 import sublime_plugin
 import sublime
+import re
 from os import path
 from ..command_helper.completions import get_completion_list, check_prefix
+from ..command_helper.completions import record_keyword_usage
+from ..command_helper.completions import get_inserted_items
+from ..command_helper.completions import get_inserted_keyword
 from ..setting.setting import get_setting
 from ..setting.setting import SettingObject
 from ..setting.db_json_settings import DBJsonSetting
 from ..dataparser.parser_utils.file_formatter import rf_table_name
 from ..dataparser.parser_utils.util import get_index_name, normalise_path
 from ..command_helper.utils.get_text import get_line
+from ..command_helper.utils.util import index_exists
 from ..command_helper.utils.get_text import get_object_from_line
 from ..command_helper.get_metadata import get_rf_table_separator
 
 SNIPPET_TRIGGER = [':f', '*', ':']
+COMMIT_COMMANDS = ['commit_completion', 'insert_best_completion']
+# Keyword completions are limited only when the prefix has at least this
+# many characters. Sublime Text 3 filters the returned list while user
+# types and does not query completions again, so keywords left out from
+# the limited list would not be found with a longer prefix.
+LIMIT_MIN_PREFIX = 3
+# Sublime Text 4 queries the completions again when the prefix changes
+DYNAMIC_COMPLETIONS = getattr(sublime, 'DYNAMIC_COMPLETIONS', 0)
 
 
 def get_index_file(open_tab):
@@ -21,12 +34,15 @@ def get_index_file(open_tab):
         get_setting(SettingObject.index_dir),
         index_name
     )
-    if not path.exists(index_file):
+    if not index_exists(index_file):
         index_file = None
     return index_file
 
 
 class RobotCompletion(sublime_plugin.EventListener):
+    # Inserted text and keyword names of the latest keyword completions
+    # in each view
+    completions = {}
 
     def on_query_completions(self, view, prefix, locations):
         selection = view.sel()[0]
@@ -61,11 +77,39 @@ class RobotCompletion(sublime_plugin.EventListener):
         rf_cell = get_rf_table_separator(view)
         object_name = get_object_from_line(line, prefix, column)
         arg_format = get_setting(SettingObject.arg_format)
-        return get_completion_list(
+        limit = get_setting(SettingObject.completion_limit)
+        if len(new_prefix) < LIMIT_MIN_PREFIX:
+            limit = None
+        completions = get_completion_list(
             view_index=index_file,
             prefix=new_prefix,
             column=new_column,
             object_name=object_name,
             one_line=arg_format,
-            rf_cell=rf_cell
+            rf_cell=rf_cell,
+            limit=limit
         )
+        if re.search(r'[\$\@\&]', new_prefix):
+            self.completions.pop(view.id(), None)
+        else:
+            self.completions[view.id()] = get_inserted_items(completions)
+        if limit is not None:
+            return (completions, DYNAMIC_COMPLETIONS)
+        return completions
+
+    def on_post_text_command(self, view, command_name, args):
+        """Records the keyword inserted from the completions."""
+        if command_name not in COMMIT_COMMANDS:
+            return
+        items = self.completions.pop(view.id(), None)
+        if not items:
+            return
+        point = view.sel()[0].begin()
+        length = max(len(completion) for completion in items)
+        text = view.substr(sublime.Region(max(point - length, 0), point))
+        keyword = get_inserted_keyword(items, text)
+        if keyword:
+            record_keyword_usage(keyword)
+
+    def on_close(self, view):
+        self.completions.pop(view.id(), None)
@@ -1,67 +1,74 @@
 import sublime_plugin
-import sublime
-import subprocess
-from platform import system
-from os import path, makedirs
 from ..setting.setting import get_setting, get_path_file
 from ..setting.setting import SettingObject
+from .worker import get_worker
+from .worker import submit_function
+from .worker import submit_job
 
 
-def scan_popen_arg_parser(mode):
-    arg_list = []
-    arg_list.append(get_setting(SettingObject.python_binary))
-    arg_list.append(get_setting(SettingObject.scanner_runner))
-    arg_list.append(mode)
-    arg_list.append('--db_path')
-    arg_list.append(get_setting(SettingObject.table_dir))
-    arg_list.append('--extension')
-    arg_list.append(get_setting(SettingObject.extension))
-    arg_list.append('--path_to_lib_in_xml')
-    arg_list.append(get_setting(SettingObject.lib_in_xml))
-    arg_list.append('--module_search_path')
-    for module in get_setting(SettingObject.module_search_path):
-        arg_list.append(module)
+def scan_params():
+    """Returns the parameters common to the scanning jobs"""
+    params = {
+        'db_path': get_setting(SettingObject.table_dir),
+        'libs_in_xml': get_setting(SettingObject.lib_in_xml),
+        'module_search_path': get_setting(SettingObject.module_search_path),
+        'path_file': None,
+        'libdoc_cache': get_setting(SettingObject.libdoc_cache)
+    }
     if get_setting(SettingObject.path_file):
-        arg_list.append('--path_file')
-        arg_list.append(get_path_file(SettingObject.path_file))
-    return arg_list
+        params['path_file'] = get_path_file(SettingObject.path_file)
+    return params
+
+
+def index_params():
+    """Returns the parameters common to the indexing jobs"""
+    return {
+        'db_path': get_setting(SettingObject.table_dir),
+        'index_path': get_setting(SettingObject.index_dir),
+        'module_search_path': get_setting(SettingObject.module_search_path),
+        'libs_in_xml': get_setting(SettingObject.lib_in_xml),
+        'workers': get_setting(SettingObject.index_workers)
+    }
+
+
+def complete_tables(params, index):
+    """Parses the keyword details of the tables created by the lazy scan
+    and indexes the completed tables, if ``index`` params are given."""
+    worker = get_worker()
+    tables = worker.call('complete_tables', **params)
+    if index and tables:
+        worker.call('index_changed', changed_tables=tables, **index)
+
+
+def submit_complete_tables(index=False):
+    if not get_setting(SettingObject.lazy_scan):
+        return None
+    return submit_function(
+        'Parsing keyword details', complete_tables, scan_params(),
+        index_params() if index else None, cancel=get_worker().cancel)
 
 
 class ScanCommand(sublime_plugin.TextCommand):
 
-    def run(self, edit):
+    def run(self, edit, complete=True):
         """Command to scan RF files and create database tables
 
         Purpose of the command is iterate over the files found from
         the robot_framework_workspace and create database tables.
         Also all imports, from found files, will be iterated and
-        table is created also from imports.
+        table is created also from imports. If lazy scan is used and
+        ``complete`` is True, keyword details are parsed after the scan.
         """
-        log_file = get_setting(SettingObject.log_file)
-        makedirs(path.dirname(log_file), exist_ok=True)
-        file_ = open(log_file, 'a')
-        sublime.set_timeout_async(self.run_scan(file_), 0)
-        file_.close()
+        self.run_scan()
+        if complete:
+            submit_complete_tables()
 
-    def run_scan(self, log_file):
-        startupinfo = None
-        if system() == 'Windows':
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-        p_args = scan_popen_arg_parser('all')
-        p_args.append('--workspace')
-        p_args.append(get_setting(SettingObject.workspace))
-        print((" ".join(p_args)))
-        p = subprocess.Popen(
-            p_args,
-            stderr=subprocess.STDOUT,
-            stdout=log_file,
-            startupinfo=startupinfo
-        )
-        rc = p.wait()
-        if rc != 0:
-            print('See log file from database directory for details')
-            raise ValueError('Error in scanning result code: {0}'.format(rc))
-        message = 'Scaning done with rc: {0}'.format(rc)
-        sublime.status_message(message)
-        print(message)
+    def run_scan(self):
+        params = scan_params()
+        params['workspace'] = get_setting(SettingObject.workspace)
+        params['extension'] = get_setting(SettingObject.extension)
+        params['incremental'] = bool(
+            get_setting(SettingObject.incremental_scan))
+        params['lazy'] = bool(get_setting(SettingObject.lazy_scan))
+        print('Scanning: {0}'.format(params['workspace']))
+        return submit_job('Scanning', 'scan_all', **params)
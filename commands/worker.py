@@ -0,0 +1,100 @@
+import json
+import sublime
+from os import path, makedirs
+from ..setting.setting import get_setting
+from ..setting.setting import SettingObject
+from ..command_helper.worker_client import WorkerClient
+from ..command_helper.job_runner import JobRunner
+
+WORKER = None
+SPINNER = '|/-\\'
+PROGRESS_INTERVAL = 250
+
+
+def get_worker():
+    """Returns the worker client, worker is replaced if the settings
+    used to start it have changed."""
+    global WORKER
+    python_binary = get_setting(SettingObject.python_binary)
+    worker_runner = get_setting(SettingObject.worker_runner)
+    log_file = get_setting(SettingObject.log_file)
+    if WORKER and (
+            WORKER.python_binary != python_binary or
+            WORKER.worker_runner != worker_runner or
+            WORKER.log_file != log_file):
+        WORKER.stop()
+        WORKER = None
+    if not WORKER:
+        makedirs(path.dirname(log_file), exist_ok=True)
+        WORKER = WorkerClient(python_binary, worker_runner, log_file)
+    return WORKER
+
+
+def stop_worker():
+    global WORKER
+    JOBS.cancel()
+    if WORKER:
+        WORKER.stop()
+        WORKER = None
+
+
+def submit_job(name, method, **params):
+    """Runs the scanning or indexing ``method`` in the background.
+
+    Same job is not queued twice and the progress is shown in the
+    status bar until all jobs are done.
+    """
+    worker = get_worker()
+    key = (method, json.dumps(params, sort_keys=True))
+    job = JOBS.submit(
+        key, name, worker.call, (method,), params, cancel=worker.cancel)
+    show_progress()
+    return job
+
+
+def submit_function(name, function, *args, cancel=None):
+    """Runs the ``function`` in the background after the queued jobs"""
+    key = (function.__name__, json.dumps(args, sort_keys=True))
+    job = JOBS.submit(key, name, function, args, cancel=cancel)
+    show_progress()
+    return job
+
+
+def cancel_jobs():
+    JOBS.cancel()
+
+
+def show_progress(step=0):
+    global PROGRESS
+    current, pending = JOBS.status()
+    if not current and not pending:
+        PROGRESS = False
+        return
+    if step == 0:
+        if PROGRESS:
+            return
+        PROGRESS = True
+    if current:
+        message = 'Robot Framework: {0} {1}'.format(
+            current.name, SPINNER[step % len(SPINNER)])
+        if pending:
+            message = '{0} ({1} queued)'.format(message, pending)
+        sublime.status_message(message)
+    sublime.set_timeout(lambda: show_progress(step + 1), PROGRESS_INTERVAL)
+
+
+def job_done(job):
+    if job.cancelled:
+        message = 'Robot Framework: {0} cancelled'.format(job.name)
+    elif job.error:
+        message = 'Robot Framework: {0} failed: {1}'.format(
+            job.name, job.error)
+        print('See log file from database directory for details')
+    else:
+        message = 'Robot Framework: {0} done'.format(job.name)
+    print(message)
+    sublime.set_timeout(lambda: sublime.status_message(message), 0)
+
+
+PROGRESS = False
+JOBS = JobRunner(on_done=job_done)
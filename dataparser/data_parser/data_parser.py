@@ -15,11 +15,15 @@ import xml.etree.ElementTree as ET
 from tempfile import mkdtemp
 import logging
 import inspect
+import linecache
 from parser_utils.util import normalise_path
+from parser_utils.file_formatter import lib_import_table_name
+from data_parser.libdoc_cache import LibdocCache
 from db_json_settings import DBJsonSetting
 # Test import with new parser from RobotFramework 4
 # from rf-4-parser import SampleVisitor
-from parser_utils.rf4_parser import SampleVisitor
+from parser_utils.rf4_parser import SampleVisitor, HeaderVisitor
+from parser_utils.token_parser import TokenExtractor
 # Import stuff for dispatching variables in names and arguments
 # from parser_utils.path_variables import init_path_variables
 from parser_utils.path_vars import init_path_variables
@@ -41,14 +45,23 @@ class DataParser():
     resource and test suite files.
     """
 
-    def __init__(self, path_file):
+    def __init__(self, path_file=None, libdoc_cache=None):
         self.file_path = None
         self.rf_variables = Variables()
         self.rf_var_storage = VariableStore(self.rf_variables)
         self.libdoc = LibraryDocBuilder()
         self.path_variables = init_path_variables(path_file)
+        self.libdoc_cache = None
+        if libdoc_cache:
+            self.libdoc_cache = LibdocCache(libdoc_cache)
 
-    def parse_resource(self, file_path):
+    def parse_resource(self, file_path, details=True):
+        """Parses RF resource file to dictionary
+
+        If ``details`` is False, only the imports, variables and keyword
+        names are parsed and the data is marked as partial. Keyword
+        arguments, documentation and tags are then left empty.
+        """
         self.file_path = file_path
         if path.exists(file_path):
             if '__init__.' in file_path:
@@ -56,16 +69,15 @@ class DataParser():
                 # model = parsing.TestDataDirectory(source=folder).populate()
                 # data = self._parse_dir(folder)
                 # for table in data:
-                file_model = get_init_model(file_path)
+                get_model = get_init_model
                 # model = SampleVisitor()
                 # model.visit(file_model)
 
             else:
                 # model = parsing.ResourceFile(file_path).populate()
-                file_model = get_resource_model(file_path)
-            model = SampleVisitor()
-            model.visit(file_model)
-            data =  self._parse_robot_data(file_path, model)
+                get_model = get_resource_model
+            model = self._read_model(file_path, get_model, details)
+            data =  self._parse_robot_data(file_path, model, details)
             data[DBJsonSetting.table_type] = DBJsonSetting.resource_file
             return data
         else:
@@ -87,14 +99,14 @@ class DataParser():
     #         data.append(self._parse_robot_data(file_name, file_model))
     #     return data
 
-    def parse_suite(self, file_path):
+    def parse_suite(self, file_path, details=True):
+        """Parses RF test suite file to dictionary, ``details`` is used
+        like in the parse_resource"""
         self.file_path = file_path
         if path.exists(file_path):
             # model = parsing.TestCaseFile(source=file_path).populate()
-            file_model = get_resource_model(file_path)
-            model = SampleVisitor()
-            model.visit(file_model)
-            data = self._parse_robot_data(file_path, model)
+            model = self._read_model(file_path, get_resource_model, details)
+            data = self._parse_robot_data(file_path, model, details)
             data[DBJsonSetting.table_type] = DBJsonSetting.suite
             return data
         else:
@@ -126,8 +138,19 @@ class DataParser():
 
         Uses internally libdoc modules to parse the library.
         Possible arguments to the library are provided in the
-        args parameter.
+        args parameter. If libdoc cache is in use, the library is
+        parsed only when it is not found from the cache.
         """
+        if self.libdoc_cache:
+            data = self.libdoc_cache.get(library, args)
+            if data:
+                return data
+        data = self._parse_library(library, args)
+        if self.libdoc_cache:
+            self.libdoc_cache.put(library, args, data)
+        return data
+
+    def _parse_library(self, library, args):
         data = {}
         if not args:
             data[DBJsonSetting.arguments] = []
@@ -203,6 +226,10 @@ class DataParser():
                 function_name = keyword.name
             kw[DBJsonSetting.keyword_file] = self._get_library_kw_source(
                 libcode, function_name)
+            line, column = self._get_library_kw_location(
+                libcode, function_name)
+            kw[DBJsonSetting.keyword_line] = line
+            kw[DBJsonSetting.keyword_column] = column
             kws[strip_and_lower(keyword.name)] = kw
         return kws
     
@@ -263,17 +290,35 @@ class DataParser():
                 kw_deco[method_attrib.robot_name] = name
         return kw_deco
 
-    def _get_library_kw_source(self, libcode, keyword):
+    def _get_library_kw_code(self, libcode, keyword):
+        """Returns the code object of the keyword function.
+
+        Functions decorated with ``functools.wraps`` are unwrapped, so
+        that the code is the keyword function and not the decorator.
+        Returns None if the function or its code is not found.
+        """
         kw_func = keyword.lower().replace(' ', '_')
-        func = None
-        func_file = None
-        if hasattr(libcode, kw_func):
-            func = getattr(libcode, kw_func)
-        else:
-            func_file, func = None, None
-        if func:
-            return func.__code__.co_filename
-        return func_file
+        func = inspect.unwrap(getattr(libcode, kw_func, None))
+        return getattr(func, '__code__', None)
+
+    def _get_library_kw_source(self, libcode, keyword):
+        code = self._get_library_kw_code(libcode, keyword)
+        if code:
+            return code.co_filename
+        return None
+
+    def _get_library_kw_location(self, libcode, keyword):
+        """Returns line and column where the keyword function is defined.
+
+        Line is the ``co_firstlineno`` of the function, which is the
+        line of the first decorator for the decorated functions. Returns
+        None, None if the function or its code is not found.
+        """
+        code = self._get_library_kw_code(libcode, keyword)
+        if not code:
+            return None, None
+        line = linecache.getline(code.co_filename, code.co_firstlineno)
+        return code.co_firstlineno, len(line) - len(line.lstrip())
 
     def get_class_that_defined_method(self, meth):
         try:
@@ -344,8 +389,26 @@ class DataParser():
             kws[strip_and_lower(kw[DBJsonSetting.keyword_name])] = kw
         return kws
 
-    def _parse_robot_data(self, file_path, model):
+    def _read_model(self, file_path, get_model, details):
+        """Returns keywords, variables and imports of the file.
+
+        Files in the plain text format are read with the TokenExtractor,
+        which is faster than building the model. Other formats, like
+        reStructuredText, are parsed with the Robot Framework parser.
+        """
+        if file_path.lower().endswith(TokenExtractor.extensions):
+            return TokenExtractor(details).extract(file_path)
+        return self._visit(get_model(file_path, data_only=not details), details)
+
+    def _visit(self, file_model, details):
+        model = SampleVisitor() if details else HeaderVisitor()
+        model.visit(file_model)
+        return model
+
+    def _parse_robot_data(self, file_path, model, details=True):
         data = {}
+        if not details:
+            data[DBJsonSetting.partial] = True
         data[DBJsonSetting.file_name] = path.basename(file_path)
         data[DBJsonSetting.file_path] = normalise_path(file_path)
         data[DBJsonSetting.keywords] = self._get_keywords(model)
@@ -377,6 +440,8 @@ class DataParser():
             tmp[DBJsonSetting.documentation] = kw.doc
             tmp[DBJsonSetting.tags] = kw.tags
             tmp[DBJsonSetting.keyword_name] = kw.name
+            tmp[DBJsonSetting.keyword_line] = kw.lineno
+            tmp[DBJsonSetting.keyword_column] = kw.col_offset
             kw_data[strip_and_lower(kw.name)] = tmp
         return kw_data
 
@@ -429,6 +494,8 @@ class DataParser():
         # data[DBJsonSetting.library_arguments] = setting.args
         data[DBJsonSetting.library_arguments] = processed_lib_args
         data[DBJsonSetting.library_path] = lib_path
+        data[DBJsonSetting.library_table] = lib_import_table_name(
+            processed_lib_name, lib_path)
         return data
 
     # TODO: Add proccess variables in import.
@@ -449,13 +516,15 @@ class DataParser():
     # TODO: Add proccess variables in import.
     def _format_variable_file(self, setting):
         data = {}
-        v_path = normalise_path(path.join(
-            path.dirname(self.file_path), setting.name))
         args = {}
         processed_var_name, processed_var_args = self._check_and_replace_vars(setting.name, setting.args)
         # args['variable_file_arguments'] = setting.args
         args['variable_file_arguments'] = processed_var_args
-        # data[v_path] = args
+        if not path.isabs(processed_var_name):
+            v_path = normalise_path(path.join(
+                path.dirname(self.file_path), processed_var_name))
+            if path.isfile(v_path):
+                processed_var_name = v_path
         data[processed_var_name] = args
         return data
 
@@ -0,0 +1,127 @@
+import os
+import json
+import logging
+from hashlib import md5
+from robot.version import get_version
+from parser_utils.util import normalise_path
+from parser_utils.library_source import library_source, package_files
+from parser_utils.library_source import distribution_version
+from parser_utils.library_source import get_distributions
+
+
+class LibdocCache(object):
+    """Persistent cache for the parsed library documentation.
+
+    Parsed library is stored as json file in the ``cache_dir``. Entry
+    is keyed by the library name, the source file of the library,
+    the installed distribution version, the Robot Framework version
+    and the library arguments. For a package library which is not
+    installed as a distribution, all Python files of the package are
+    part of the key. Least recently used entries are removed when the
+    cache is opened, and after every ``evict_interval`` stored
+    entries, if the total size of the cache exceeds the ``max_size``
+    bytes.
+    """
+    max_size = 100 * 1024 * 1024
+    evict_interval = 100
+
+    def __init__(self, cache_dir, max_size=None):
+        self.cache_dir = cache_dir
+        if max_size is not None:
+            self.max_size = max_size
+        self._distributions = None
+        self._puts = 0
+        if os.path.isdir(cache_dir):
+            self.evict()
+
+    def get(self, library, args):
+        """Returns the cached library data or None if not in cache"""
+        cache_file = self.cache_file(library, args)
+        if not cache_file:
+            return None
+        try:
+            with open(cache_file) as f:
+                data = json.load(f)
+        except (IOError, ValueError):
+            return None
+        try:
+            os.utime(cache_file, None)
+        except OSError:
+            pass
+        logging.debug('Library found from libdoc cache: %s', library)
+        return data
+
+    def put(self, library, args, data):
+        """Stores the library data and evicts the old entries after
+        every ``evict_interval`` stored entries"""
+        cache_file = self.cache_file(library, args)
+        if not cache_file:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = '{0}.{1}.tmp'.format(cache_file, os.getpid())
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, cache_file)
+        self._puts += 1
+        if self._puts % self.evict_interval == 0:
+            self.evict()
+
+    def evict(self):
+        """Removes least recently used entries until the cache fits
+        to the ``max_size``."""
+        entries = []
+        total_size = 0
+        for f_name in os.listdir(self.cache_dir):
+            if not f_name.endswith('.json'):
+                continue
+            f_path = os.path.join(self.cache_dir, f_name)
+            try:
+                stat = os.stat(f_path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, f_path))
+            total_size += stat.st_size
+        for mtime, size, f_path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(f_path)
+            except OSError:
+                pass
+            total_size -= size
+
+    def cache_file(self, library, args):
+        """Returns path to the cache entry or None if the library
+        source file could not be located."""
+        key = self.key(library, args)
+        if not key:
+            return None
+        return os.path.join(self.cache_dir, '{0}.json'.format(key))
+
+    def key(self, library, args):
+        if os.path.isfile(library):
+            source = normalise_path(library)
+        else:
+            source = library_source(library)
+        if not source:
+            return None
+        dist_version = self._distribution_version(library)
+        files = [source] if dist_version else package_files(source)
+        key = [
+            library,
+            source,
+            [self._stat(file_) for file_ in files],
+            dist_version,
+            get_version(),
+            [str(arg) for arg in args or []]
+        ]
+        return md5(json.dumps(key).encode('utf-8')).hexdigest()
+
+    def _stat(self, file_):
+        stat = os.stat(file_)
+        return [file_, stat.st_mtime, stat.st_size]
+
+    def _distribution_version(self, library):
+        if self._distributions is None:
+            self._distributions = get_distributions()
+        return distribution_version(library, self._distributions)
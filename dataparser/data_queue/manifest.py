@@ -0,0 +1,188 @@
+import os
+import json
+import logging
+from hashlib import md5
+from parser_utils.util import normalise_path
+from parser_utils.library_source import library_source, package_files
+from db_json_settings import DBJsonSetting
+
+
+class ScanManifest(object):
+    """Keeps record of the sources used to create the database tables.
+
+    For each queue item the manifest stores the table name, path,
+    modification time, size and md5 hash of the source and the type
+    and arguments used to parse the item. If the source is a package,
+    all Python files of the package are recorded and fingerprinted
+    together. The manifest is used to decide which tables are up to
+    date when an incremental scan is performed and which items are
+    parsed again when a source changes.
+    """
+    version = 2
+
+    def __init__(self, manifest_path, path_file=None):
+        self.manifest_path = manifest_path
+        self.path_file = self.fingerprint(path_file)
+        self.items = {}
+        self.visited = set()
+
+    def load(self):
+        """Loads the previous manifest.
+
+        Returns False if manifest does not exist or it was created
+        with different version or paths variables file.
+        """
+        try:
+            with open(self.manifest_path) as f:
+                data = json.load(f)
+        except (IOError, ValueError):
+            return False
+        if data.get('version') != self.version:
+            return False
+        if not self._same_source(data.get('path_file'), self.path_file):
+            return False
+        self.items = data.get('items', {})
+        return True
+
+    def save(self):
+        data = {
+            'version': self.version,
+            'path_file': self.path_file,
+            'items': self.items
+        }
+        tmp_path = '{0}.tmp'.format(self.manifest_path)
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def get_source(self, item):
+        name, status = item
+        if status['type'] == DBJsonSetting.library and \
+                not os.path.isfile(name):
+            return library_source(name)
+        return normalise_path(name)
+
+    def up_to_date_table(self, item, storage):
+        """Returns the table name if item has not changed since last scan.
+
+        Item has not changed if the source and arguments are same and
+        the table still exists in the ``storage``. Source is compared
+        by modification time and size, and by the hash when those
+        differ.
+        """
+        name, status = item
+        self.visited.add(name)
+        record = self.items.get(name)
+        if not record or record['args'] != self._args(status['args']):
+            return None
+        if not storage.has_table(record['table']):
+            return None
+        source = self.fingerprint(self.get_source(item), record)
+        if not source or not self._same_source(source, record):
+            return None
+        if source['mtime'] != record['mtime']:
+            record.update(source)
+        return record['table']
+
+    def update(self, item, table):
+        """Records the item after the table is created for the item"""
+        name, status = item
+        self.visited.add(name)
+        source = self.fingerprint(self.get_source(item))
+        if not source:
+            self.items.pop(name, None)
+            return
+        record = {
+            'table': table,
+            'type': status['type'],
+            'args': self._args(status['args'])
+        }
+        record.update(source)
+        self.items[name] = record
+
+    def find_items(self, source):
+        """Returns the items which tables are created from the ``source``.
+
+        Items are returned as (name, type, args) tuples, which can be
+        added to the queue as they are.
+        """
+        return [
+            (name, record['type'], record['args'] or None)
+            for name, record in sorted(self.items.items())
+            if source in record.get('files', [record['source']])
+        ]
+
+    def remove_items(self, names):
+        """Removes the items and returns their tables.
+
+        Table is not returned if it is also used by another item.
+        """
+        removed = set(self.items.pop(name)['table'] for name in names)
+        return removed - set(
+            record['table'] for record in self.items.values())
+
+    def remove(self, item):
+        """Removes item which could not be parsed"""
+        self.visited.add(item[0])
+        self.items.pop(item[0], None)
+
+    def remove_unvisited(self):
+        """Removes items not seen during scan and returns their tables.
+
+        Table is not returned if it is also used by a visited item.
+        """
+        in_use = set()
+        removed = set()
+        for name in list(self.items):
+            if name in self.visited:
+                in_use.add(self.items[name]['table'])
+            else:
+                removed.add(self.items.pop(name)['table'])
+        return removed - in_use
+
+    def fingerprint(self, source, previous=None):
+        """Returns path, mtime, size and hash of the ``source``.
+
+        If the ``source`` is the ``__init__.py`` of a package, the
+        files of the package are fingerprinted together: mtime is the
+        newest mtime, size is the total size and the files are listed
+        in the ``files``. If ``previous`` has same mtime, size and
+        files, the hash is not calculated again."""
+        if not source or not os.path.isfile(source):
+            return None
+        files = package_files(source)
+        stats = [os.stat(file_) for file_ in files]
+        data = {
+            'source': source,
+            'mtime': max(stat.st_mtime for stat in stats),
+            'size': sum(stat.st_size for stat in stats)
+        }
+        if len(files) > 1:
+            data['files'] = files
+        if previous and previous.get('mtime') == data['mtime'] \
+                and previous.get('size') == data['size'] \
+                and previous.get('files') == data.get('files'):
+            data['hash'] = previous['hash']
+        else:
+            data['hash'] = self._hash(files)
+        return data
+
+    def _hash(self, files):
+        md5sum = md5()
+        for file_ in files:
+            if len(files) > 1:
+                md5sum.update(file_.encode('utf-8'))
+            with open(file_, 'rb') as f:
+                for chunk in iter(lambda: f.read(65536), b''):
+                    md5sum.update(chunk)
+        return md5sum.hexdigest()
+
+    def _same_source(self, source1, source2):
+        if not source1 or not source2:
+            return source1 == source2
+        return (source1['source'] == source2['source'] and
+                source1['size'] == source2['size'] and
+                source1['hash'] == source2['hash'])
+
+    def _args(self, args):
+        return list(args) if args else []
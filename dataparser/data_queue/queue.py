@@ -1,10 +1,15 @@
 from collections import OrderedDict
-from copy import deepcopy
 from db_json_settings import DBJsonSetting
 
 
 class ParsingQueue(object):
-    """This is queue for parsing test data and libraries"""
+    """This is queue for parsing test data and libraries
+
+    The ``queue`` is an OrderedDict, which keeps the status of each
+    item and the order of the items. Items are added to and taken from
+    the start of the queue and handled items are moved to the end. All
+    operations are done in place and in constant time.
+    """
     def __init__(self):
         self.queue = OrderedDict({})
         self.rf_types = [
@@ -26,36 +31,36 @@ class ParsingQueue(object):
         if rf_type not in self.rf_types:
             raise ValueError('Invalid rf_type: {0}'.format(rf_type))
         if data not in self.queue:
-            new = OrderedDict([(
-                data,
-                {'scanned': False, 'type': rf_type, 'args': arg})])
-            old = self.queue
-            self.queue = OrderedDict(list(new.items()) + list(old.items()))
+            self.queue[data] = {'scanned': False, 'type': rf_type, 'args': arg}
+            self.queue.move_to_end(data, last=False)
 
     def get(self):
         """Get item from start of the queue"""
         try:
-            data = self.queue.popitem(last=False)
-            tmp = deepcopy(data)
-            tmp[1]['scanned'] = 'queued'
-            self.queue[tmp[0]] = tmp[1]
-            return data
+            data, status = self.queue.popitem(last=False)
         except KeyError:
             return {}
+        queued = dict(status)
+        queued['scanned'] = 'queued'
+        self.queue[data] = queued
+        return data, status
+
+    def peek(self):
+        """Returns item from start of the queue without removing it"""
+        for data in self.queue.items():
+            return data
+        return {}
 
     def set(self, data):
         """Set scanned to True and put item as last item in the queue"""
-        status = self.queue[data]
-        status['scanned'] = True
-        self.queue[data] = status
+        self.queue[data]['scanned'] = True
 
     def force_set(self, data):
         """Adds items to the end of the queue with scanned == True"""
         status = {'scanned': True, 'type': None, 'args': None}
-        if data in self.queue:
-            del self.queue[data]
+        self.queue.pop(data, None)
         self.queue[data] = status
 
     def clear_queue(self):
         """Clears all items in the queue"""
-        self.queue = OrderedDict({})
+        self.queue.clear()
@@ -1,20 +1,51 @@
-import shutil
 import logging
-import json
 import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import xml.etree.ElementTree as ET
 from robot.errors import DataError
 from .finder import finder
 from data_parser.data_parser import DataParser
 from .queue import ParsingQueue
+from .manifest import ScanManifest
 from parser_utils.file_formatter import rf_table_name, lib_table_name
-from parser_utils.util import normalise_path
+from parser_utils.util import normalise_path, get_manifest_path
+from storage.storage import get_storage
 from db_json_settings import DBJsonSetting
 
 logging.basicConfig(
     format='%(levelname)s:%(asctime)s: %(message)s',
     level=logging.DEBUG)
 
+_WORKER_SCANNER = None
+
+
+def _init_worker(path_file, xml_libraries, libdoc_cache, sys_path,
+                 details=True):
+    """Creates the Scanner used by a single worker process.
+
+    Worker inherits the ``sys.path`` of the parent, so that libraries
+    from the module search path are found also when processes are
+    spawned instead of forked.
+    """
+    global _WORKER_SCANNER
+    sys.path[:] = sys_path
+    _WORKER_SCANNER = Scanner(path_file, xml_libraries, libdoc_cache)
+    _WORKER_SCANNER.details = details
+
+
+def _parse_item(item):
+    """Parses a single queue item in a worker process.
+
+    Returns None if the item could not be parsed.
+    """
+    try:
+        return _WORKER_SCANNER.parse_all(item)
+    except ValueError:
+        logging.warning('Error in: %s', item[0])
+        return None
+
 
 class Scanner(object):
     """Class to perform initial scanning of robot data.
@@ -23,60 +54,290 @@ class Scanner(object):
     when files are changed by version control, like with git pull command.
     The database is folder where robot data is saved as json files.
     """
-    def __init__(self, path_file, xml_libraries=None):
+    def __init__(self, path_file=None, xml_libraries=None,
+                 libdoc_cache=None, parser=None):
         self.queue = ParsingQueue()
-        self.parser = DataParser(path_file)
+        self.path_file = path_file
+        self.libdoc_cache = libdoc_cache
+        self.parser = parser or DataParser(path_file, libdoc_cache)
         self.rf_data_type = [None, 'test_suite', 'resource']
         self.xml_libraries = xml_libraries
+        self.storage = None
+        self.storage_path = None
+        self.changed_tables = set()
+        self.details = True
 
-    def scan(self, workspace, ext, db_path):
+    def scan(self, workspace, ext, db_path, workers=1, incremental=False,
+             lazy=False):
         """Scan and create the database
         ``workspace`` --root folder where robot data is scanned.
         ``ext`` --Extension for included files.
-        ``db_path`` --Directory where files are saved"""
+        ``db_path`` --Directory where files are saved or SQLite file.
+        ``workers`` --Number of processes used to parse the queue items.
+        ``incremental`` --Parse only changed and new sources.
+        ``lazy`` --Parse only imports, variables and keyword names.
+
+        When ``workers`` is bigger than one, queue items are parsed
+        concurrently in a process pool. The created tables are the same
+        as with the serial scan.
+
+        Scan keeps a manifest of the parsed sources next to the
+        ``db_path``. When ``incremental`` is True and manifest from the
+        previous scan is found, only sources which have changed are
+        parsed again and tables of removed sources are deleted. Other
+        tables are left untouched.
+
+        When ``lazy`` is True, test suites and resource files are parsed
+        only for the imports, variables and keyword names. Keyword
+        arguments, documentation and tags of those tables are parsed
+        later with ``complete_tables``.
+
+        Returns the names of the tables which were created or removed."""
         if not os.path.exists(workspace):
             raise EnvironmentError(
                 'Workspace does not exist: {0}'.format(str(workspace)))
         if not os.path.dirname(workspace):
             raise EnvironmentError(
                 'Workspace must be folder: {0}'.format(str(workspace)))
-        if os.path.exists(db_path):
-            shutil.rmtree(db_path)
-        os.makedirs(db_path)
+        self.changed_tables = set()
+        self.details = not lazy
+        self.manifest = ScanManifest(
+            get_manifest_path(db_path), self.path_file)
+        storage = self.get_storage(db_path)
+        if incremental and os.path.exists(db_path) and self.manifest.load():
+            logging.info('Incremental scan for: {0}'.format(db_path))
+        else:
+            if incremental:
+                logging.info('No valid manifest found, scanning all')
+            storage.clear_tables()
         self.add_builtin()
         if self.xml_libraries:
             self.add_xml_libraries(self.xml_libraries)
         for f in finder(workspace, ext):
             self.queue.add(normalise_path(f), None, None)
+        with storage.batch():
+            if workers > 1:
+                self.parallel_scan(db_path, workers)
+            else:
+                self.serial_scan(db_path)
+            self.remove_tables(self.manifest.remove_unvisited(), db_path)
+        self.manifest.save()
+        return self.changed_tables
+
+    def scan_changed(self, changed, workspace, ext, db_path):
+        """Scans only the ``changed`` files
+        ``changed``   --Paths of the created, changed or removed files.
+        ``workspace`` --root folder where robot data is scanned.
+        ``ext``       --Extension for included files.
+        ``db_path``   --Directory where files are saved or SQLite file.
+
+        Changed files are matched with the sources recorded in the
+        manifest of the previous scan. Items created from a changed
+        source, like a library imported with different arguments, are
+        parsed again and tables of the removed sources are removed. New
+        files with the ``ext`` in the ``workspace`` are parsed as Robot
+        Framework data. Imports of the parsed items are parsed, if they
+        do not have an up to date table. Other files in the workspace
+        are not visited.
+
+        If the manifest is not found, the ``workspace`` is scanned
+        incrementally. Returns the names of the tables which were
+        created or removed."""
+        self.manifest = ScanManifest(
+            get_manifest_path(db_path), self.path_file)
+        if not os.path.exists(db_path) or not self.manifest.load():
+            return self.scan(workspace, ext, db_path, incremental=True)
+        self.changed_tables = set()
+        self.details = True
+        storage = self.get_storage(db_path)
+        workspace = os.path.join(normalise_path(workspace), '')
+        removed = set()
+        for source in sorted(set(normalise_path(f) for f in changed)):
+            items = self.manifest.find_items(source)
+            if not os.path.isfile(source):
+                removed.update(self.manifest.remove_items(
+                    [name for name, _, _ in items]))
+            elif items:
+                for name, type_, args in items:
+                    self.queue.add(name, type_, args)
+            elif source.startswith(workspace) and \
+                    source.endswith('.{0}'.format(ext.lstrip('.'))):
+                self.queue.add(source, None, None)
+            else:
+                logging.debug('Not used in the database: %s', source)
+        with storage.batch():
+            self.serial_scan(db_path, follow_unchanged=False)
+            self.remove_tables(removed, db_path)
+        self.manifest.save()
+        return self.changed_tables
+
+    def get_storage(self, db_path):
+        """Returns the storage of the ``db_path``.
+
+        Storage is reused as long as the ``db_path`` does not change.
+        """
+        if self.storage is None or self.storage_path != db_path:
+            if self.storage:
+                self.storage.close()
+            self.storage = get_storage(db_path)
+            self.storage_path = db_path
+        return self.storage
+
+    def serial_scan(self, db_path, follow_unchanged=True):
+        """Parses the queue items one by one until queue is empty.
+
+        Imports of the items which table is up to date are added to
+        the queue only when ``follow_unchanged`` is True."""
         while True:
             item = self.get_item()
             if not item:
                 return
             else:
-                logging.info('Creating table for: {0}'.format(item[0]))
                 try:
-                    data = self.parse_all(item)
-                    self.add_to_queue(data)
-                    self.put_item_to_db(data, db_path)
+                    data = self.read_up_to_date_table(item, db_path)
+                    if not data:
+                        logging.info(
+                            'Creating table for: {0}'.format(item[0]))
+                        data = self.parse_all(item)
+                        table = self.put_item_to_db(data, db_path)
+                        self.manifest.update(item, table)
+                        self.add_to_queue(data)
+                    elif follow_unchanged:
+                        self.add_to_queue(data)
                 except ValueError:
                     logging.warning('Error in: %s', item[0])
+                    self.manifest.remove(item)
+                finally:
+                    self.queue.set(item[0])
+
+    def parallel_scan(self, db_path, workers):
+        """Parses the queue items in a pool of ``workers`` processes.
+
+        Imports found from the parsed items are added back to the queue
+        and the results are handled in the same order as the items were
+        taken from the queue. Therefore the queue evolves in the same way
+        on every run, regardless in which order the workers finish.
+        """
+        in_flight = deque()
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(
+                self.path_file,
+                self.xml_libraries,
+                self.libdoc_cache,
+                list(sys.path),
+                self.details
+            )
+        )
+        try:
+            while True:
+                while len(in_flight) < workers * 2:
+                    item = self.get_pending_item()
+                    if not item:
+                        break
+                    data = self.read_up_to_date_table(item, db_path)
+                    if data:
+                        self.add_to_queue(data)
+                        self.queue.set(item[0])
+                        continue
+                    logging.info('Creating table for: {0}'.format(item[0]))
+                    in_flight.append(
+                        (item, executor.submit(_parse_item, item)))
+                if not in_flight:
+                    return
+                item, future = in_flight.popleft()
+                try:
+                    data = future.result()
+                    if data:
+                        self.add_to_queue(data)
+                        table = self.put_item_to_db(data, db_path)
+                        self.manifest.update(item, table)
+                    else:
+                        self.manifest.remove(item)
                 finally:
                     self.queue.set(item[0])
+        finally:
+            executor.shutdown(wait=True)
 
     def scan_single_file(self, file_path, db_path):
         """Scan a single file and create the database table for the file
         `file_path` -- Path to the file which is scanned.
-        `db_path`   -- Directory where scan result is saved.
+        `db_path`   -- Directory or SQLite file where scan result is saved.
         """
-        if not os.path.exists(db_path):
-            os.makedirs(db_path)
-        logging.info('Creating table for: {0}'.format(file_path))
-        item = (file_path, {'scanned': False, 'type': None, 'args': None})
-        try:
-            data = self.parse_all(item)
-            self.put_item_to_db(data, db_path)
-        except ValueError:
-            logging.warning('Error in: %s', file_path)
+        self.scan_files([file_path], db_path)
+
+    def scan_files(self, file_paths, db_path):
+        """Scan the files and create the database tables for them
+        `file_paths` -- Paths to the files which are scanned.
+        `db_path`    -- Directory or SQLite file where scan result is saved.
+
+        Returns the table names of the files which were scanned. The
+        files are also recorded in the manifest of the previous scan, so
+        that the next incremental scan does not parse them again.
+        """
+        tables = []
+        scanned = []
+        with self.get_storage(db_path).batch():
+            for file_path in file_paths:
+                logging.info('Creating table for: {0}'.format(file_path))
+                item = (
+                    normalise_path(file_path),
+                    {'scanned': False, 'type': None, 'args': None}
+                )
+                try:
+                    data = self.parse_all(item)
+                    table = self.put_item_to_db(data, db_path)
+                    tables.append(table)
+                except ValueError:
+                    logging.warning('Error in: %s', file_path)
+                    table = None
+                scanned.append((item, table))
+        self.update_manifest(scanned, db_path)
+        return tables
+
+    def update_manifest(self, scanned, db_path):
+        """Records the ``scanned`` items and their tables in the manifest.
+
+        Item without table is removed from the manifest. Manifest is not
+        created if it does not exist, because then the next incremental
+        scan must parse all the sources.
+        """
+        manifest = ScanManifest(get_manifest_path(db_path), self.path_file)
+        if not manifest.load():
+            return
+        for item, table in scanned:
+            if table:
+                manifest.update(item, table)
+            else:
+                manifest.remove(item)
+        manifest.save()
+
+    def complete_tables(self, db_path):
+        """Parses again the tables created by the lazy scan.
+
+        Keyword arguments, documentation and tags are added to the
+        tables which contain only the keyword names. Returns the names
+        of the completed tables.
+        """
+        storage = self.get_storage(db_path)
+        files = [
+            data[DBJsonSetting.file_path]
+            for data in storage.read_tables()
+            if data.get(DBJsonSetting.partial)
+        ]
+        self.details = True
+        tables = []
+        with storage.batch():
+            for file_path in files:
+                logging.info('Completing table for: {0}'.format(file_path))
+                try:
+                    data = self.scan_rf_data(file_path)
+                except ValueError:
+                    logging.warning('Error in: %s', file_path)
+                    continue
+                tables.append(self.put_item_to_db(data, db_path))
+        return tables
 
     def get_item(self):
         item = self.queue.get()
@@ -87,6 +348,16 @@ class Scanner(object):
         else:
             return {}
 
+    def get_pending_item(self):
+        """Returns next item which is not scanned or being scanned.
+
+        Unlike ``get_item``, does not touch the queue when there
+        are no items waiting to be scanned."""
+        item = self.queue.peek()
+        if item and not item[1]['scanned']:
+            return self.queue.get()
+        return {}
+
     def add_to_queue(self, data):
         """Add resources and libraries to queue"""
         if DBJsonSetting.libraries in data:
@@ -102,9 +373,33 @@ class Scanner(object):
             f_name = lib_table_name(item[DBJsonSetting.library_module])
         elif DBJsonSetting.file_path in item:
             f_name = rf_table_name(item[DBJsonSetting.file_path])
-        f = open(os.path.join(db_path, f_name), 'w')
-        json.dump(item, f)
-        f.close()
+        self.get_storage(db_path).write_table(f_name, item)
+        self.changed_tables.add(f_name)
+        return f_name
+
+    def read_up_to_date_table(self, item, db_path):
+        """Returns the table data if item has not changed since last scan.
+
+        Table created by the lazy scan is not up to date, if the scan
+        parses also the keyword details."""
+        storage = self.get_storage(db_path)
+        table = self.manifest.up_to_date_table(item, storage)
+        if not table:
+            return None
+        data = storage.read_table(table)
+        if self.details and data.get(DBJsonSetting.partial):
+            return None
+        logging.debug('Table is up to date for: %s', item[0])
+        return data
+
+    def remove_tables(self, tables, db_path):
+        """Removes tables which sources are not anymore found"""
+        storage = self.get_storage(db_path)
+        for table in tables:
+            if storage.has_table(table):
+                logging.info('Removing table: {0}'.format(table))
+                storage.remove_table(table)
+                self.changed_tables.add(table)
 
     def parse_all(self, item):
         data_type = item[1]['type']
@@ -122,11 +417,11 @@ class Scanner(object):
         """Scans test suite or resource file"""
         self.parser.unregister_console_logger()
         try:
-            return self.parser.parse_resource(f)
+            return self.parser.parse_resource(f, self.details)
         except DataError:
             self.parser.close_logger()
             self.parser.register_console_logger()
-            return self.parser.parse_suite(f)
+            return self.parser.parse_suite(f, self.details)
         finally:
             self.parser.register_console_logger()
 
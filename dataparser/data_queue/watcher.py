@@ -0,0 +1,223 @@
+import ctypes
+import ctypes.util
+import fnmatch
+import logging
+import os
+import select
+import struct
+import sys
+import time
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+              IN_DELETE | IN_DELETE_SELF)
+EVENT = struct.Struct('iIII')
+
+
+def _patterns(extensions):
+    patterns = []
+    for ext in extensions:
+        if not ext.startswith('*.'):
+            ext = '*.{0}'.format(ext.lstrip('.'))
+        patterns.append(ext)
+    return patterns
+
+
+def _matches(file_name, patterns):
+    return any(fnmatch.fnmatch(file_name, pattern) for pattern in patterns)
+
+
+class PollingWatcher(object):
+    """Finds changed files by comparing the modification time and size
+    of the files between the polls.
+
+    ``roots``    -- List of (folder, extensions) tuples. Files in the
+                    folder, and in the sub folders, which match one of
+                    the extensions are watched.
+    ``interval`` -- Seconds between the polls.
+    """
+
+    def __init__(self, roots, interval=1.0):
+        self.roots = [
+            (os.path.abspath(root), _patterns(extensions))
+            for root, extensions in roots
+        ]
+        self.interval = interval
+        self.files = self.snapshot()
+
+    def snapshot(self):
+        files = {}
+        for root, patterns in self.roots:
+            for folder, dirs, file_names in os.walk(root):
+                for file_name in file_names:
+                    if not _matches(file_name, patterns):
+                        continue
+                    file_path = os.path.join(folder, file_name)
+                    try:
+                        stat = os.stat(file_path)
+                    except OSError:
+                        continue
+                    files[file_path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def wait(self, timeout=None):
+        """Returns the files created, changed or removed since the
+        previous call. Waits at most ``timeout`` seconds, or until the
+        next poll, for changes to appear."""
+        end = None if timeout is None else time.time() + timeout
+        while True:
+            files = self.snapshot()
+            changed = set(
+                file_path
+                for file_path in set(files) | set(self.files)
+                if files.get(file_path) != self.files.get(file_path)
+            )
+            self.files = files
+            if changed:
+                return changed
+            if end is not None and time.time() >= end:
+                return changed
+            delay = self.interval
+            if end is not None:
+                delay = min(delay, max(end - time.time(), 0))
+            time.sleep(delay)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher(object):
+    """Finds changed files with the Linux inotify API.
+
+    ``roots`` -- List of (folder, extensions) tuples, like in the
+                 PollingWatcher.
+
+    Every folder below the roots is watched and new folders are added
+    to the watch when they are created. Raises OSError if inotify is
+    not available.
+    """
+
+    def __init__(self, roots):
+        if not sys.platform.startswith('linux'):
+            raise OSError('inotify is only available on Linux')
+        libc_name = ctypes.util.find_library('c')
+        if not libc_name:
+            raise OSError('C library not found')
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.libc.inotify_add_watch.argtypes = [
+            ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.watches = {}
+        self.roots = []
+        try:
+            for root, extensions in roots:
+                root = os.path.abspath(root)
+                self.roots.append((root, _patterns(extensions)))
+                self.add_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def add_tree(self, folder):
+        """Watches the ``folder`` and its sub folders. Returns the files
+        found from the added folders."""
+        found = set()
+        for sub_folder, dirs, file_names in os.walk(folder):
+            self.add_watch(sub_folder)
+            found.update(
+                os.path.join(sub_folder, file_name)
+                for file_name in file_names
+            )
+        return found
+
+    def add_watch(self, folder):
+        if folder in self.watches.values():
+            return
+        wd = self.libc.inotify_add_watch(
+            self.fd, os.fsencode(folder), WATCH_MASK)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), folder)
+        self.watches[wd] = folder
+
+    def wait(self, timeout=None):
+        """Returns the files created, changed or removed since the
+        previous call. Waits at most ``timeout`` seconds for changes.
+
+        When a folder is removed or moved away, the folder is returned
+        instead of the files which were in it."""
+        changed = set()
+        removed = set()
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return changed
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT.unpack_from(data, offset)
+            offset += EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                logging.warning('Watch queue overflow, rescanning folders')
+                for root, _ in self.roots:
+                    changed.update(self.add_tree(root))
+                continue
+            folder = self.watches.get(wd)
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            if folder is None or not name:
+                continue
+            file_path = os.path.join(folder, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and \
+                        os.path.isdir(file_path):
+                    changed.update(self.add_tree(file_path))
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    # Files in the folder are gone, but there are no
+                    # events for them
+                    removed.add(file_path)
+                continue
+            changed.add(file_path)
+        changed = set(
+            file_path for file_path in changed if self.is_watched(file_path))
+        return changed | removed
+
+    def is_watched(self, file_path):
+        file_name = os.path.basename(file_path)
+        for root, patterns in self.roots:
+            if file_path.startswith(os.path.join(root, '')) and \
+                    _matches(file_name, patterns):
+                return True
+        return False
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def get_watcher(roots, interval=1.0):
+    """Returns InotifyWatcher if inotify can be used and otherwise
+    the PollingWatcher."""
+    try:
+        return InotifyWatcher(roots)
+    except (OSError, AttributeError) as error:
+        logging.info('Using polling to watch files: %s', error)
+        return PollingWatcher(roots, interval)
@@ -0,0 +1,114 @@
+import os
+import json
+from collections import deque
+
+
+class ImportGraph(object):
+    """Import relations between the database tables.
+
+    ``imports`` contains the forward edges, from a table to the tables
+    it imports, and ``imported_by`` contains the reverse edges. The
+    ``global_tables``, like BuiltIn and the libraries in XML format,
+    are part of every index without an explicit import.
+    """
+
+    def __init__(self, graph_path):
+        self.graph_path = graph_path
+        self.imports = {}
+        self.imported_by = {}
+        self.global_tables = set()
+
+    def load(self):
+        """Loads the graph from the ``graph_path``.
+
+        Returns False if the graph file does not exist or can not be read.
+        """
+        try:
+            with open(self.graph_path) as f:
+                data = json.load(f)
+        except (IOError, ValueError):
+            return False
+        self.imports = {}
+        self.imported_by = {}
+        for table, imports in data.get('imports', {}).items():
+            self.imports[table] = set(imports)
+        for table, importers in data.get('imported_by', {}).items():
+            self.imported_by[table] = set(importers)
+        self.global_tables = set(data.get('global_tables', []))
+        return True
+
+    def save(self):
+        data = {
+            'imports': self._as_lists(self.imports),
+            'imported_by': self._as_lists(self.imported_by),
+            'global_tables': sorted(self.global_tables)
+        }
+        tmp_path = '{0}.tmp'.format(self.graph_path)
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.graph_path)
+
+    def update(self, edges, global_tables=None):
+        """Replaces the forward edges of the tables found from ``edges``.
+
+        ``edges`` is dictionary where key is a table name and value
+        is a list of tables imported by the table.
+        """
+        for table, imports in edges.items():
+            self.remove(table, keep_importers=True)
+            self.imports[table] = set(imports)
+            for import_ in imports:
+                self.imported_by.setdefault(import_, set()).add(table)
+        if global_tables is not None:
+            self.global_tables = set(global_tables)
+
+    def remove(self, table, keep_importers=False):
+        """Removes the forward edges of the ``table``.
+
+        If ``keep_importers`` is False, also the reverse edges
+        to the ``table`` are removed.
+        """
+        for import_ in self.imports.pop(table, set()):
+            importers = self.imported_by.get(import_)
+            if importers:
+                importers.discard(table)
+                if not importers:
+                    del self.imported_by[import_]
+        if not keep_importers:
+            for importer in self.imported_by.pop(table, set()):
+                self.imports.get(importer, set()).discard(table)
+
+    def dependents(self, tables):
+        """Returns tables which index depends on any of the ``tables``.
+
+        Result contains the ``tables`` and all tables which import
+        them directly or transitively. Returns None if a global
+        table is changed, because then every index depends on it.
+        """
+        if self.global_tables.intersection(tables):
+            return None
+        result = set(tables)
+        queue = deque(tables)
+        while queue:
+            table = queue.popleft()
+            for importer in self.imported_by.get(table, ()):
+                if importer not in result:
+                    result.add(importer)
+                    queue.append(importer)
+        return result
+
+    def fan_out(self, table):
+        """Returns the number of tables the ``table`` imports directly
+        or transitively."""
+        seen = set([table])
+        queue = deque([table])
+        while queue:
+            for import_ in self.imports.get(queue.popleft(), ()):
+                if import_ not in seen:
+                    seen.add(import_)
+                    queue.append(import_)
+        return len(seen) - 1
+
+    def _as_lists(self, edges):
+        return dict(
+            (table, sorted(tables)) for table, tables in edges.items())
@@ -1,47 +1,124 @@
 import logging
 import re
+import sys
+import time
 import multiprocessing
 import xml.etree.ElementTree as ET
-from os import path, listdir
-from json import load as json_load
-from json import dump as json_dump
+from os import path
 from collections import namedtuple
 from parser_utils.file_formatter import rf_table_name, lib_table_name
-from parser_utils.util import get_index_name
+from parser_utils.file_formatter import library_import_table
 from data_queue.queue import ParsingQueue
-from data_parser.data_parser import DataParser
 from db_json_settings import DBJsonSetting
 from data_queue.finder import finder
+from storage.storage import get_storage
+from parser_utils.util import get_keyword_lookup
+from index.table_cache import TableCache
+from index.table_catalog import TableCatalog
 
 logging.basicConfig(
     format='%(levelname)s:%(asctime)s: %(message)s',
     level=logging.DEBUG)
 
+KeywordRecord = namedtuple(
+    'KeywordRecord',
+    'keyword argument object_name table_name object_alias')
+TableEntry = namedtuple(
+    'TableEntry',
+    'variables keywords arguments object_name imports library_alias')
+EMPTY_ENTRY = TableEntry([], [], [], None, [], [])
+_WORKER_INDEX = None
+
 
 def index_a_table(params):
     """Index a table found from db_path.
     `params` - Tuple of: db_dir, table_name and index_dir
 
     This is a wrapper function for multiprocessing.Pool
-    to create index for tables in multiple processes.
+    to create index for tables in multiple processes. Returns the
+    import edges and global tables found when creating the index.
+
+    Index is reused for all tables indexed in the same process,
+    so that the tables and import closures are read only once.
     """
+    global _WORKER_INDEX
     name = multiprocessing.current_process().name
     logging.info('Starting name: %s', name)
     db_path, table_name, index_path, xml_libraries = params
-    index = Index(db_path, index_path, xml_libraries)
+    index = _WORKER_INDEX
+    if not index or (index.db_path, index.index_path, index.xml_libraries) \
+            != (db_path, index_path, xml_libraries):
+        index = Index(db_path, index_path, xml_libraries)
+        _WORKER_INDEX = index
+    index.import_edges = {}
     index.index_consturctor(table_name)
+    return index.import_edges, sorted(index.global_tables)
+
+
+def init_index_worker(db_path, index_path, xml_libraries, sys_path,
+                      catalog=None):
+    """Creates the Index used by a single worker process.
+
+    Worker inherits the ``sys.path`` of the parent, so that libraries
+    from the module search path are found also when processes are
+    spawned instead of forked. The ``catalog`` of the table names is
+    created once by the parent and shared by all workers.
+    """
+    global _WORKER_INDEX
+    sys.path[:] = sys_path
+    _WORKER_INDEX = Index(db_path, index_path, xml_libraries, catalog)
+
+
+def release_index_worker():
+    """Releases the Index, and the tables cached by it, at the end of
+    the run, so that the next run reads the tables again."""
+    global _WORKER_INDEX
+    if _WORKER_INDEX:
+        _WORKER_INDEX.storage.close()
+    _WORKER_INDEX = None
+
+
+def index_chunk(chunk):
+    """Indexes the tables of the ``chunk`` in a worker process.
+
+    ``chunk`` is a list of the ``index_a_table`` params. Returns list of
+    the table name, import edges, global tables and the seconds used to
+    create the index for each table.
+    """
+    results = []
+    for params in chunk:
+        start = time.time()
+        import_edges, global_tables = index_a_table(params)
+        results.append(
+            (params[1], import_edges, global_tables, time.time() - start))
+    return results
 
 
 class Index(object):
     """Reads the database and returns index's of keywords and variables"""
 
-    def __init__(self, db_path, index_path, xml_libraries=None):
+    def __init__(self, db_path, index_path, xml_libraries=None,
+                 catalog=None):
         self.queue = ParsingQueue()
-        self.data_parser = DataParser()
         self.index_path = index_path
         self.db_path = db_path
         self.xml_libraries = xml_libraries
         self.library_alias = []
+        self.import_edges = {}
+        self.global_tables = set()
+        self.global_tables_found = False
+        self.table_entries = TableCache()
+        self.closures = {}
+        self.storage = get_storage(db_path, index_path)
+        self.shared_written = set()
+        self._catalog = catalog
+
+    @property
+    def catalog(self):
+        """Names of the tables, listed from the storage only once"""
+        if self._catalog is None:
+            self._catalog = TableCatalog.from_storage(self.storage)
+        return self._catalog
 
     def index_consturctor(self, table):
         """Creates a single table index.
@@ -49,114 +126,257 @@ class Index(object):
         `table` - name of the db table where index is created
 
         Will walk on all imported resources and libraries and
-        adds all keyword and variables to the index file.
+        adds all keyword and variables to the index file. Keywords
+        and variables of the imported tables are written once to the
+        shared sets and index file refers to them.
         """
         logging.info('Creating index for: {0}'.format(table))
-        index_table_path = self.get_index_path(table)
-        data = self.create_index_for_table(self.db_path, table)
-        self.write_data(index_table_path, data)
+        with self.storage.batch():
+            data = self.create_shared_index_for_table(self.db_path, table)
+            self.storage.write_index(table, data)
         self.library_alias = []
 
-    def write_data(self, index_table_path, data):
-        f = open(index_table_path, 'w')
-        json_dump(data, f)
-        f.close()
-
     def create_index_for_table(self, db_path, table_name):
         """Creates index for a single table.
 
-        Index contains all imported kw and variables
+        Index contains all imported kw and variables. The tables and
+        their import closures are read once and reused by all
+        indexes created with the same instance.
         """
-        self.queue.clear_queue()
-        self.queue.add(table_name, None, None)
-        self.add_builtin_to_queue(db_path)
-        if self.xml_libraries:
-            self.add_xml_libraries(self.xml_libraries)
         keywords = []
         variables = []
-        while True:
-            item = self.get_item_from_queue()
-            if not item:
-                break
-            t_name = item[0]
-            kws, vars_ = self.create_index(
-                db_path,
-                t_name,
-                table_name
-            )
-            if kws:
-                keywords.extend(kws)
-            if vars_:
-                variables.extend(vars_)
+        for table in self.get_index_tables(db_path, table_name):
+            entry = self.get_table_entry(db_path, table)
+            variables.extend(entry.variables)
+            keywords.extend(self.get_entry_keywords(entry, table))
         return {
             DBJsonSetting.keywords: keywords,
-            DBJsonSetting.variables: variables
+            DBJsonSetting.variables: variables,
+            DBJsonSetting.keyword_lookup: get_keyword_lookup(keywords)
         }
 
-    def create_index(self, db_path, t_name, table_name):
-        """Returns single table data for indexing
+    def create_shared_index_for_table(self, db_path, table_name):
+        """Creates index for a single table using the shared sets.
 
-        `db_path`- Where database tables are found
-        `t_name` - From which table to read the data
-        `table_name`- Name of the table where index is created for
+        Index contains the keywords and variables of the table itself,
+        the names of the imported tables which keywords and variables
+        are found from the shared sets and the library aliases. Index
+        and shared sets contain also the lookup of their keywords.
         """
-        variables = []
+        tables = self.get_index_tables(db_path, table_name)
+        entry = self.get_table_entry(db_path, table_name)
+        shared_tables = []
+        # Tables in an import cycle share the closure, which does not
+        # start with the table_name for all of them
+        for table in [t for t in tables if t != table_name]:
+            shared_entry = self.get_table_entry(db_path, table)
+            if shared_entry.keywords or shared_entry.variables:
+                self.write_shared_set(table, shared_entry)
+                shared_tables.append(table)
+        library_alias = {}
+        for table, alias in self.library_alias:
+            library_alias.setdefault(table, alias)
+        keywords = self.get_entry_keywords(entry, table_name)
+        return {
+            DBJsonSetting.keywords: keywords,
+            DBJsonSetting.variables: entry.variables,
+            DBJsonSetting.keyword_lookup: get_keyword_lookup(keywords),
+            DBJsonSetting.shared_tables: shared_tables,
+            DBJsonSetting.library_alias: library_alias
+        }
+
+    def get_index_tables(self, db_path, table_name):
+        """Returns the table, the tables it imports and the global
+        tables. Also collects the library aliases of the tables."""
+        tables = []
+        seen = set()
+        for root in [table_name] + self.get_global_tables(db_path):
+            for table in self.get_closure(db_path, root):
+                if table not in seen:
+                    seen.add(table)
+                    tables.append(table)
+        self.library_alias = []
+        for table in tables:
+            self.library_alias.extend(
+                self.get_table_entry(db_path, table).library_alias)
+        return tables
+
+    def get_entry_keywords(self, entry, table_name):
+        """Returns the keywords of the table for the index.
+
+        Keywords depend on the library alias of the table and they are
+        cached with the table entries by the table name and the alias.
+        """
+        if not entry.keywords:
+            return []
+        key = (table_name, self.get_library_alias(table_name))
+        keywords = self.table_entries.get(key)
+        if keywords is None:
+            keywords = self.get_kw_for_index(
+                entry.keywords,
+                entry.arguments,
+                table_name,
+                entry.object_name
+            )
+            self.table_entries[key] = keywords
+        return keywords
+
+    def write_shared_set(self, table_name, entry):
+        """Writes keywords and variables of the table to the shared set.
+
+        Set is written once by the instance. Library alias depends on
+        the importing table and is not part of the shared set.
+        """
+        if table_name in self.shared_written:
+            return
         keywords = []
+        if entry.keywords:
+            keywords = self.get_kw_for_index(
+                entry.keywords,
+                entry.arguments,
+                table_name,
+                entry.object_name
+            )
+        keywords = [kw[:4] + (None,) for kw in keywords]
+        data = {
+            DBJsonSetting.keywords: keywords,
+            DBJsonSetting.variables: entry.variables,
+            DBJsonSetting.keyword_lookup: get_keyword_lookup(keywords)
+        }
+        self.storage.write_shared(table_name, data)
+        self.shared_written.add(table_name)
+
+    def get_global_tables(self, db_path):
+        """Returns tables which are part of every index"""
+        if not self.global_tables_found:
+            self.add_builtin_to_queue(db_path)
+            if self.xml_libraries:
+                self.add_xml_libraries(self.xml_libraries)
+            self.queue.clear_queue()
+            self.global_tables_found = True
+        return sorted(self.global_tables)
+
+    def get_table_entry(self, db_path, t_name):
+        """Returns the index data of a single table.
+
+        The table is read from the ``db_path`` once and kept in the
+        cache, unless the cache gets full and the table is the least
+        recently used one.
+        """
+        entry = self.table_entries.get(t_name)
+        if entry is None:
+            entry = self.read_table_entry(db_path, t_name)
+            self.table_entries[t_name] = entry
+        return entry
+
+    def read_table_entry(self, db_path, t_name):
         data = None
         try:
             data, read_status = self.read_table(path.join(db_path, t_name))
-            variables, keywords = self.parse_table_data(data, t_name)
+            entry = self.parse_table_data(data, t_name)
         except ValueError:
-                read_status = 2
-        if read_status == 1:
-            logging.warning('Error finding: %s', path.join(db_path, t_name))
-            logging.debug('When creating index for: %s', table_name)
-        elif read_status == 2:
             logging.error('Unknow ValueError on %s', t_name)
             if data:
                 logging.debug(data)
             else:
                 logging.debug('Looks like read_table error')
-        return keywords, variables
+            return EMPTY_ENTRY
+        if read_status == 1:
+            logging.warning('Error finding: %s', path.join(db_path, t_name))
+        return entry
+
+    def get_closure(self, db_path, table):
+        """Returns the table and all tables it imports transitively.
+
+        Closures are computed bottom-up over the strongly connected
+        components of the import graph. Tables in the same import
+        cycle share the closure and closure of each table is computed
+        only once.
+        """
+        if table not in self.closures:
+            self.compute_closures(db_path, table)
+        return self.closures[table]
+
+    def compute_closures(self, db_path, root):
+        """Iterative Tarjan's algorithm starting from the ``root``"""
+        order = {root: 0}
+        lowlink = {root: 0}
+        stack = [root]
+        on_stack = {root}
+        work = [(root, iter(self.get_table_entry(db_path, root).imports))]
+        while work:
+            table, imports = work[-1]
+            for import_ in imports:
+                if import_ in self.closures:
+                    continue
+                if import_ not in order:
+                    order[import_] = lowlink[import_] = len(order)
+                    stack.append(import_)
+                    on_stack.add(import_)
+                    work.append((
+                        import_,
+                        iter(self.get_table_entry(db_path, import_).imports)
+                    ))
+                    break
+                elif import_ in on_stack:
+                    lowlink[table] = min(lowlink[table], order[import_])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[table])
+                if lowlink[table] == order[table]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == table:
+                            break
+                    self.add_closure(db_path, component[::-1])
+
+    def add_closure(self, db_path, component):
+        closure = list(component)
+        seen = set(component)
+        for member in component:
+            for import_ in self.get_table_entry(db_path, member).imports:
+                if import_ in seen:
+                    continue
+                for table in self.closures[import_]:
+                    if table not in seen:
+                        seen.add(table)
+                        closure.append(table)
+        closure = tuple(closure)
+        for member in component:
+            self.closures[member] = closure
 
     def add_builtin_to_queue(self, db_path):
-        for table in listdir(db_path):
-            if table.lower().startswith('builtin'):
-                self.queue.add(table, None, None)
-                return
+        table = self.catalog.builtin
+        if table:
+            self.queue.add(table, None, None)
+            self.global_tables.add(table)
 
     def add_xml_libraries(self, path_to_xml):
         """Adds the found xml libraries to the queue"""
         for file_ in finder(path_to_xml, 'xml'):
             root = ET.parse(file_).getroot()
             if root.attrib['type'] == DBJsonSetting.library:
-                self.queue.add(lib_table_name(root.attrib['name']), None, None)
+                table = lib_table_name(root.attrib['name'])
+                self.queue.add(table, None, None)
+                self.global_tables.add(table)
 
     def parse_table_data(self, data, t_name):
         var = self.get_variables(data)
         kw, args = self.get_keywords(data)
+        object_name = None
         if kw:
             object_name = self.get_object_name(data)
-            kw_index = self.get_kw_for_index(
-                kw, args, t_name, object_name)
-        else:
-            kw_index = []
-        self.add_imports_to_queue(self.get_imports(data))
-        self.queue.set(t_name)
-        return var, kw_index
-
-    def add_imports_to_queue(self, imports):
-        for import_ in imports:
-            self.queue.add(import_, None, None)
-
-    def get_item_from_queue(self):
-        item = self.queue.get()
-        if not item:
-            return item
-        elif not item[1]['scanned']:
-            return item
-        else:
-            return {}
+        imports = self.get_imports(data)
+        self.import_edges[t_name] = imports
+        library_alias = []
+        if DBJsonSetting.libraries in data:
+            library_alias = self.get_library_aliases(data)
+        return TableEntry(var, kw, args, object_name, imports, library_alias)
 
     def get_object_name(self, data):
         object_name = None
@@ -182,30 +402,35 @@ class Index(object):
         return result
 
     def get_library_imports(self, data):
+        """Returns the table names of the imported libraries.
+
+        Table name is read from the library import. Tables created
+        before the name was stored, get the name resolved from the
+        library name and path. Libraries without a table, like the
+        libraries which could not be parsed, are left out, so that
+        the import is not bound to a table of another library with
+        a similar name.
+        """
         l = []
         for lib in data[DBJsonSetting.libraries]:
-            if lib[DBJsonSetting.library_path]:
-                lib_import = lib[DBJsonSetting.library_path]
-            else:
-                lib_import = lib[DBJsonSetting.library_name]
-            lib_args = lib[DBJsonSetting.library_arguments]
-            lib_data = None
-            try:
-                lib_data = self.data_parser.parse_library(
-                    lib_import,
-                    lib_args
-                )
-            except ValueError:
-                message = ('Unable to parse library "{0}"'
-                           ', with args: "{1}"'.format(lib_import, lib_args))
-                logging.error(message)
-            if lib_data:
-                table_name = lib_table_name(
-                    lib_data[DBJsonSetting.library_module]
-                )
+            table_name = library_import_table(lib)
+            if table_name in self.catalog:
                 l.append(table_name)
-                self.library_alias.append(
-                    (table_name, lib[DBJsonSetting.library_alias])
+            else:
+                logging.warning(
+                    'No table for library %s: %s',
+                    lib[DBJsonSetting.library_name], table_name)
+        return l
+
+    def get_library_aliases(self, data):
+        """Returns table name and alias of the libraries imported
+        with an alias."""
+        l = []
+        for lib in data[DBJsonSetting.libraries]:
+            if lib[DBJsonSetting.library_alias]:
+                l.append(
+                    (library_import_table(lib),
+                     lib[DBJsonSetting.library_alias])
                 )
         return l
 
@@ -262,9 +487,6 @@ class Index(object):
 
     def get_kw_for_index(
             self, kw_list, argument_list, table_name, object_name):
-        KeywordRecord = namedtuple(
-            'KeywordRecord',
-            'keyword argument object_name table_name object_alias')
         kw_index = []
         library_alias = self.get_library_alias(table_name)
         for kw, argument in zip(kw_list, argument_list):
@@ -286,33 +508,19 @@ class Index(object):
 
     def read_table(self, t_path):
         try:
-            f = open(t_path)
+            data = self.storage.read_table(t_path)
             status = 0
         except IOError:
             logging.warning('Could not open table: %s', t_path)
             similar = self.find_similar_table(t_path)
             logging.info('Instead of %s using: %s', t_path, similar)
-            f = open(similar)
+            data = self.storage.read_table(similar)
             status = 1
-        data = json_load(f)
-        f.close()
         return data, status
 
     def find_similar_table(self, t_path):
-        path_ = path.dirname(t_path)
-        name = path.basename(t_path).split('-', 1)[0]
-        similar_table = None
-        if path.exists(path_):
-            dir_list = listdir(path_)
-        else:
-            dir_list = []
-        for f_name in dir_list:
-            if f_name.startswith(name):
-                similar_table = path.join(path_, f_name)
+        similar_table = self.catalog.find_similar(t_path)
         if not similar_table:
             raise ValueError(
                 'Could not locate similar table to: {0}'.format(t_path))
         return similar_table
-
-    def get_index_path(self, table):
-        return path.join(self.index_path, get_index_name(table))
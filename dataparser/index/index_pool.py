@@ -0,0 +1,149 @@
+import logging
+import multiprocessing
+import sys
+import time
+from index.index import init_index_worker, index_chunk
+from index.index import release_index_worker
+from index.table_catalog import TableCatalog
+from storage.storage import get_storage
+
+
+class IndexPool(object):
+    """Creates the indexes in a pool of worker processes.
+
+    ``workers`` -- Number of worker processes, by default the number of
+                   CPUs. With a single worker, or a single table, the
+                   indexes are created in the current process.
+
+    Each worker creates one Index when it starts and uses it for all
+    the tables it indexes. Tables are ordered by their import fan-out,
+    from the previous import graph, so that the tables which import
+    most tables, and take longest to index, are started first. Tables
+    are sent to the workers in chunks, which are dealt in turns so that
+    every chunk contains both slow and fast tables.
+
+    Pool is started by the ``start`` or by the first ``index`` call and
+    it must be stopped with the ``close``, or the pool must be used as a
+    context manager. Seconds used to index each table are collected to
+    the ``stats`` and logged by the ``log_stats``. Table names are
+    listed once, when the first tables are indexed, and the same
+    TableCatalog is given to all workers.
+    """
+    chunks_per_worker = 4
+
+    def __init__(self, db_path, index_path, xml_libraries=None,
+                 workers=None):
+        self.db_path = db_path
+        self.index_path = index_path
+        self.xml_libraries = xml_libraries
+        self.workers = workers or multiprocessing.cpu_count()
+        self.pool = None
+        self.catalog = None
+        self.stats = []
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type:
+            self.terminate()
+        else:
+            self.close()
+
+    def start(self):
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(
+                self.workers,
+                initializer=init_index_worker,
+                initargs=(
+                    self.db_path,
+                    self.index_path,
+                    self.xml_libraries,
+                    list(sys.path),
+                    self.get_catalog()
+                )
+            )
+        return self.pool
+
+    def close(self):
+        """Waits for the workers to finish and stops them"""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def terminate(self):
+        """Stops the workers without waiting for them"""
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    def index(self, tables, graph=None):
+        """Creates index for the ``tables``.
+
+        ``graph`` -- ImportGraph used to order the tables, tables are
+                     ordered by name if it is not given.
+
+        Returns import edges and global tables of each indexed table,
+        in the format used by the ``update_import_graph``.
+        """
+        if not tables:
+            return []
+        start = time.time()
+        chunks = self.get_chunks(self.order_tables(tables, graph))
+        if self.workers == 1 or len(tables) == 1:
+            init_index_worker(
+                self.db_path, self.index_path, self.xml_libraries,
+                sys.path, self.get_catalog())
+            try:
+                chunk_results = [index_chunk(chunk) for chunk in chunks]
+            finally:
+                release_index_worker()
+        else:
+            chunk_results = self.start().imap_unordered(index_chunk, chunks)
+        results = []
+        for chunk_result in chunk_results:
+            for table, import_edges, global_tables, seconds in chunk_result:
+                self.stats.append((table, seconds))
+                results.append((import_edges, global_tables))
+        self.elapsed += time.time() - start
+        return results
+
+    def get_catalog(self):
+        if self.catalog is None:
+            storage = get_storage(self.db_path, self.index_path)
+            self.catalog = TableCatalog.from_storage(storage)
+            storage.close()
+        return self.catalog
+
+    def order_tables(self, tables, graph=None):
+        """Returns tables with the biggest import fan-out first"""
+        if graph is None:
+            return sorted(tables)
+        return sorted(
+            tables, key=lambda table: (-graph.fan_out(table), table))
+
+    def get_chunks(self, tables):
+        """Deals the ``tables`` to the chunks in turns.
+
+        First chunk gets the first table, second chunk the second table
+        and so on, until every chunk has a table and the first chunk
+        gets the next table.
+        """
+        count = min(len(tables), self.workers * self.chunks_per_worker)
+        params = [
+            (self.db_path, table, self.index_path, self.xml_libraries)
+            for table in tables
+        ]
+        return [params[index::count] for index in range(count)]
+
+    def log_stats(self):
+        """Logs the seconds used to index each table, slowest first"""
+        logging.info(
+            'Indexed %s tables in %.2f seconds with %s workers',
+            len(self.stats), self.elapsed, self.workers)
+        for table, seconds in sorted(
+                self.stats, key=lambda stat: (-stat[1], stat[0])):
+            logging.info('Index time %.3f seconds: %s', seconds, table)
@@ -0,0 +1,90 @@
+from collections import OrderedDict
+
+# Estimated size of the tables kept in the memory of a single worker.
+# Actual memory use is a few times bigger than the estimate.
+CACHE_SIZE = 16 * 1024 * 1024
+
+
+def estimate_size(value):
+    """Returns an estimate of the memory used by the ``value``.
+
+    Strings are counted by their length and every container and item
+    by a fixed amount, which is enough to compare the tables with
+    each other.
+    """
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            size += len(item) + 1
+        elif isinstance(item, dict):
+            size += 1
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set)):
+            size += 1
+            stack.extend(item)
+        else:
+            size += 1
+    return size
+
+
+class TableCache(object):
+    """Least recently used cache of the parsed tables.
+
+    ``max_size`` -- Maximum total size of the cached values, as counted
+                    by the ``estimate_size``. When the size is exceeded,
+                    the least recently used values are removed. A value
+                    bigger than the ``max_size`` is not cached.
+
+    The cache is used like a dictionary and the ``hits`` and
+    ``misses`` count how many times values were found by the ``get``.
+    """
+
+    def __init__(self, max_size=CACHE_SIZE):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._values = OrderedDict()
+
+    def get(self, key, default=None):
+        try:
+            value = self[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def clear(self):
+        self._values.clear()
+        self.size = 0
+
+    def __getitem__(self, key):
+        value, _ = self._values[key]
+        self._values.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self._values:
+            del self[key]
+        size = estimate_size(value)
+        if size > self.max_size:
+            return
+        self._values[key] = (value, size)
+        self.size += size
+        while self.size > self.max_size:
+            _, (_, removed) = self._values.popitem(last=False)
+            self.size -= removed
+
+    def __delitem__(self, key):
+        _, size = self._values.pop(key)
+        self.size -= size
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __len__(self):
+        return len(self._values)
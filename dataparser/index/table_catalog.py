@@ -0,0 +1,60 @@
+from bisect import bisect_left
+from os import path
+
+# Key of the BuiltIn table, table names can not contain the asterisk
+BUILTIN = '*builtin'
+
+
+def table_prefix(table):
+    """Returns the table name without the hash, ``common-<md5>.json``
+    returns ``common``."""
+    return path.basename(table).split('-', 1)[0]
+
+
+class TableCatalog(object):
+    """Names of the database tables, read once per indexing run.
+
+    Tables are grouped by their prefix and the BuiltIn table is found
+    with the ``BUILTIN`` key, so that the table names do not need to be
+    listed again when looking for the BuiltIn table or for a table
+    similar to a missing one.
+    """
+
+    def __init__(self, tables):
+        self.tables = sorted(tables)
+        self.prefixes = {}
+        for table in self.tables:
+            self.prefixes.setdefault(table_prefix(table), []).append(table)
+            if table.lower().startswith('builtin'):
+                self.prefixes.setdefault(BUILTIN, [table])
+
+    @classmethod
+    def from_storage(cls, storage):
+        return cls(storage.table_names())
+
+    @property
+    def builtin(self):
+        """Returns the BuiltIn table or None if it is not found"""
+        tables = self.prefixes.get(BUILTIN)
+        return tables[0] if tables else None
+
+    def __contains__(self, table):
+        index = bisect_left(self.tables, table)
+        return index < len(self.tables) and self.tables[index] == table
+
+    def find_similar(self, t_path):
+        """Returns a table with the same prefix as the ``t_path``.
+
+        If no table has the same prefix, the last table starting with
+        the prefix is returned. Returns None if no table is found.
+        """
+        prefix = table_prefix(t_path)
+        if prefix in self.prefixes:
+            return self.prefixes[prefix][-1]
+        start = bisect_left(self.tables, prefix)
+        similar = None
+        for table in self.tables[start:]:
+            if not table.startswith(prefix):
+                break
+            similar = table
+        return similar
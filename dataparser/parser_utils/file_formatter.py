@@ -1,5 +1,9 @@
 from hashlib import md5
 from os import path
+try:
+    from db_json_settings import DBJsonSetting
+except ImportError:
+    from ...setting.db_json_settings import DBJsonSetting
 
 
 def rf_table_name(f_path):
@@ -17,3 +21,29 @@ def lib_table_name(library):
         md5=md5(library.encode() if isinstance(library, str)
             else library).hexdigest()
     )
+
+
+def lib_import_table_name(library_name, library_path=None):
+    """Returns the table name of the imported library.
+
+    The name is resolved in same way as library module name is resolved
+    when library is parsed, but without importing the library.
+    """
+    if library_path:
+        library_name = path.splitext(path.basename(library_path))[0]
+    return lib_table_name(library_name)
+
+
+def library_import_table(library_import):
+    """Returns the table name of the library import.
+
+    Table name is read from the import. Imports scanned before the name
+    was stored, get the name resolved from the library name and path.
+    """
+    table_name = library_import.get(DBJsonSetting.library_table)
+    if not table_name:
+        table_name = lib_import_table_name(
+            library_import[DBJsonSetting.library_name],
+            library_import[DBJsonSetting.library_path]
+        )
+    return table_name
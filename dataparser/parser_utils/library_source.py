@@ -0,0 +1,74 @@
+import os
+from importlib.util import find_spec
+from robot.libraries import STDLIBS
+from parser_utils.util import normalise_path
+try:
+    from importlib.metadata import packages_distributions, version
+    from importlib.metadata import PackageNotFoundError
+except ImportError:
+    packages_distributions = None
+
+
+def library_source(library):
+    """Returns the file where the library module is defined.
+
+    Libraries imported by name are resolved without importing the
+    library itself. Returns None if the file could not be located.
+    """
+    if library in STDLIBS:
+        library = 'robot.libraries.{0}'.format(library)
+    names = [library]
+    if '.' in library:
+        # Library can also be imported as module.ClassName
+        names.append(library.rsplit('.', 1)[0])
+    for name in names:
+        try:
+            spec = find_spec(name)
+        except (ImportError, ValueError, AttributeError):
+            spec = None
+        if spec and spec.origin and os.path.isfile(spec.origin):
+            return normalise_path(spec.origin)
+    return None
+
+
+def package_files(source):
+    """Returns the Python files of the package defined in the ``source``.
+
+    If the ``source`` is not the ``__init__.py`` of a package, returns
+    only the ``source``. Files are returned in sorted order.
+    """
+    if os.path.basename(source) != '__init__.py':
+        return [source]
+    files = []
+    for folder, dirs, file_names in os.walk(os.path.dirname(source)):
+        dirs[:] = sorted(
+            dir_ for dir_ in dirs
+            if dir_ != '__pycache__' and not dir_.startswith('.'))
+        for file_name in sorted(file_names):
+            if file_name.endswith('.py'):
+                files.append(os.path.join(folder, file_name))
+    return files
+
+
+def distribution_version(library, distributions):
+    """Returns version of the installed distribution which provides
+    the ``library`` or None if the library is not installed.
+
+    ``distributions`` is the mapping returned by the
+    ``get_distributions``.
+    """
+    module = library.split('.')[0]
+    for distribution in distributions.get(module, []):
+        try:
+            return version(distribution)
+        except PackageNotFoundError:
+            continue
+    return None
+
+
+def get_distributions():
+    """Returns mapping of the top level modules to the distributions
+    which provide them"""
+    if packages_distributions is None:
+        return {}
+    return packages_distributions()
@@ -35,6 +35,8 @@ class SampleVisitor(ModelVisitor):
         # self.keyword_attrs = dict()
         # print(node.name)
         self.keyword_attrs['name'] = node.name
+        self.keyword_attrs['lineno'] = node.lineno
+        self.keyword_attrs['col_offset'] = _name_col_offset(node)
         self.generic_visit(node)
         # breakpoint()
         self.keywords.append(Keyword(**self.keyword_attrs))
@@ -88,12 +90,34 @@ class SampleVisitor(ModelVisitor):
 
 
 
+class HeaderVisitor(SampleVisitor):
+    """Collects only the imports, variable names and keyword names.
+
+    Test cases and keyword bodies are not visited, therefore keyword
+    arguments, documentation and tags are left empty.
+    """
+
+    def visit_TestCaseSection(self, node):
+        pass
+
+    def visit_Keyword(self, node):
+        self.keywords.append(
+            Keyword(node.name, lineno=node.lineno,
+                    col_offset=_name_col_offset(node)))
+
+
+def _name_col_offset(node):
+    return node.header.get_token(Token.KEYWORD_NAME).col_offset
+
+
 @dataclass
 class Keyword:
     name: str
     args: list[str] = field(default_factory=list)
     doc: str = str()
     tags: list[str] = field(default_factory=list)
+    lineno: int = 0
+    col_offset: int = 0
 
 @dataclass
 class Library:
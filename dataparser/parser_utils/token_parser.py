@@ -0,0 +1,237 @@
+import re
+from parser_utils.rf4_parser import Keyword, Library, Variable
+
+SPACE_SPLITTER = re.compile(r'\s{2,}|\t')
+PIPE_SPLITTER = re.compile(r'(?:\A|\s+)\|(?:\s+|\Z)')
+ESCAPED_OR_NEWLINE = re.compile(r'(\\+)n?$')
+
+SETTING_MARKERS = ('Settings', 'Setting')
+VARIABLE_MARKERS = ('Variables', 'Variable')
+KEYWORD_MARKERS = ('Keywords', 'Keyword')
+
+SETTINGS = 'settings'
+VARIABLES = 'variables'
+KEYWORDS = 'keywords'
+IGNORED = 'ignored'
+
+
+def _normalize(name):
+    return re.sub(r'\s', ' ', name).title()
+
+
+def _section(marker):
+    name = _normalize(marker).strip('* ')
+    if name in SETTING_MARKERS:
+        return SETTINGS
+    if name in VARIABLE_MARKERS:
+        return VARIABLES
+    if name in KEYWORD_MARKERS:
+        return KEYWORDS
+    return IGNORED
+
+
+def split_line(line):
+    """Returns the data cells of the line.
+
+    Lines are split like the Robot Framework tokenizer does, but the
+    separators and comments are not returned. Empty cells at the
+    end of the line are removed.
+    """
+    line = line.rstrip()
+    if line[:1] == '|' and line[:2].strip() == '|':
+        cells = []
+        rest = PIPE_SPLITTER.split(line, 1)[1]
+        # Separator may start from the beginning of the rest, therefore
+        # the line can not be split with a single call.
+        while PIPE_SPLITTER.search(rest):
+            cell, rest = PIPE_SPLITTER.split(rest, 1)
+            cells.append(cell)
+        cells.append(rest)
+    else:
+        cells = SPACE_SPLITTER.split(line)
+    for index, cell in enumerate(cells):
+        if cell.lstrip()[:1] == '#':
+            del cells[index:]
+            break
+    while cells and not cells[-1]:
+        cells.pop()
+    return cells
+
+
+def read_statements(lines):
+    """Returns statements as lists of (line number, cell) tuples.
+
+    Lines without data are ignored and lines starting with ``...``
+    are added to the previous statement.
+    """
+    statement = []
+    for lineno, line in enumerate(lines, start=1):
+        cells = split_line(line)
+        if not any(cells):
+            continue
+        first = 0
+        while not cells[first]:
+            first += 1
+        if cells[first] == '...':
+            values = cells[first + 1:] or ['']
+            statement.extend((lineno, value) for value in values)
+            continue
+        if statement:
+            yield statement
+        statement = [(lineno, cell) for cell in cells]
+    if statement:
+        yield statement
+
+
+def join_documentation(cells):
+    """Joins the documentation cells like Robot Framework does"""
+    lines = []
+    lineno = None
+    for cell_lineno, value in cells:
+        if cell_lineno != lineno:
+            lines.append([])
+            lineno = cell_lineno
+        lines[-1].append(value)
+    lines = [' '.join(line) for line in lines]
+    doc = []
+    for index, line in enumerate(lines):
+        doc.append(line)
+        if index < len(lines) - 1:
+            match = ESCAPED_OR_NEWLINE.search(line)
+            if not match or len(match.group(1)) % 2 == 0:
+                doc.append('\n')
+    return ''.join(doc)
+
+
+class TokenExtractor(object):
+    """Extracts imports, variables and keywords from Robot Framework data.
+
+    Faster alternative to building the model with ``get_resource_model``
+    and walking it with the SampleVisitor. The file is split to cells
+    and statements with the same rules as the Robot Framework tokenizer
+    uses and only the statements needed by the scanner are handled.
+    Results are in the same attributes and in the same format as in the
+    SampleVisitor. Like in the resource model, test cases are ignored.
+
+    ``details`` -- If False, only the keyword names are collected, like
+                   with the HeaderVisitor.
+    """
+    extensions = ('.robot', '.resource', '.txt', '.tsv')
+
+    def __init__(self, details=True):
+        self.details = details
+        self.keywords = []
+        self.variables = []
+        self.libraries_import = []
+        self.resources_import = []
+        self.variables_import = []
+        # SampleVisitor collects documentation and tags from all nodes
+        # and they are used by the next keyword, if it does not define
+        # own values.
+        self.keyword_attrs = {}
+
+    def extract(self, source):
+        """Extracts data from the ``source`` file"""
+        with open(source, encoding='utf-8-sig') as f:
+            return self.extract_lines(f.read().splitlines())
+
+    def extract_lines(self, lines):
+        self.lines = lines
+        section = IGNORED
+        documentation_seen = False
+        block = None
+        for statement in read_statements(lines):
+            marker = statement[0][1]
+            if marker.startswith('*'):
+                self._end_keyword(block)
+                section = _section(marker)
+                block = None
+                continue
+            if section == SETTINGS:
+                if _normalize(marker) == 'Documentation' and \
+                        not documentation_seen:
+                    documentation_seen = True
+                    self.keyword_attrs['doc'] = join_documentation(
+                        statement[1:])
+                else:
+                    self._setting(marker, [cell for _, cell in statement[1:]])
+            elif section == VARIABLES:
+                self.variables.append(marker)
+            elif section == KEYWORDS:
+                block = self._keyword(statement, block)
+        self._end_keyword(block)
+        return self
+
+    def _setting(self, name, values):
+        name = _normalize(name)
+        # Model has imports without name when the name is missing
+        if name == 'Library':
+            alias = None
+            if len(values) > 1 and \
+                    re.sub(r'\s', ' ', values[-2]) == 'WITH NAME':
+                alias = values[-1]
+                values = values[:-2] or [alias]
+            values = values or [None]
+            self.libraries_import.append(
+                Library(values[0], tuple(values[1:]), alias))
+        elif name == 'Resource' and len(values) < 2:
+            self.resources_import.append(values[0] if values else None)
+        elif name == 'Variables':
+            values = values or [None]
+            self.variables_import.append(
+                Variable(values[0], tuple(values[1:])))
+
+    def _keyword(self, statement, block):
+        """Handles the statement in the keyword section and returns the
+        current keyword"""
+        if statement[0][1] or block is None:
+            # Model creates a keyword without name from indented data
+            # at the beginning of the section
+            self._end_keyword(block)
+            lineno = statement[0][0]
+            block = {
+                'name': statement[0][1],
+                'settings': set(),
+                'lineno': lineno,
+                'col_offset': self._name_col_offset(lineno)
+            }
+            statement = statement[1:]
+            # Continuation lines are part of the name, unless there is
+            # data after the name in the same line
+            if statement and statement[0][0] != lineno:
+                statement = []
+        else:
+            while statement and not statement[0][1]:
+                statement = statement[1:]
+        if not statement or not self.details:
+            return block
+        marker = statement[0][1]
+        if marker[:1] != '[' or marker[-1:] != ']':
+            return block
+        name = _normalize(marker[1:-1].strip())
+        if name in block['settings']:
+            return block
+        block['settings'].add(name)
+        if name == 'Documentation':
+            self.keyword_attrs['doc'] = join_documentation(statement[1:])
+        elif name == 'Tags':
+            self.keyword_attrs['tags'] = [cell for _, cell in statement[1:]]
+        elif name == 'Arguments':
+            self.keyword_attrs['args'] = [cell for _, cell in statement[1:]]
+        return block
+
+    def _end_keyword(self, block):
+        if not block:
+            return
+        attrs = self.keyword_attrs if self.details else {}
+        self.keywords.append(
+            Keyword(block['name'], lineno=block['lineno'],
+                    col_offset=block['col_offset'], **attrs))
+        self.keyword_attrs = {}
+
+    def _name_col_offset(self, lineno):
+        """Name is the first cell of the line"""
+        line = self.lines[lineno - 1]
+        if line[:1] == '|' and line[:2].strip() == '|':
+            return PIPE_SPLITTER.match(line).end()
+        return 0
@@ -1,3 +1,5 @@
+import os
+import sys
 from os import path
 
 def normalise_path(f_path):
@@ -7,5 +9,88 @@ def normalise_path(f_path):
     return path.join(dirname, basename)
 
 
+def file_stat(f_path):
+    """Returns modification time and size of the file or None if the
+    file does not exist"""
+    if not f_path:
+        return None
+    try:
+        stat = os.stat(f_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
 def get_index_name(table_name):
     return 'index-{0}'.format(table_name)
+
+
+def get_index_table_name(index_name):
+    """Returns the table name of the index_name"""
+    return index_name[len(get_index_name('')):]
+
+
+def get_manifest_path(db_path):
+    """Returns path to the scan manifest, which is next to the db_path"""
+    return '{0}.manifest.json'.format(path.normpath(db_path))
+
+
+def get_import_graph_path(index_path):
+    """Returns path to the import graph, which is next to the index_path"""
+    return '{0}.imports.json'.format(path.normpath(index_path))
+
+
+def get_shared_index_dir(index_path):
+    """Returns folder of the shared index sets, which is next to the
+    index_path"""
+    return '{0}.shared'.format(path.normpath(index_path))
+
+
+def normalize_keyword(keyword):
+    """Returns keyword in lower case without spaces and under scores"""
+    return keyword.lower().replace(' ', '').replace('_', '')
+
+
+def get_keyword_key(keyword_name):
+    """Returns the key of the keyword in the keywords of the table"""
+    return keyword_name.lower().replace(' ', '_')
+
+
+def get_keyword_lookup(keywords, offset=0):
+    """Returns lookup of the keyword records by the object name and the
+    normalized keyword name.
+
+    ``keywords`` -- Keyword records of the index.
+    ``offset``   -- Added to the positions of the records.
+
+    Lookup is a dictionary of ``{object name: {keyword: position}}``,
+    where the object name is the object name or the library alias of
+    the record and empty string for the records of all objects. When
+    multiple records match, the first one is kept. Keywords with
+    embedded arguments can not be looked up by the name and are left
+    out.
+    """
+    lookup = {}
+    for position, record in enumerate(keywords, start=offset):
+        name, object_name, object_alias = record[0], record[2], record[4]
+        if '$' in name:
+            continue
+        name = normalize_keyword(name).lstrip('.')
+        for object_ in ('', object_name, object_alias):
+            if object_ is not None:
+                lookup.setdefault(object_, {}).setdefault(name, position)
+    return lookup
+
+
+def forget_modules(modules, keep_folders):
+    """Removes modules imported after the ``modules``.
+
+    Modules defined in the ``keep_folders`` are not removed. Removed
+    modules are imported again when they are used next time.
+    """
+    keep = tuple(
+        path.normcase(path.realpath(folder)) for folder in keep_folders)
+    for name in set(sys.modules) - modules:
+        file_ = getattr(sys.modules[name], '__file__', None)
+        if file_ and not path.normcase(path.realpath(file_)).startswith(keep):
+            del sys.modules[name]
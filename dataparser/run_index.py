@@ -1,62 +1,166 @@
 import argparse
 import sys
-import shutil
-import multiprocessing
-from os import path, listdir, makedirs
+from os import path
 
 ROOT_DIR = path.dirname(path.abspath(__file__))
 SETTING_DIR = path.join(ROOT_DIR, '..', 'setting')
 sys.path.append(SETTING_DIR)
 
-from index.index import index_a_table
 from index.index import Index
+from index.index_pool import IndexPool
+from index.import_graph import ImportGraph
+from parser_utils.util import file_stat, get_import_graph_path
+from storage.storage import get_storage, is_sqlite_path
 
+_IMPORT_GRAPHS = {}
 
-def index_all(db_path, index_path, module_search_path, libs_in_xml):
+
+def load_import_graph(index_path):
+    """Returns the import graph of the ``index_path`` or None if the
+    graph is not found.
+
+    Graph saved by the ``update_import_graph`` is kept between the jobs
+    of the worker and read again only when the graph file has changed
+    after it was saved. Graph is taken out of the cache until it is
+    saved again, so that a failed job does not leave a modified graph
+    in the cache.
+    """
+    graph_path = get_import_graph_path(index_path)
+    graph, source = _IMPORT_GRAPHS.pop(graph_path, (None, None))
+    if graph is not None and source == file_stat(graph_path):
+        return graph
+    graph = ImportGraph(graph_path)
+    if not graph.load():
+        return None
+    return graph
+
+
+def index_all(db_path, index_path, module_search_path, libs_in_xml,
+              workers=None):
+    """Creates the index for all tables.
+
+    Import graph of the previous indexing, if it exists, is used to
+    start the tables importing most tables first.
+    """
     for path_ in module_search_path:
         sys.path.append(path_)
-    tables = listdir(db_path)
-    params = []
-    for table in tables:
-        params.append((db_path, table, index_path, libs_in_xml))
-    if path.exists(index_path):
-        shutil.rmtree(index_path)
-    makedirs(index_path)
-    pool = multiprocessing.Pool()
-    pool.map(index_a_table, params)
+    storage = get_storage(db_path, index_path)
+    tables = storage.table_names()
+    previous = load_import_graph(index_path)
+    storage.clear_index()
+    storage.close()
+    with IndexPool(db_path, index_path, libs_in_xml, workers) as pool:
+        results = pool.index(tables, previous)
+    pool.log_stats()
+    graph = ImportGraph(get_import_graph_path(index_path))
+    update_import_graph(graph, results)
 
 
 def index_single(db_path, db_table, index_path, module_search_path,
                  libs_in_xml):
     for path_ in module_search_path:
         sys.path.append(path_)
-    if not path.exists(index_path):
-        makedirs(index_path)
     index = Index(db_path=db_path, index_path=index_path,
                   xml_libraries=libs_in_xml)
     index.index_consturctor(table=db_table)
+    graph = load_import_graph(index_path)
+    if graph is None:
+        graph = ImportGraph(get_import_graph_path(index_path))
+    update_import_graph(
+        graph, [(index.import_edges, sorted(index.global_tables))])
+
+
+def index_changed(db_path, changed_tables, index_path, module_search_path,
+                  libs_in_xml, workers=None):
+    """Re-creates the index for tables which depend on the changed tables.
+
+    Dependent tables are resolved from the import graph saved by the
+    previous indexing. If one of the global tables, like BuiltIn, is
+    changed all tables are indexed. If import graph does not exist,
+    tables importing the changed tables are found from the SQLite
+    database, and from other databases only the changed tables are
+    indexed.
+    """
+    graph = load_import_graph(index_path)
+    if not path.exists(index_path) or graph is None:
+        if graph is None:
+            graph = ImportGraph(get_import_graph_path(index_path))
+        tables = set(changed_tables)
+        if is_sqlite_path(db_path):
+            tables = find_importers(db_path, tables)
+    else:
+        tables = graph.dependents(changed_tables)
+    if tables is None:
+        index_all(
+            db_path, index_path, module_search_path, libs_in_xml, workers)
+        return
+    for path_ in module_search_path:
+        sys.path.append(path_)
+    storage = get_storage(db_path, index_path)
+    existing = set(storage.table_names())
+    for table in tables - existing:
+        storage.remove_index(table)
+        graph.remove(table)
+    storage.close()
+    with IndexPool(db_path, index_path, libs_in_xml, workers) as pool:
+        results = pool.index(sorted(tables & existing), graph)
+    pool.log_stats()
+    update_import_graph(graph, results)
+
+
+def find_importers(db_path, tables):
+    """Returns the ``tables`` and the tables importing them directly
+    or transitively, found with the indexed queries of SQLite."""
+    storage = get_storage(db_path)
+    try:
+        result = set(tables)
+        queue = list(tables)
+        while queue:
+            for importer in storage.find_importers(queue.pop()):
+                if importer not in result:
+                    result.add(importer)
+                    queue.append(importer)
+    finally:
+        storage.close()
+    return result
+
+
+def update_import_graph(graph, results):
+    for import_edges, global_tables in results:
+        graph.update(import_edges, global_tables)
+    graph.save()
+    _IMPORT_GRAPHS[graph.graph_path] = (graph, file_stat(graph.graph_path))
 
 if __name__ == '__main__':
     c_parser = argparse.ArgumentParser(
         description='Indexing Scanner results')
     c_parser.add_argument(
         'mode',
-        choices=['all', 'single'],
-        help='Index mode: all or single'
+        choices=['all', 'single', 'changed'],
+        help='Index mode: all, single or changed'
     )
     c_parser.add_argument(
         '--db_path',
         required=True,
-        help='Folder where Scanner result is read'
+        help=('Folder where Scanner result is read. If path ends with '
+              '.sqlite, .sqlite3 or .db, Scanner result and index are '
+              'read and saved in the SQLite file')
     )
     c_parser.add_argument(
         '--db_table',
         help='File name, in the db_path folder, where index is created'
     )
+    c_parser.add_argument(
+        '--tables',
+        nargs='*',
+        help=('List of changed tables, in the db_path folder. Used '
+              'with changed mode to index the tables and all tables '
+              'importing them')
+    )
     c_parser.add_argument(
         '--index_path',
         required=True,
-        help='Folder where index result is saved'
+        help='Folder where index result is saved, not used with SQLite'
     )
     c_parser.add_argument(
         '--module_search_path',
@@ -65,6 +169,11 @@ if __name__ == '__main__':
     c_parser.add_argument(
         '--path_to_lib_in_xml',
         help='Path to libraries in XML format')
+    c_parser.add_argument(
+        '--workers',
+        type=int,
+        help=('Number of processes used to create the index, by default '
+              'the number of CPUs'))
     args = c_parser.parse_args()
     module_search_path = []
     if args.module_search_path:
@@ -74,7 +183,17 @@ if __name__ == '__main__':
             args.db_path,
             args.index_path,
             module_search_path,
-            args.path_to_lib_in_xml
+            args.path_to_lib_in_xml,
+            args.workers
+        )
+    elif args.mode == 'changed':
+        index_changed(
+            args.db_path,
+            args.tables or [],
+            args.index_path,
+            module_search_path,
+            args.path_to_lib_in_xml,
+            args.workers
         )
     else:
         index_single(
@@ -1,4 +1,5 @@
 import argparse
+import logging
 import sys
 from os import path
 
@@ -6,33 +7,150 @@ ROOT_DIR = path.dirname(path.abspath(__file__))
 SETTING_DIR = path.join(ROOT_DIR, '..', 'setting')
 sys.path.append(SETTING_DIR)
 
+from data_parser.data_parser import DataParser
 from data_queue.scanner import Scanner
+from data_queue.watcher import get_watcher
+from parser_utils.util import file_stat, forget_modules
+from run_index import index_changed
+
+_PARSERS = {}
+
+
+def get_scanner(path_file, libs_in_xml, libdoc_cache):
+    """Returns a Scanner which uses the parser kept between the jobs.
+
+    DataParser, with the path variables and the libdoc cache, is kept
+    warm in the worker and created again only when the ``path_file``
+    has changed after the parser was created.
+    """
+    key = (path_file, libdoc_cache)
+    source = file_stat(path_file)
+    parser, parser_source = _PARSERS.get(key, (None, None))
+    if parser is None or parser_source != source:
+        parser = DataParser(path_file, libdoc_cache)
+        _PARSERS[key] = (parser, source)
+    return Scanner(path_file, libs_in_xml, libdoc_cache, parser)
 
 
 def scan_all(workspace, extension, db_path,
-             module_search_path, libs_in_xml, path_file):
+             module_search_path, libs_in_xml, path_file, workers=1,
+             incremental=False, libdoc_cache=None, lazy=False):
     for path_ in module_search_path:
         sys.path.append(path_)
-    scanner = Scanner(path_file, libs_in_xml)
-    scanner.scan(
+    scanner = get_scanner(path_file, libs_in_xml, libdoc_cache)
+    tables = scanner.scan(
+        workspace=workspace,
+        ext=extension,
+        db_path=db_path,
+        workers=workers,
+        incremental=incremental,
+        lazy=lazy
+    )
+    return sorted(tables)
+
+
+def scan_changed(changed, workspace, extension, db_path, libs_in_xml,
+                 path_file, libdoc_cache=None):
+    """Scans the ``changed`` files and returns the names of the created
+    and removed tables"""
+    scanner = get_scanner(path_file, libs_in_xml, libdoc_cache)
+    tables = scanner.scan_changed(
+        changed=changed,
         workspace=workspace,
         ext=extension,
         db_path=db_path
     )
+    return sorted(tables)
+
 
+def complete_tables(db_path, libs_in_xml, path_file, libdoc_cache=None):
+    """Parses the keyword details of the tables created by the lazy
+    scan and returns the names of the completed tables"""
+    scanner = get_scanner(path_file, libs_in_xml, libdoc_cache)
+    return scanner.complete_tables(db_path)
 
-def scan_single(file_path, db_path, libs_in_xml, path_file):
-    scanner = Scanner(path_file, libs_in_xml)
+
+def scan_single(file_path, db_path, libs_in_xml, path_file,
+                libdoc_cache=None):
+    scanner = get_scanner(path_file, libs_in_xml, libdoc_cache)
     scanner.scan_single_file(file_path=file_path, db_path=db_path)
 
 
+def scan_files(file_paths, db_path, libs_in_xml, path_file,
+               libdoc_cache=None):
+    """Scans the files and returns the names of the created tables"""
+    scanner = get_scanner(path_file, libs_in_xml, libdoc_cache)
+    return scanner.scan_files(file_paths=file_paths, db_path=db_path)
+
+
+def watch(workspace, extension, db_path, module_search_path, libs_in_xml,
+          path_file, index_path=None, libdoc_cache=None, interval=1.0,
+          settle=0.5, watcher=None, stop=None):
+    """Keeps the database up to date until interrupted or ``stop`` is set.
+
+    Files with the ``extension`` in the ``workspace`` and Python and
+    Robot Framework files in the ``module_search_path`` are watched.
+    The workspace is first scanned incrementally. Then changes are
+    collected until no more changes are seen in ``settle`` seconds and
+    only the changed files are scanned, see ``Scanner.scan_changed``.
+    Changed Python file in the ``module_search_path`` causes only the
+    library or variable file created from it to be parsed again. If
+    ``index_path`` is given, the tables which depend on the changed
+    tables are indexed again. Libraries imported by the scan are
+    imported again after a change, so that changed libraries are
+    parsed again.
+    """
+    if watcher is None:
+        roots = [(workspace, [extension])]
+        for path_ in module_search_path:
+            roots.append((path_, ['py', extension, 'resource']))
+        watcher = get_watcher(roots, interval)
+    for path_ in module_search_path:
+        sys.path.append(path_)
+    keep = (sys.prefix, sys.base_prefix, path.dirname(ROOT_DIR))
+    changed = None
+    try:
+        while not (stop and stop.is_set()):
+            if changed is not None:
+                changed = watcher.wait(interval)
+                if not changed:
+                    continue
+                more = watcher.wait(settle)
+                while more:
+                    changed.update(more)
+                    more = watcher.wait(settle)
+                logging.info('Changed: %s', ', '.join(sorted(changed)))
+            modules = set(sys.modules)
+            try:
+                if changed is None:
+                    tables = scan_all(
+                        workspace, extension, db_path, [], libs_in_xml,
+                        path_file, incremental=True,
+                        libdoc_cache=libdoc_cache)
+                else:
+                    tables = scan_changed(
+                        changed, workspace, extension, db_path,
+                        libs_in_xml, path_file, libdoc_cache=libdoc_cache)
+                if index_path and tables:
+                    index_changed(
+                        db_path, tables, index_path, [], libs_in_xml)
+            except Exception:
+                logging.exception('Error when updating: %s', db_path)
+            finally:
+                forget_modules(modules, keep)
+            changed = set()
+    finally:
+        watcher.close()
+
+
 if __name__ == '__main__':
     c_parser = argparse.ArgumentParser(
         description='Scanning Robot data from system Python')
     c_parser.add_argument(
         'mode',
-        choices=['all', 'single'],
-        help='Scanning mode: all or single'
+        choices=['all', 'single', 'watch'],
+        help=('Scanning mode: all, single or watch. In watch mode the '
+              'database is updated when files change until interrupted')
     )
     c_parser.add_argument(
         '--workspace',
@@ -45,7 +163,9 @@ if __name__ == '__main__':
     c_parser.add_argument(
         '--db_path',
         required=True,
-        help='Folder where scanning result is saved'
+        help=('Folder where scanning result is saved. If path ends with '
+              '.sqlite, .sqlite3 or .db, result is saved in the SQLite '
+              'file')
     )
     c_parser.add_argument(
         '--module_search_path',
@@ -61,17 +181,60 @@ if __name__ == '__main__':
         '--path_file',
         default=None,
         help='Path to path-variable storage file')
+    c_parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of processes used in scanning mode: all')
+    c_parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='In scanning mode: all, parse only changed and new files')
+    c_parser.add_argument(
+        '--lazy',
+        action='store_true',
+        help=('In scanning mode: all, parse first only imports, variables '
+              'and keyword names and then keyword details in second pass'))
+    c_parser.add_argument(
+        '--libdoc_cache',
+        default=None,
+        help='Folder where parsed libraries are cached between scans')
+    c_parser.add_argument(
+        '--index_path',
+        default=None,
+        help=('In scanning mode: watch, folder or SQLite file where the '
+              'index of the changed tables is updated'))
+    c_parser.add_argument(
+        '--interval',
+        type=float,
+        default=1.0,
+        help=('In scanning mode: watch, seconds between the polls when '
+              'inotify is not available'))
     args = c_parser.parse_args()
     module_search_path = []
     if args.module_search_path:
         module_search_path = args.module_search_path
-    if args.mode == 'all':
+    if args.mode in ('all', 'watch'):
         if not args.workspace:
             raise ValueError('--workspace is needed with mode: {0}'.format(
                 args.mode))
         elif not args.extension:
             raise ValueError('--extension is needed with mode: {0}'.format(
                 args.mode))
+        elif args.mode == 'watch':
+            try:
+                watch(
+                    args.workspace,
+                    args.extension,
+                    args.db_path,
+                    module_search_path,
+                    args.path_to_lib_in_xml,
+                    args.path_file,
+                    args.index_path,
+                    args.libdoc_cache,
+                    args.interval)
+            except KeyboardInterrupt:
+                pass
         else:
             scan_all(
                 args.workspace,
@@ -79,7 +242,17 @@ if __name__ == '__main__':
                 args.db_path,
                 module_search_path,
                 args.path_to_lib_in_xml,
-                args.path_file)
+                args.path_file,
+                args.workers,
+                args.incremental,
+                args.libdoc_cache,
+                args.lazy)
+            if args.lazy:
+                complete_tables(
+                    args.db_path,
+                    args.path_to_lib_in_xml,
+                    args.path_file,
+                    args.libdoc_cache)
     elif args.mode == 'single':
         if not args.path_to_file:
             raise ValueError(
@@ -92,5 +265,6 @@ if __name__ == '__main__':
                 args.path_to_file,
                 args.db_path,
                 args.path_to_lib_in_xml,
-                args.path_file
+                args.path_file,
+                args.libdoc_cache
             )
@@ -0,0 +1,160 @@
+import argparse
+import inspect
+import json
+import logging
+import os
+import sys
+from os import path
+
+ROOT_DIR = path.dirname(path.abspath(__file__))
+SETTING_DIR = path.join(ROOT_DIR, '..', 'setting')
+sys.path.append(SETTING_DIR)
+
+import run_index
+import run_scanner
+from index.index import release_index_worker
+from parser_utils.util import forget_modules
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+JOB_ERROR = -32000
+
+
+def ping():
+    return 'pong'
+
+
+class Worker(object):
+    """Runs scan and index jobs in a long-lived process.
+
+    Jobs are read as JSON-RPC 2.0 requests, one request per line, from
+    the ``requests`` stream and the responses are written, one per line,
+    to the ``responses`` stream. Method names are the scanner and index
+    functions and the params are passed to them as keyword arguments.
+    The ``shutdown`` method stops the worker.
+
+    Robot Framework and the data parser are imported only once. The
+    DataParser, with the path variables and the libdoc cache, and the
+    import graph are kept between the jobs and created again only when
+    the paths variables file or the graph file has changed. Libraries
+    imported by a job from outside of the Python installation are
+    removed after the job, so that changed libraries are imported again
+    by the next job. The tables cached by the Index are released after
+    the job, because the scan jobs change them.
+    """
+    methods = {
+        'ping': ping,
+        'scan_all': run_scanner.scan_all,
+        'scan_single': run_scanner.scan_single,
+        'scan_files': run_scanner.scan_files,
+        'complete_tables': run_scanner.complete_tables,
+        'index_all': run_index.index_all,
+        'index_single': run_index.index_single,
+        'index_changed': run_index.index_changed
+    }
+
+    def __init__(self, requests, responses):
+        self.requests = requests
+        self.responses = responses
+        self.running = False
+
+    def serve(self):
+        self.running = True
+        while self.running:
+            line = self.requests.readline()
+            if not line:
+                break
+            if not line.strip():
+                continue
+            response = self.handle(line)
+            if response:
+                self.responses.write(json.dumps(response) + '\n')
+                self.responses.flush()
+
+    def handle(self, line):
+        """Returns response to the request in the ``line`` or None if
+        the request is a notification."""
+        try:
+            request = json.loads(line)
+        except ValueError as error:
+            return self.error(None, PARSE_ERROR, str(error))
+        if not isinstance(request, dict) or 'method' not in request:
+            return self.error(None, INVALID_REQUEST, 'Invalid request')
+        id_ = request.get('id')
+        method = request['method']
+        params = request.get('params') or {}
+        if method == 'shutdown':
+            self.running = False
+            result = None
+        elif method not in self.methods:
+            return self.error(
+                id_, METHOD_NOT_FOUND, 'Unknown method: {0}'.format(method))
+        elif not isinstance(params, dict):
+            return self.error(
+                id_, INVALID_PARAMS, 'Params must be an object')
+        else:
+            job = self.methods[method]
+            params = self.add_module_search_path(job, params)
+            try:
+                inspect.signature(job).bind(**params)
+            except TypeError as error:
+                return self.error(id_, INVALID_PARAMS, str(error))
+            try:
+                result = self.run_job(job, params)
+            except Exception as error:
+                logging.exception('Error in job: %s', method)
+                return self.error(id_, JOB_ERROR, str(error))
+        if 'id' not in request:
+            return None
+        return {'jsonrpc': '2.0', 'id': id_, 'result': result}
+
+    def add_module_search_path(self, job, params):
+        """Adds the module search path from the ``params`` to the
+        ``sys.path`` only once and returns params for the ``job``."""
+        params = dict(params)
+        for path_ in params.pop('module_search_path', None) or []:
+            if path_ not in sys.path:
+                sys.path.append(path_)
+        if 'module_search_path' in inspect.signature(job).parameters:
+            params['module_search_path'] = []
+        return params
+
+    def run_job(self, job, params):
+        modules = set(sys.modules)
+        try:
+            return job(**params)
+        finally:
+            release_index_worker()
+            self.forget_modules(modules)
+
+    def forget_modules(self, modules):
+        """Removes modules imported after the ``modules``.
+
+        Modules from the Python installation and from the plugin are
+        kept, because they do not change between the jobs.
+        """
+        forget_modules(
+            modules, (sys.prefix, sys.base_prefix, path.dirname(ROOT_DIR)))
+
+    def error(self, id_, code, message):
+        return {
+            'jsonrpc': '2.0',
+            'id': id_,
+            'error': {'code': code, 'message': message}
+        }
+
+
+if __name__ == '__main__':
+    c_parser = argparse.ArgumentParser(
+        description=('Runs scanning and indexing jobs received as JSON-RPC '
+                     'requests from stdin'))
+    c_parser.parse_args()
+    sys.stdout.flush()
+    responses = os.fdopen(os.dup(sys.stdout.fileno()), 'w')
+    # Anything printed by the jobs, or by the processes started by the
+    # jobs, goes to the log, not to the responses
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+    Worker(sys.stdin, responses).serve()
@@ -0,0 +1,116 @@
+import os
+import json
+import shutil
+from contextlib import contextmanager
+try:
+    from parser_utils.util import get_index_name, get_shared_index_dir
+    from db_json_settings import DBJsonSetting
+except ImportError:
+    from ..parser_utils.util import get_index_name, get_shared_index_dir
+    from ...setting.db_json_settings import DBJsonSetting
+
+
+class JsonStorage(object):
+    """Stores each database table and index as a json file.
+
+    Tables are saved to the ``db_path`` folder, indexes to the
+    ``index_path`` folder and the shared index sets to the folder
+    next to the ``index_path``.
+    """
+
+    def __init__(self, db_path, index_path=None):
+        self.db_path = db_path
+        self.index_path = index_path
+        self.shared_path = None
+        if index_path:
+            self.shared_path = get_shared_index_dir(index_path)
+
+    @contextmanager
+    def batch(self):
+        """Files are written one by one, batch does nothing."""
+        yield self
+
+    def close(self):
+        pass
+
+    def table_names(self):
+        if not os.path.isdir(self.db_path):
+            return []
+        return os.listdir(self.db_path)
+
+    def has_table(self, name):
+        return os.path.isfile(os.path.join(self.db_path, name))
+
+    def read_table(self, name):
+        return self._read(os.path.join(self.db_path, name))
+
+    def read_tables(self, table_type=None):
+        """Returns data of all tables or tables of the ``table_type``"""
+        for name in self.table_names():
+            data = self.read_table(name)
+            if not table_type or \
+                    data.get(DBJsonSetting.table_type) == table_type:
+                yield data
+
+    def write_table(self, name, data):
+        self._write(os.path.join(self.db_path, name), data)
+
+    def remove_table(self, name):
+        self._remove(os.path.join(self.db_path, name))
+
+    def clear_tables(self):
+        self._clear(self.db_path)
+
+    def has_index(self, table):
+        return os.path.isfile(self.index_file(table))
+
+    def read_index(self, table):
+        return self._read(self.index_file(table))
+
+    def write_index(self, table, data):
+        self._write(self.index_file(table), data)
+
+    def remove_index(self, table):
+        self._remove(self.index_file(table))
+        self._remove(os.path.join(self.shared_path, table))
+
+    def clear_index(self):
+        self._clear(self.index_path)
+        if os.path.exists(self.shared_path):
+            shutil.rmtree(self.shared_path)
+
+    def index_file(self, table):
+        return os.path.join(self.index_path, get_index_name(table))
+
+    def read_shared(self, table):
+        return self._read(os.path.join(self.shared_path, table))
+
+    def write_shared(self, table, data):
+        """Shared sets are written by many processes, therefore the
+        file is replaced atomically."""
+        shared_file = os.path.join(self.shared_path, table)
+        tmp_file = '{0}.{1}.tmp'.format(shared_file, os.getpid())
+        self._write(tmp_file, data)
+        os.replace(tmp_file, shared_file)
+
+    def _read(self, file_path):
+        with open(file_path) as f:
+            return json.load(f)
+
+    def _write(self, file_path, data):
+        try:
+            f = open(file_path, 'w')
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            f = open(file_path, 'w')
+        with f:
+            json.dump(data, f)
+
+    def _remove(self, file_path):
+        if os.path.isfile(file_path):
+            os.remove(file_path)
+
+    def _clear(self, folder):
+        if os.path.exists(folder):
+            shutil.rmtree(folder)
+        os.makedirs(folder)
@@ -0,0 +1,217 @@
+import os
+import json
+from contextlib import contextmanager
+try:
+    from db_json_settings import DBJsonSetting
+except ImportError:
+    from ...setting.db_json_settings import DBJsonSetting
+from .json_storage import JsonStorage
+
+# Segment is compacted when it is bigger than this and more than half
+# of it is taken by the replaced and removed tables.
+COMPACT_SIZE = 1024 * 1024
+
+
+class NdjsonStorage(JsonStorage):
+    """Stores the database tables to a single append-only NDJSON file.
+
+    Each table is written as one ``{"name": ..., "data": ...}`` line to
+    the end of the ``db_file`` segment and removed tables are marked
+    with a ``{"name": ..., "removed": true}`` line. The offset and
+    length of the latest line of each table is kept in the offsets file
+    next to the segment, so that a table can be read with a single seek.
+    If the offsets file is missing or does not match the segment, the
+    offsets are rebuilt with a sequential pass over the segment.
+
+    Index and shared index sets are stored as json files, like in the
+    JsonStorage.
+    """
+    version = 1
+
+    def __init__(self, db_file, index_path=None):
+        super(NdjsonStorage, self).__init__(db_file, index_path)
+        self.db_file = db_file
+        self.offsets_file = '{0}.offsets.json'.format(db_file)
+        self._offsets = None
+        self.reader = None
+        self.writer = None
+        self.in_batch = False
+
+    @property
+    def offsets(self):
+        if self._offsets is None:
+            self._offsets = self._load_offsets()
+        return self._offsets
+
+    @contextmanager
+    def batch(self):
+        """Offsets are saved and the segment is flushed when the batch
+        ends, instead of after every write."""
+        if self.in_batch:
+            yield self
+            return
+        self.in_batch = True
+        try:
+            yield self
+        finally:
+            self.in_batch = False
+            self._commit()
+            self._compact_if_needed()
+
+    def close(self):
+        for f in (self.reader, self.writer):
+            if f:
+                f.close()
+        self.reader = None
+        self.writer = None
+
+    def table_names(self):
+        return list(self.offsets)
+
+    def has_table(self, name):
+        return self._name(name) in self.offsets
+
+    def read_table(self, name):
+        name = self._name(name)
+        try:
+            return self._read_record(name)
+        except (KeyError, ValueError):
+            # Segment may have been changed by another process
+            self._reload()
+        if name not in self.offsets:
+            raise IOError('Table not found: {0}'.format(name))
+        return self._read_record(name)
+
+    def read_tables(self, table_type=None):
+        """Returns data of all tables or tables of the ``table_type``.
+
+        Tables are read in the order they are in the segment."""
+        records = sorted(self.offsets.items(), key=lambda item: item[1][0])
+        for name, _ in records:
+            data = self.read_table(name)
+            if not table_type or \
+                    data.get(DBJsonSetting.table_type) == table_type:
+                yield data
+
+    def write_table(self, name, data):
+        self._append({'name': self._name(name), 'data': data})
+
+    def remove_table(self, name):
+        name = self._name(name)
+        if name in self.offsets:
+            self._append({'name': name, 'removed': True})
+
+    def clear_tables(self):
+        self.close()
+        for file_path in (self.db_file, self.offsets_file):
+            self._remove(file_path)
+        self._offsets = {}
+
+    def _name(self, name):
+        """Tables are referred also with the path to the json file."""
+        return os.path.basename(name)
+
+    def _read_record(self, name):
+        offset, length = self.offsets[name]
+        if self.writer:
+            self.writer.flush()
+        if not self.reader:
+            self.reader = open(self.db_file, 'rb')
+        self.reader.seek(offset)
+        record = json.loads(self.reader.read(length).decode('utf-8'))
+        if record.get('name') != name or 'data' not in record:
+            raise ValueError('Invalid offset for table: {0}'.format(name))
+        return record['data']
+
+    def _append(self, record):
+        line = (json.dumps(record) + '\n').encode('utf-8')
+        if not self.writer:
+            folder = os.path.dirname(os.path.abspath(self.db_file))
+            os.makedirs(folder, exist_ok=True)
+            self.writer = open(self.db_file, 'ab')
+        offset = self.writer.tell()
+        self.writer.write(line)
+        if record.get('removed'):
+            self.offsets.pop(record['name'], None)
+        else:
+            self.offsets[record['name']] = [offset, len(line)]
+        if not self.in_batch:
+            self._commit()
+
+    def _commit(self):
+        if self.writer:
+            self.writer.flush()
+        if self._offsets is None:
+            return
+        data = {
+            'version': self.version,
+            'size': self._segment_size(),
+            'tables': self._offsets
+        }
+        tmp_file = '{0}.{1}.tmp'.format(self.offsets_file, os.getpid())
+        self._write(tmp_file, data)
+        os.replace(tmp_file, self.offsets_file)
+
+    def _reload(self):
+        self.close()
+        self._offsets = None
+
+    def _load_offsets(self):
+        try:
+            data = self._read(self.offsets_file)
+        except (IOError, ValueError):
+            data = {}
+        if data.get('version') == self.version and \
+                data.get('size') == self._segment_size():
+            return data['tables']
+        return self._rebuild_offsets()
+
+    def _rebuild_offsets(self):
+        """Reads the whole segment and returns offsets of the tables"""
+        offsets = {}
+        if not os.path.isfile(self.db_file):
+            return offsets
+        offset = 0
+        with open(self.db_file, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    # Line of an interrupted write is ignored
+                    offset += len(line)
+                    continue
+                if record.get('removed'):
+                    offsets.pop(record['name'], None)
+                else:
+                    offsets[record['name']] = [offset, len(line)]
+                offset += len(line)
+        return offsets
+
+    def _segment_size(self):
+        try:
+            return os.path.getsize(self.db_file)
+        except OSError:
+            return 0
+
+    def _compact_if_needed(self):
+        size = self._segment_size()
+        live = sum(length for _, length in self.offsets.values())
+        if size > COMPACT_SIZE and live * 2 < size:
+            self.compact()
+
+    def compact(self):
+        """Rewrites the segment without the replaced and removed tables"""
+        records = sorted(self.offsets.items(), key=lambda item: item[1][0])
+        tmp_file = '{0}.{1}.tmp'.format(self.db_file, os.getpid())
+        offsets = {}
+        if self.writer:
+            self.writer.flush()
+        with open(self.db_file, 'rb') as source, open(tmp_file, 'wb') as f:
+            for name, (offset, length) in records:
+                source.seek(offset)
+                offsets[name] = [f.tell(), length]
+                f.write(source.read(length))
+        self.close()
+        os.replace(tmp_file, self.db_file)
+        self._offsets = offsets
+        self._commit()
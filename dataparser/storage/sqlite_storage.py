@@ -0,0 +1,273 @@
+import json
+import sqlite3
+from os import path, makedirs
+from contextlib import contextmanager
+try:
+    from parser_utils.file_formatter import rf_table_name
+    from parser_utils.file_formatter import library_import_table
+    from parser_utils.util import normalize_keyword
+    from db_json_settings import DBJsonSetting
+except ImportError:
+    from ..parser_utils.file_formatter import rf_table_name
+    from ..parser_utils.file_formatter import library_import_table
+    from ..parser_utils.util import normalize_keyword
+    from ...setting.db_json_settings import DBJsonSetting
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS db_tables (
+    name TEXT PRIMARY KEY,
+    table_type TEXT,
+    file_path TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS db_tables_type ON db_tables (table_type);
+CREATE TABLE IF NOT EXISTS keywords (
+    table_name TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    normalized TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS keywords_table ON keywords (table_name);
+CREATE INDEX IF NOT EXISTS keywords_normalized ON keywords (normalized);
+CREATE TABLE IF NOT EXISTS variables (
+    table_name TEXT NOT NULL,
+    variable TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS variables_table ON variables (table_name);
+CREATE INDEX IF NOT EXISTS variables_variable ON variables (variable);
+CREATE TABLE IF NOT EXISTS imports (
+    table_name TEXT NOT NULL,
+    import_table TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS imports_table ON imports (table_name);
+CREATE INDEX IF NOT EXISTS imports_import ON imports (import_table);
+CREATE TABLE IF NOT EXISTS libraries (
+    table_name TEXT NOT NULL,
+    library_name TEXT NOT NULL,
+    library_alias TEXT,
+    library_table TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS libraries_table ON libraries (table_name);
+CREATE INDEX IF NOT EXISTS libraries_library ON libraries (library_table);
+CREATE TABLE IF NOT EXISTS index_tables (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shared_sets (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+TABLE_ROWS = ('keywords', 'variables', 'imports', 'libraries')
+MAX_PARAMETERS = 500
+
+
+class SqliteStorage(object):
+    """Stores the database tables and index to a single SQLite file.
+
+    Table and index data is saved as json in the ``db_tables``,
+    ``index_tables`` and ``shared_sets`` tables. The keywords,
+    variables, imports and libraries of each database table are
+    also saved to own tables, so that they can be searched with
+    indexed queries.
+
+    Writes done inside the ``batch`` are committed in one transaction,
+    other writes are committed immediately.
+
+    ``check_same_thread`` -- If False, the connection can be used from
+                             other threads than the one which created it.
+                             Caller must then ensure that only one thread
+                             uses the storage at the time.
+    """
+    timeout = 60
+
+    def __init__(self, db_file, check_same_thread=True):
+        self.db_file = db_file
+        folder = path.dirname(path.abspath(db_file))
+        if not path.exists(folder):
+            makedirs(folder, exist_ok=True)
+        self.connection = sqlite3.connect(
+            db_file, timeout=self.timeout,
+            check_same_thread=check_same_thread)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.executescript(SCHEMA)
+        self.in_batch = False
+
+    @contextmanager
+    def batch(self):
+        if self.in_batch:
+            yield self
+            return
+        self.in_batch = True
+        try:
+            with self.connection:
+                yield self
+        finally:
+            self.in_batch = False
+
+    def close(self):
+        self.connection.close()
+
+    def table_names(self):
+        return [row[0] for row in self._query('SELECT name FROM db_tables')]
+
+    def has_table(self, name):
+        return self._exists('db_tables', self._name(name))
+
+    def read_table(self, name):
+        return self._read('db_tables', self._name(name))
+
+    def read_tables(self, table_type=None):
+        """Returns data of all tables or tables of the ``table_type``"""
+        if table_type:
+            rows = self._query(
+                'SELECT data FROM db_tables WHERE table_type = ?',
+                (table_type,))
+        else:
+            rows = self._query('SELECT data FROM db_tables')
+        for row in rows:
+            yield json.loads(row[0])
+
+    def write_table(self, name, data):
+        name = self._name(name)
+        with self.batch():
+            self._delete_table(name)
+            self.connection.execute(
+                'INSERT INTO db_tables VALUES (?, ?, ?, ?)',
+                (
+                    name,
+                    data.get(DBJsonSetting.table_type),
+                    data.get(DBJsonSetting.file_path),
+                    json.dumps(data)
+                )
+            )
+            self._insert_rows(name, data)
+
+    def remove_table(self, name):
+        with self.batch():
+            self._delete_table(self._name(name))
+
+    def clear_tables(self):
+        with self.batch():
+            for table in ('db_tables',) + TABLE_ROWS:
+                self.connection.execute('DELETE FROM {0}'.format(table))
+
+    def find_keyword(self, keyword, tables=None):
+        """Returns names of the tables which contain the ``keyword``.
+
+        Keyword is compared without spaces, underscores and case. If
+        ``tables`` is given, only the tables in it are searched.
+        """
+        sql = 'SELECT DISTINCT table_name FROM keywords WHERE normalized = ?'
+        normalized = normalize_keyword(keyword)
+        if tables is None:
+            return [row[0] for row in self._query(sql, (normalized,))]
+        tables = [self._name(table) for table in tables]
+        result = []
+        # SQLite limits the number of the parameters in a query
+        for start in range(0, len(tables), MAX_PARAMETERS):
+            chunk = tables[start:start + MAX_PARAMETERS]
+            rows = self._query(
+                '{0} AND table_name IN ({1})'.format(
+                    sql, ', '.join('?' * len(chunk))),
+                [normalized] + chunk)
+            result.extend(row[0] for row in rows)
+        return result
+
+    def find_importers(self, table):
+        """Returns names of the tables which import the ``table``"""
+        rows = self._query(
+            'SELECT DISTINCT table_name FROM imports WHERE import_table = ?',
+            (table,))
+        return [row[0] for row in rows]
+
+    def has_index(self, table):
+        return self._exists('index_tables', self._name(table))
+
+    def read_index(self, table):
+        return self._read('index_tables', self._name(table))
+
+    def write_index(self, table, data):
+        self._write('index_tables', self._name(table), data)
+
+    def remove_index(self, table):
+        with self.batch():
+            for sql_table in ('index_tables', 'shared_sets'):
+                self.connection.execute(
+                    'DELETE FROM {0} WHERE name = ?'.format(sql_table),
+                    (self._name(table),))
+
+    def clear_index(self):
+        with self.batch():
+            self.connection.execute('DELETE FROM index_tables')
+            self.connection.execute('DELETE FROM shared_sets')
+
+    def read_shared(self, table):
+        return self._read('shared_sets', self._name(table))
+
+    def write_shared(self, table, data):
+        self._write('shared_sets', self._name(table), data)
+
+    def _name(self, name):
+        """Tables are referred also with the path to the json file."""
+        return path.basename(name)
+
+    def _query(self, sql, args=()):
+        return self.connection.execute(sql, args).fetchall()
+
+    def _exists(self, sql_table, name):
+        return bool(self._query(
+            'SELECT 1 FROM {0} WHERE name = ?'.format(sql_table), (name,)))
+
+    def _read(self, sql_table, name):
+        rows = self._query(
+            'SELECT data FROM {0} WHERE name = ?'.format(sql_table), (name,))
+        if not rows:
+            raise IOError('{0} not found from: {1}'.format(name, self.db_file))
+        return json.loads(rows[0][0])
+
+    def _write(self, sql_table, name, data):
+        with self.batch():
+            self.connection.execute(
+                'INSERT OR REPLACE INTO {0} VALUES (?, ?)'.format(sql_table),
+                (name, json.dumps(data)))
+
+    def _delete_table(self, name):
+        self.connection.execute(
+            'DELETE FROM db_tables WHERE name = ?', (name,))
+        for table in TABLE_ROWS:
+            self.connection.execute(
+                'DELETE FROM {0} WHERE table_name = ?'.format(table), (name,))
+
+    def _insert_rows(self, name, data):
+        keywords = data.get(DBJsonSetting.keywords) or {}
+        self.connection.executemany(
+            'INSERT INTO keywords VALUES (?, ?, ?)',
+            [
+                (name, kw[DBJsonSetting.keyword_name],
+                 normalize_keyword(kw[DBJsonSetting.keyword_name]))
+                for kw in keywords.values()
+            ]
+        )
+        self.connection.executemany(
+            'INSERT INTO variables VALUES (?, ?)',
+            [(name, var) for var in data.get(DBJsonSetting.variables) or []]
+        )
+        imports = []
+        for resource in data.get(DBJsonSetting.resources) or []:
+            imports.append((name, rf_table_name(resource)))
+        for var_file in data.get(DBJsonSetting.variable_files) or []:
+            imports.append((name, rf_table_name(list(var_file)[0])))
+        libraries = []
+        for lib in data.get(DBJsonSetting.libraries) or []:
+            library_table = library_import_table(lib)
+            libraries.append((
+                name,
+                lib[DBJsonSetting.library_name],
+                lib[DBJsonSetting.library_alias],
+                library_table
+            ))
+            imports.append((name, library_table))
+        self.connection.executemany(
+            'INSERT INTO imports VALUES (?, ?)', imports)
+        self.connection.executemany(
+            'INSERT INTO libraries VALUES (?, ?, ?, ?)', libraries)
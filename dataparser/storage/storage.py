@@ -0,0 +1,33 @@
+from os import path
+from .json_storage import JsonStorage
+
+SQLITE_EXTENSIONS = ('.sqlite', '.sqlite3', '.db')
+NDJSON_EXTENSIONS = ('.ndjson',)
+
+
+def is_sqlite_path(db_path):
+    return path.splitext(db_path)[1].lower() in SQLITE_EXTENSIONS
+
+
+def is_ndjson_path(db_path):
+    return path.splitext(db_path)[1].lower() in NDJSON_EXTENSIONS
+
+
+def get_storage(db_path, index_path=None, check_same_thread=True):
+    """Returns the storage for the database tables and index.
+
+    If ``db_path`` has a SQLite file extension, tables and index are
+    saved to the single SQLite file and ``index_path`` is not used.
+    If ``db_path`` has the NDJSON file extension, tables are appended to
+    the single NDJSON file and index is saved as json files to the
+    ``index_path`` folder. Otherwise tables are saved as json files to
+    the ``db_path`` folder and index to the ``index_path`` folder.
+    ``check_same_thread`` is passed to the SQLite connection.
+    """
+    if is_sqlite_path(db_path):
+        from .sqlite_storage import SqliteStorage
+        return SqliteStorage(db_path, check_same_thread)
+    if is_ndjson_path(db_path):
+        from .ndjson_storage import NdjsonStorage
+        return NdjsonStorage(db_path, index_path)
+    return JsonStorage(db_path, index_path)
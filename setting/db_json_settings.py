@@ -9,8 +9,11 @@ class DBJsonSetting(object):
     file_path = 'file_path'
     keyword = 'keyword'
     keyword_arguments = 'keyword_arguments'
+    keyword_column = 'keyword_column'
     keyword_name = 'keyword_name'
     keyword_file = 'keyword_file'
+    keyword_line = 'keyword_line'
+    keyword_lookup = 'keyword_lookup'
     keywords = 'keywords'
     libraries = 'libraries'
     library = 'library'
@@ -19,7 +22,10 @@ class DBJsonSetting(object):
     library_module = 'library_module'
     library_name = 'library_name'
     library_path = 'library_path'
+    library_table = 'library_table'
+    partial = 'partial'
     resources = 'resources'
+    shared_tables = 'shared_tables'
     tags = 'tags'
     table_type = 'table_type'
     variable = 'variable'
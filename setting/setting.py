@@ -12,6 +12,9 @@ class PathResolver(object):
     index_folder = 'index'
     scanner_folder = 'scanner'
     log_file_name = 'scan_index.log'
+    libdoc_cache_folder = 'libdoc_cache'
+    sqlite_file_name = 'database.sqlite'
+    ndjson_file_name = 'scanner.ndjson'
 
     @property
     def default_db_dir(self):
@@ -25,6 +28,18 @@ class PathResolver(object):
     def default_index_dir(self):
         return path.join(self.default_db_dir, self.index_folder)
 
+    @property
+    def default_libdoc_cache_dir(self):
+        return path.join(self.default_db_dir, self.libdoc_cache_folder)
+
+    @property
+    def default_sqlite_file(self):
+        return path.join(self.default_db_dir, self.sqlite_file_name)
+
+    @property
+    def default_ndjson_file(self):
+        return path.join(self.default_db_dir, self.ndjson_file_name)
+
     @property
     def default_log_file(self):
         return path.join(self.default_db_dir, self.log_file_name)
@@ -41,6 +56,10 @@ class PathResolver(object):
     def index_runner(self):
         return path.join(self.datapraser_folder, 'run_index.py')
 
+    @property
+    def worker_runner(self):
+        return path.join(self.datapraser_folder, 'run_worker.py')
+
     @property
     def log_file(self):
         return path.join(self.default_db_dir, self.log_file_name)
@@ -53,7 +72,9 @@ class SettingObject(object):
     index_dir = 'index_dir'
     scanner_runner = 'scanner_runner'
     index_runner = 'index_runner'
+    worker_runner = 'worker_runner'
     log_file = 'log_file'
+    libdoc_cache = 'libdoc_cache'
     python_binary = 'path_to_python'
     workspace = 'robot_framework_workspace'
     extension = 'robot_framework_extension'
@@ -67,6 +88,11 @@ class SettingObject(object):
     automatic_table_creation = 'robot_framework_automatic_database_table'
     automatic_index_creation = 'robot_framework_automatic_indexing'
     automatic_database_update = 'robot_framework_automatic_database_update'
+    incremental_scan = 'robot_framework_incremental_scan'
+    lazy_scan = 'robot_framework_lazy_scan'
+    index_workers = 'robot_framework_index_workers'
+    database_backend = 'robot_framework_database_backend'
+    completion_limit = 'robot_framework_completion_limit'
     kw_prefixes = 'robot_framework_keyword_prefixes'
     path_file = 'paths_variables_file'
     PY3 = None
@@ -78,7 +104,56 @@ class SettingObject(object):
         return SettingObject.__instance
 
 
+def sqlite_available():
+    """Returns False if the Python of the Sublime Text does not have
+    the sqlite3 module, like in the Linux build of Sublime Text 3."""
+    try:
+        import sqlite3
+    except ImportError:
+        return False
+    return True
+
+
+def get_sqlite_file():
+    """Returns path to the SQLite database or None if the database
+    tables and index are stored as json files.
+
+    If the sqlite3 module is not available, json files are used.
+    """
+    backend = get_sublime_setting(SettingObject.database_backend)
+    if not backend or backend.lower() != 'sqlite':
+        return None
+    if not sqlite_available():
+        sublime.status_message(
+            'SQLite is not available, using json database backend')
+        return None
+    project_setting = parse_project(SettingObject.db_dir)
+    if not project_setting:
+        return PathResolver().default_sqlite_file
+    else:
+        return path.join(project_setting, PathResolver().sqlite_file_name)
+
+
+def get_ndjson_file():
+    """Returns path to the NDJSON file of the database tables or None
+    if the database tables are not stored to a NDJSON file."""
+    backend = get_sublime_setting(SettingObject.database_backend)
+    if not backend or backend.lower() != 'ndjson':
+        return None
+    project_setting = parse_project(SettingObject.db_dir)
+    if not project_setting:
+        return PathResolver().default_ndjson_file
+    else:
+        return path.join(project_setting, PathResolver().ndjson_file_name)
+
+
 def get_scanner_dir():
+    sqlite_file = get_sqlite_file()
+    if sqlite_file:
+        return sqlite_file
+    ndjson_file = get_ndjson_file()
+    if ndjson_file:
+        return ndjson_file
     project_setting = parse_project(SettingObject.db_dir)
     if not project_setting:
         return PathResolver().default_scanner_dir
@@ -87,6 +162,9 @@ def get_scanner_dir():
 
 
 def get_index_dir():
+    sqlite_file = get_sqlite_file()
+    if sqlite_file:
+        return sqlite_file
     project_setting = parse_project(SettingObject.db_dir)
     if not project_setting:
         return PathResolver().default_index_dir
@@ -138,8 +216,12 @@ def get_setting(setting):
         return PathResolver().scanner_runner
     elif setting.lower() == SettingObject.index_runner:
         return PathResolver().index_runner
+    elif setting.lower() == SettingObject.worker_runner:
+        return PathResolver().worker_runner
     elif setting.lower() == SettingObject.log_file:
         return get_log_file()
+    elif setting.lower() == SettingObject.libdoc_cache:
+        return PathResolver().default_libdoc_cache_dir
     elif setting.lower() == SettingObject.python_binary:
         return get_python_binary()
     elif setting.lower() == SettingObject.path_file:
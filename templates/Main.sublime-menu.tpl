@@ -37,6 +37,10 @@
                                 "command": "scan_and_index_open_tab",
                                 "caption": "Update Internal Database For Active Tab"
                             },
+                            {
+                                "command": "cancel_jobs",
+                                "caption": "Cancel Background Jobs"
+                            },
                             { "caption": "-" },
                             {
                                 "command": "setting_importer",
@@ -0,0 +1,38 @@
+"""Micro benchmark for the ParsingQueue.
+
+Adds, gets and sets N items to the queue and prints the time used per
+item. The time per item should stay the same when N grows.
+
+Usage: python queue_benchmark.py [N ...]
+"""
+import env
+import sys
+from timeit import default_timer
+
+sys.path.insert(0, env.SETTING_DIR)
+
+from data_queue.queue import ParsingQueue  # noqa: E402
+
+
+def run(size):
+    queue = ParsingQueue()
+    items = ['/path/to/resource{0}.robot'.format(i) for i in range(size)]
+    start = default_timer()
+    for item in items:
+        queue.add(item, 'resource', None)
+    for item in items:
+        queue.add(item, 'resource', None)
+    while True:
+        item = queue.get()
+        if not item or item[1]['scanned']:
+            break
+        queue.set(item[0])
+    return default_timer() - start
+
+
+if __name__ == '__main__':
+    sizes = [int(size) for size in sys.argv[1:]] or [1000, 10000, 100000]
+    for size in sizes:
+        elapsed = run(size)
+        print('{0:>8} items: {1:.3f} s, {2:.2f} us/item'.format(
+            size, elapsed, elapsed / size * 1000000))
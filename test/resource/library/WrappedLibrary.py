@@ -0,0 +1,9 @@
+from keyword_decorator import logged
+
+
+class WrappedLibrary():
+
+    @logged
+    def wrapped_keyword(self, arg):
+        """Keyword decorated with functools.wraps"""
+        return arg
@@ -0,0 +1,9 @@
+from functools import wraps
+
+
+def logged(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        print('Running: {0}'.format(func.__name__))
+        return func(*args, **kwargs)
+    return wrapper
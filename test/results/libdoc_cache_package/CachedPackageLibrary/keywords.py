@@ -0,0 +1,6 @@
+def keyword_1():
+    pass
+
+
+def keyword_2():
+    pass
@@ -0,0 +1 @@
+from .keywords import *
@@ -0,0 +1,10 @@
+def keyword_1():
+    pass
+
+
+def keyword_2():
+    pass
+
+
+def keyword_3():
+    pass
@@ -0,0 +1 @@
+VAR = 1
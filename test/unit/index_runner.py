@@ -1,7 +1,7 @@
-import shutil
 import multiprocessing
-from os import path, listdir, makedirs
+from os import listdir
 from index.index import index_a_table
+from storage.storage import get_storage
 
 
 def index_all(db_path, index_path):
@@ -9,8 +9,6 @@ def index_all(db_path, index_path):
     params = []
     for table in tables:
         params.append((db_path, table, index_path, None))
-    if path.exists(index_path):
-        shutil.rmtree(index_path)
-    makedirs(index_path)
+    get_storage(db_path, index_path).clear_index()
     pool = multiprocessing.Pool()
     pool.map(index_a_table, params)
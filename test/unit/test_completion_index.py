@@ -0,0 +1,145 @@
+import unittest
+import env
+import re
+import json
+from os import path
+from completions import get_kw_re_string
+from utils.completion_index import NameIndex, KeywordCompletionIndex
+from utils.completion_index import match_score, table_locality
+
+
+def linear_search(keywords, pattern, object_name):
+    """Keyword matching as done before the completion index"""
+    matches = []
+    match_objects = []
+    for keyword in keywords:
+        kw, lib, lib_alias = keyword[0], keyword[2], keyword[4]
+        if not object_name:
+            if pattern.search(kw):
+                matches.append((keyword, lib))
+        elif lib == object_name and lib != kw:
+            if pattern.search(kw):
+                matches.append((keyword, lib))
+        elif lib_alias == object_name and lib_alias != kw:
+            if pattern.search(kw):
+                matches.append((keyword, lib_alias))
+        if not object_name and lib_alias and pattern.search(lib_alias):
+            if lib_alias not in match_objects:
+                match_objects.append(lib_alias)
+                matches.append((None, lib_alias))
+        elif not object_name and pattern.search(lib):
+            if lib not in match_objects:
+                match_objects.append(lib)
+                matches.append((None, lib))
+    return matches
+
+
+class OldStr(str):
+    """String without the methods added in Python 3.7"""
+
+    def __getattribute__(self, name):
+        if name == 'isascii':
+            raise AttributeError(name)
+        return str.__getattribute__(self, name)
+
+    def lower(self):
+        return OldStr(str.lower(self))
+
+    def __iter__(self):
+        return (OldStr(char) for char in str.__iter__(self))
+
+
+class TestCompletionIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        index = path.join(
+            env.RESOURCES_DIR,
+            'index-test_a.robot-c6b0faa0427a2cf861a1acad630765ea.json'
+        )
+        with open(index) as f:
+            cls.keywords = json.load(f)['keywords']
+        cls.keywords.append(
+            ['Kw From Alias', [], 'LibName', 'table', 'AliasName'])
+        cls.keywords.append(
+            ['Other Kw', [], 'LibName', 'table', 'OtherAlias'])
+
+    def test_name_index(self):
+        index = NameIndex(['Log', 'Log Many', 'Sleep', 'Öbject'])
+        pattern = re.compile(get_kw_re_string('lg'))
+        self.assertEqual(index.search(pattern, 'lg'), [0, 1])
+        pattern = re.compile(get_kw_re_string('ö'))
+        self.assertEqual(index.search(pattern, 'ö'), [3])
+        pattern = re.compile(get_kw_re_string('xyz'))
+        self.assertEqual(index.search(pattern, 'xyz'), [])
+        self.assertEqual(index.candidates('l\\w'), index.all)
+
+    def test_name_index_without_isascii(self):
+        # str.isascii is not available in the Python of Sublime Text 3
+        names = [OldStr(name) for name in ('Log', 'Öbject', 'Sleep')]
+        index = NameIndex(names)
+        self.assertEqual(index.non_ascii, 2)
+        self.assertEqual(index.candidates('ö'), index.all)
+        self.assertEqual(index.candidates('lo'), 3)
+        pattern = re.compile(get_kw_re_string('öb'))
+        self.assertEqual(index.search(pattern, 'öb'), [1])
+
+    def test_same_matches_as_linear_search(self):
+        index = KeywordCompletionIndex(self.keywords)
+        prefixes = [
+            '', 'r', 'Runk', 'uilt', 'l', 'LOG', 'kw', 'alias', 'e.',
+            'x', 'zz', 'Sel', 'os', 'a b'
+        ]
+        objects = [None, '', 'BuiltIn', 'AliasName', 'LibName', 'Nothing']
+        for prefix in prefixes:
+            pattern = re.compile(get_kw_re_string(prefix))
+            for object_name in objects:
+                self.assertEqual(
+                    index.search(pattern, prefix, object_name),
+                    linear_search(self.keywords, pattern, object_name),
+                    (prefix, object_name)
+                )
+
+    def test_match_score(self):
+        self.assertGreater(
+            match_score('Log Many', 'log'), match_score('Catenate Log', 'log'))
+        self.assertGreater(
+            match_score('Run Keyword', 'rk'), match_score('Run Token', 'rk'))
+        self.assertGreater(
+            match_score('Set Variable', 'sv'),
+            match_score('Should Be Empty Or Var', 'sv'))
+
+    def test_table_locality(self):
+        self.assertEqual(table_locality('a.robot-1.json', 'a.robot-1.json'), 0)
+        self.assertEqual(table_locality('b.robot-2.json', 'a.robot-1.json'), 1)
+        self.assertEqual(table_locality('BuiltIn-3.json', 'a.robot-1.json'), 2)
+
+    def test_rank(self):
+        keywords = [
+            ['Log Keyword', [], 'BuiltIn', 'BuiltIn-1.json', None],
+            ['Log Keyword', [], 'resource', 'resource.robot-2.json', None],
+            ['Log Keyword', [], 'test', 'test.robot-3.json', None],
+            ['Catenate Log', [], 'BuiltIn', 'BuiltIn-1.json', None],
+            ['Log Many', [], 'BuiltIn', 'BuiltIn-1.json', None],
+        ]
+        index = KeywordCompletionIndex(keywords, 'test.robot-3.json')
+        pattern = re.compile(get_kw_re_string('log'))
+        result = index.rank(pattern, 'log')
+        self.assertEqual(
+            [(kw[0], source) for kw, source in result],
+            [
+                ('Log Keyword', 'test'),
+                ('Log Keyword', 'resource'),
+                ('Log Keyword', 'BuiltIn'),
+                ('Log Many', 'BuiltIn'),
+                ('Catenate Log', 'BuiltIn')
+            ]
+        )
+        result = index.rank(pattern, 'log', limit=2, usage={'Log Many': 10})
+        self.assertEqual(
+            [(kw[0], source) for kw, source in result],
+            [('Log Many', 'BuiltIn'), ('Log Keyword', 'test')]
+        )
+        pattern = re.compile(get_kw_re_string('bui'))
+        result = index.rank(pattern, 'bui', limit=1)
+        self.assertEqual(result, [(None, 'BuiltIn')])
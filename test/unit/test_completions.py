@@ -11,6 +11,8 @@ from completions import get_completion_list
 from completions import get_var_mode
 from completions import check_prefix
 from completions import add_with_name
+from completions import get_inserted_items
+from completions import get_inserted_keyword
 
 RF_CELL = '    '
 RF_EXTENSION = 'robot'
@@ -333,6 +335,27 @@ class TestCompletions(unittest.TestCase):
         result = add_with_name('wi', None, RF_CELL)
         self.assertEqual(result, None)
 
+    def test_get_inserted_keyword(self):
+        completions = [
+            create_kw_completion_item(
+                'Log', ['msg'], RF_CELL, 'BuiltIn', True),
+            create_kw_completion_item(
+                'Log Many', [], RF_CELL, 'BuiltIn', True),
+            create_kw_completion_item(
+                'Kw ${arg}', [], RF_CELL, 'common', False),
+            create_kw_completion_item('BuiltIn', '.', '', 'BuiltIn', True)
+        ]
+        items = get_inserted_items(completions)
+        self.assertNotIn('BuiltIn.', items)
+        line = 'Log Many    Log    msg'
+        self.assertEqual(get_inserted_keyword(items, line), 'Log')
+        self.assertEqual(
+            get_inserted_keyword(items, line[:-len('    Log    msg')]),
+            'Log Many')
+        self.assertEqual(
+            get_inserted_keyword(items, '    Kw ${arg}'), 'Kw ${arg}')
+        self.assertIsNone(get_inserted_keyword(items, 'Log Many    x'))
+
     @property
     def vars_in_test_a(self):
         return [
@@ -100,6 +100,11 @@ class GetDocumentation(unittest.TestCase):
         self.assertEqual(kw_details.table_name, self.builtin_table_name)
         self.assertEqual(kw_details.kw, cell)
         self.assertEqual(kw_details.kw_object_name, object_name)
+        self.assertEqual(kw_details.kw_key, 'no_operation')
+        kw_details = self.get_doc.get_table_name_from_index(
+            object_name, 'no_OPERATION')
+        self.assertEqual(kw_details.kw, cell)
+        self.assertEqual(kw_details.kw_key, 'no_operation')
         cell = 'Test A Keyword'
         object_name = None
         kw_details = self.get_doc.get_table_name_from_index(
@@ -2,9 +2,12 @@ import unittest
 import env
 import shutil
 import platform
+import inspect
 from os import path, mkdir
-from index_runner import index_all
-from data_queue.scanner import Scanner
+from robot.libraries.BuiltIn import BuiltIn
+from index_runner import index_all
+from data_queue.scanner import Scanner
+from data_parser.data_parser import DataParser
 from get_keyword import GetKeyword
 
 
@@ -48,11 +51,25 @@ class TestGetKeywordFromLibrary(unittest.TestCase):
             rf_extension=self.rf_ext
         )
 
+    def test_return_file_and_location(self):
+        regex, file_path, location = self.get_kw.return_file_and_location(
+            'BuiltIn', 'No Operation')
+        self.assertEqual(file_path, inspect.getsourcefile(BuiltIn))
+        line = inspect.getsourcelines(BuiltIn.no_operation)[1]
+        self.assertEqual(location, (line, 4))
+
+    def test_wrapped_keyword_location(self):
+        library = path.join(env.RESOURCES_DIR, 'library', 'WrappedLibrary.py')
+        data = DataParser().parse_library(library)
+        kw = data['keywords']['wrapped_keyword']
+        self.assertEqual(kw['keyword_file'], library)
+        self.assertEqual((kw['keyword_line'], kw['keyword_column']), (6, 4))
+
     def test_get_lib_kw(self):
         regex, file_path = self.get_kw.get_lib_keyword(
             self.s2l_table_file,
             None,
-            'Simulate Event'
+            'Simulate Event'
         )
         self.assertIsNotNone(regex)
         self.assertIsNotNone(file_path)
@@ -61,7 +78,7 @@ class TestGetKeywordFromLibrary(unittest.TestCase):
         kw_file = self.get_kw.get_lib_keyword_file(
             self.s2l_table_file,
             None,
-            'Simulate Event'
+            'Simulate Event'
         )
         self.assertIn(self.s2l_simulate, kw_file)
         kw_file = self.get_kw.get_lib_keyword_file(
@@ -78,7 +95,7 @@ class TestGetKeywordFromLibrary(unittest.TestCase):
         self.assertIn(self.s2l_press_key, kw_file)
         kw_file = self.get_kw.get_lib_keyword_file(
             self.s2l_table_file,
-            'SeleniumLibrary',
+            'SeleniumLibrary',
             'PressKey'
         )
         self.assertIn(self.s2l_press_key, kw_file)
@@ -165,25 +182,25 @@ class TestGetKeywordFromLibrary(unittest.TestCase):
 
     @property
     def s2l(self):
-        return 'SeleniumLibrary'
+        return 'SeleniumLibrary'
 
     @property
     def s2l_simulate(self):
-        return path.join(self.s2l, 'keywords', 'element.py')
+        return path.join(self.s2l, 'keywords', 'element.py')
 
     @property
     def s2l_press_key(self):
-        return path.join(self.s2l, 'keywords', 'element.py')
+        return path.join(self.s2l, 'keywords', 'element.py')
 
     @property
     def s2l_textarea_value_should_be(self):
-        return path.join(self.s2l, 'keywords', 'formelement.py')
+        return path.join(self.s2l, 'keywords', 'formelement.py')
 
     @property
     def s2l_table_file(self):
         return path.join(
             self.db_dir,
-            'SeleniumLibrary-ed5a6b78e6f238da896f2d5aad33b8b8.json'
+            'SeleniumLibrary-ed5a6b78e6f238da896f2d5aad33b8b8.json'
         )
 
     @property
@@ -197,7 +214,7 @@ class TestGetKeywordFromLibrary(unittest.TestCase):
     @property
     def long_name_file(self):
         return path.join(
-            path.normpath(self.suite_dir), 'LibraryWithReallyTooLongName.py'
+            path.normpath(self.suite_dir), 'LibraryWithReallyTooLongName.py'
         )
 
     @property
@@ -207,7 +224,7 @@ class TestGetKeywordFromLibrary(unittest.TestCase):
     @property
     def get_resource_lib_longer_than_100_chars(self):
         return path.join(
-            path.normpath(self.suite_dir),
+            path.normpath(self.suite_dir),
             (
                 'LibraryNameWhichIsLongerThan100CharactersButItSeemsThatIt'
                 'RequiresQuiteAlotLettersInTheFileNameAndIsNotGoodReal'
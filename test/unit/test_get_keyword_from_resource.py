@@ -76,6 +76,16 @@ class TestGetKeywordFromResource(unittest.TestCase):
         self.assertEqual(regex, self.get_common_keyword_2_regex)
         self.assertEqual(file_path, expected_path)
 
+    def test_return_file_and_location(self):
+        regex, file_path, location = self._get_kw.return_file_and_location(
+            'common', 'common_keyword_2')
+        self.assertEqual(regex, self.get_common_keyword_2_regex)
+        self.assertEqual(file_path, path.normpath(self.get_common_robot_path))
+        self.assertEqual(location, (11, 0))
+        regex, file_path, location = self._get_kw.return_file_and_location(
+            None, 'Not Here')
+        self.assertEqual((regex, file_path, location), (None, None, None))
+
     def test_with_test_a_robot(self):
         get_kw = GetKeyword(
             table_dir=self.db_dir,
@@ -0,0 +1,67 @@
+import unittest
+import env
+import os
+from index.import_graph import ImportGraph
+
+
+class TestImportGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.graph_path = os.path.join(env.RESULTS_DIR, 'imports.json')
+        if os.path.exists(self.graph_path):
+            os.remove(self.graph_path)
+        self.graph = ImportGraph(self.graph_path)
+        self.graph.update(
+            {
+                'test_a': ['resource_a', 'BuiltIn'],
+                'test_b': ['resource_b', 'BuiltIn'],
+                'resource_a': ['common', 'BuiltIn'],
+                'resource_b': ['common', 'BuiltIn'],
+                'common': ['BuiltIn']
+            },
+            ['BuiltIn']
+        )
+
+    def test_dependents(self):
+        self.assertEqual(
+            self.graph.dependents(['resource_a']),
+            {'resource_a', 'test_a'})
+        self.assertEqual(
+            self.graph.dependents(['common']),
+            {'common', 'resource_a', 'resource_b', 'test_a', 'test_b'})
+        self.assertEqual(
+            self.graph.dependents(['not_imported']), {'not_imported'})
+        self.assertIsNone(self.graph.dependents(['common', 'BuiltIn']))
+
+    def test_update_replaces_imports(self):
+        self.graph.update({'resource_a': ['BuiltIn']})
+        self.assertEqual(
+            self.graph.dependents(['common']),
+            {'common', 'resource_b', 'test_b'})
+        self.assertEqual(
+            self.graph.dependents(['resource_a']),
+            {'resource_a', 'test_a'})
+
+    def test_remove(self):
+        self.graph.remove('resource_b')
+        self.assertNotIn('resource_b', self.graph.imports)
+        self.assertNotIn('resource_b', self.graph.imported_by)
+        self.assertEqual(self.graph.imports['test_b'], {'BuiltIn'})
+        self.assertEqual(
+            self.graph.dependents(['common']),
+            {'common', 'resource_a', 'test_a'})
+
+    def test_save_and_load(self):
+        self.graph.save()
+        graph = ImportGraph(self.graph_path)
+        self.assertTrue(graph.load())
+        self.assertEqual(graph.imports, self.graph.imports)
+        self.assertEqual(graph.imported_by, self.graph.imported_by)
+        self.assertEqual(graph.global_tables, {'BuiltIn'})
+        self.assertFalse(ImportGraph(self.graph_path + '.nope').load())
+
+    def test_fan_out(self):
+        self.assertEqual(self.graph.fan_out('test_a'), 3)
+        self.assertEqual(self.graph.fan_out('resource_b'), 2)
+        self.assertEqual(self.graph.fan_out('BuiltIn'), 0)
+        self.assertEqual(self.graph.fan_out('not_imported'), 0)
@@ -0,0 +1,55 @@
+import unittest
+import env
+import os
+import json
+import shutil
+from utils.index_cache import IndexCache
+
+
+class TestIndexCache(unittest.TestCase):
+
+    def setUp(self):
+        self.index_dir = os.path.join(env.RESULTS_DIR, 'index_cache')
+        if os.path.exists(self.index_dir):
+            shutil.rmtree(self.index_dir)
+        os.makedirs(self.index_dir)
+        self.loaded = []
+        self.cache = IndexCache(self.loader, max_size=2)
+
+    def loader(self, index_file):
+        self.loaded.append(index_file)
+        with open(index_file) as f:
+            return json.load(f)
+
+    def write_index(self, name, data):
+        index_file = os.path.join(self.index_dir, name)
+        with open(index_file, 'w') as f:
+            json.dump(data, f)
+        return index_file
+
+    def test_index_is_read_once(self):
+        index_file = self.write_index('index-a', {'keywords': [1]})
+        self.assertEqual(self.cache.get(index_file), {'keywords': [1]})
+        self.assertEqual(self.cache.get(index_file), {'keywords': [1]})
+        self.assertEqual(self.loaded, [index_file])
+
+    def test_changed_index_is_read_again(self):
+        index_file = self.write_index('index-a', {'keywords': [1]})
+        self.cache.get(index_file)
+        self.write_index('index-a', {'keywords': [1, 2]})
+        self.assertEqual(self.cache.get(index_file), {'keywords': [1, 2]})
+        self.assertEqual(self.loaded, [index_file, index_file])
+
+    def test_least_recently_used_is_evicted(self):
+        index_a = self.write_index('index-a', {})
+        index_b = self.write_index('index-b', {})
+        index_c = self.write_index('index-c', {})
+        self.cache.get(index_a)
+        self.cache.get(index_b)
+        self.cache.get(index_a)
+        self.cache.get(index_c)
+        self.assertEqual(list(self.cache.entries), [index_a, index_c])
+        self.cache.invalidate(index_a)
+        self.assertEqual(list(self.cache.entries), [index_c])
+        self.cache.invalidate()
+        self.assertEqual(list(self.cache.entries), [])
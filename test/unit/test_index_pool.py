@@ -0,0 +1,78 @@
+import unittest
+import env
+import os
+import shutil
+from data_queue.scanner import Scanner
+from index import index
+from index.import_graph import ImportGraph
+from index.index_pool import IndexPool
+from storage.storage import get_storage
+
+
+class TestIndexPool(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.db_dir = os.path.join(env.RESULTS_DIR, 'db_dir_pool')
+        cls.index_dir = os.path.join(env.RESULTS_DIR, 'index_dir_pool')
+        scanner = Scanner()
+        scanner.scan(
+            os.path.join(env.TEST_DATA_DIR, 'suite_tree'),
+            'robot',
+            cls.db_dir)
+        storage = get_storage(cls.db_dir, cls.index_dir)
+        cls.tables = storage.table_names()
+        storage.close()
+
+    def setUp(self):
+        if os.path.exists(self.index_dir):
+            shutil.rmtree(self.index_dir)
+        os.makedirs(self.index_dir)
+
+    def test_order_tables(self):
+        graph = ImportGraph(os.path.join(self.index_dir, 'imports.json'))
+        graph.update({'a': ['c'], 'b': ['c', 'd'], 'd': ['e']})
+        pool = IndexPool(self.db_dir, self.index_dir, workers=2)
+        self.assertEqual(
+            pool.order_tables(['e', 'd', 'c', 'b', 'a'], graph),
+            ['b', 'a', 'd', 'c', 'e'])
+        self.assertEqual(
+            pool.order_tables(['b', 'c', 'a']), ['a', 'b', 'c'])
+
+    def test_get_chunks(self):
+        pool = IndexPool(self.db_dir, self.index_dir, workers=1)
+        pool.chunks_per_worker = 2
+        chunks = pool.get_chunks(['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual(
+            [[params[1] for params in chunk] for chunk in chunks],
+            [['a', 'c', 'e'], ['b', 'd']])
+        self.assertEqual(
+            chunks[0][0], (self.db_dir, 'a', self.index_dir, None))
+        self.assertEqual(pool.get_chunks([]), [])
+
+    def test_index_in_workers(self):
+        with IndexPool(self.db_dir, self.index_dir, workers=2) as pool:
+            results = pool.index(self.tables)
+            self.assertIsNotNone(pool.pool)
+        self.assertIsNone(pool.pool)
+        self.assertEqual(len(results), len(self.tables))
+        self.assertEqual(
+            sorted(table for table, _ in pool.stats), sorted(self.tables))
+        storage = get_storage(self.db_dir, self.index_dir)
+        for table in self.tables:
+            self.assertTrue(storage.has_index(table), table)
+        storage.close()
+
+    def test_index_in_process(self):
+        with IndexPool(self.db_dir, self.index_dir, workers=1) as pool:
+            results = pool.index(self.tables[:2])
+            self.assertIsNone(pool.pool)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(len(pool.stats), 2)
+        self.assertEqual(pool.index([]), [])
+
+    def test_index_in_process_releases_index_on_error(self):
+        pool = IndexPool(self.db_dir, self.index_dir, workers=1)
+        with self.assertRaises(TypeError):
+            pool.index([None])
+        self.assertIsNone(index._WORKER_INDEX)
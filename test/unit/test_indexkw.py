@@ -5,9 +5,10 @@ import shutil
 import json
 from time import sleep
 from collections import namedtuple
-from data_queue.scanner import Scanner
-from data_queue.scanner import rf_table_name, lib_table_name
-from index.index import Index
+from data_queue.scanner import Scanner
+from data_queue.scanner import rf_table_name, lib_table_name
+from index.index import Index, TableEntry
+from utils.util import get_index_data
 
 
 class TestIndexing(unittest.TestCase):
@@ -56,8 +57,8 @@ class TestIndexing(unittest.TestCase):
         self.index.queue.add(t_name, None, None)
         data, status = self.index.read_table(
             os.path.join(env.RESOURCES_DIR, t_name))
-        var, kw_index = self.index.parse_table_data(data, t_name)
-        self.assertTrue('${/}' in var)
+        var = self.index.parse_table_data(data, t_name).variables
+        self.assertTrue('${/}' in var)
         self.assertTrue('${OUTPUT_FILE}' in var)
         self.assertTrue('@{TEST_TAGS}' in var)
 
@@ -116,6 +117,24 @@ class TestIndexing(unittest.TestCase):
         data = self.get_s2l()
         self.assertEqual(self.index.get_imports(data), [])
 
+    def test_get_library_imports(self):
+        data = self.get_resource_b()
+        import_list = [self.process_table_name, self.lib_longer_100_characters]
+        for lib in data['libraries']:
+            self.assertIn(lib['library_table'], import_list)
+        self.assertEqual(self.index.get_library_imports(data), import_list)
+        for lib in data['libraries']:
+            del lib['library_table']
+        self.assertEqual(self.index.get_library_imports(data), import_list)
+        # Library which could not be parsed does not have a table
+        data['libraries'].append({
+            'library_name': 'ProcessNotParsed',
+            'library_alias': None,
+            'library_arguments': [],
+            'library_path': None
+        })
+        self.assertEqual(self.index.get_library_imports(data), import_list)
+
     def test_get_variables(self):
         data = self.get_resource_b()
         var = ['${RESOURCE_B}']
@@ -169,10 +188,10 @@ class TestIndexing(unittest.TestCase):
         kw_list.extend(self.get_LibNoClass_kw_index(KeywordRecord)[0])
         kw_list.extend(self.get_LongName_kw_index(KeywordRecord)[0])
         var_list = [
-            '${TEST_A}',
-            '${RESOURCE_A}',
-            '${COMMON_VARIABLE_1}',
-            '${COMMON_VARIABLE_2}'
+            '${TEST_A}',
+            '${RESOURCE_A}',
+            '${COMMON_VARIABLE_1}',
+            '${COMMON_VARIABLE_2}'
         ]
         t_index = {
             'keywords': kw_list,
@@ -201,10 +220,10 @@ class TestIndexing(unittest.TestCase):
         kw_list.extend(self.get_LongName_kw_index(KeywordRecord)[0])
         kw_list.extend(self.get_OtherNameLib_kw_index(KeywordRecord)[0])
         var_list = [
-            '${TEST_B}',
-            '${RESOURCE_B}',
-            '${COMMON_VARIABLE_1}',
-            '${COMMON_VARIABLE_2}'
+            '${TEST_B}',
+            '${RESOURCE_B}',
+            '${COMMON_VARIABLE_1}',
+            '${COMMON_VARIABLE_2}'
         ]
         t_index = {
             'keywords': kw_list,
@@ -233,24 +252,120 @@ class TestIndexing(unittest.TestCase):
             any(kw[0] == 'Resource A Keyword 1' for kw in data['keywords'])
         )
 
+    def test_closure_with_import_cycle(self):
+        imports = {
+            'test': ['res_a', 'lib'],
+            'res_a': ['res_b'],
+            'res_b': ['res_a', 'common'],
+            'common': ['lib'],
+            'lib': []
+        }
+        for table, import_list in imports.items():
+            self.index.table_entries[table] = TableEntry(
+                [], [], [], None, import_list, [])
+        closure = self.index.get_closure(self.db_dir, 'test')
+        self.assertEqual(closure[0], 'test')
+        self.assertEqual(
+            sorted(closure), ['common', 'lib', 'res_a', 'res_b', 'test'])
+        self.assertEqual(
+            set(self.index.closures['res_a']),
+            {'res_a', 'res_b', 'common', 'lib'})
+        self.assertIs(
+            self.index.closures['res_a'], self.index.closures['res_b'])
+        self.assertEqual(self.index.closures['common'], ('common', 'lib'))
+
+    def test_tables_are_read_once(self):
+        self.index.create_index_for_table(self.db_dir, self.test_a_table_name)
+        entry = self.index.table_entries[self.common_table_name]
+        self.index.create_index_for_table(self.db_dir, self.test_b_table_name)
+        self.assertIs(self.index.table_entries[self.common_table_name], entry)
+
+    def test_table_keywords_are_cached(self):
+        self.index.create_index_for_table(self.db_dir, self.test_a_table_name)
+        entry = self.index.table_entries[self.common_table_name]
+        keywords = self.index.get_entry_keywords(
+            entry, self.common_table_name)
+        self.assertTrue(keywords)
+        self.assertIs(
+            self.index.get_entry_keywords(entry, self.common_table_name),
+            keywords)
+
+    def test_shared_index(self):
+        self.index.index_consturctor(self.test_b_table_name)
+        index_file = os.path.join(
+            self.index_dir, 'index-{0}'.format(self.test_b_table_name))
+        with open(index_file) as f:
+            data = json.load(f)
+        self.assertIn(self.common_table_name, data['shared_tables'])
+        self.assertNotIn(self.test_b_table_name, data['shared_tables'])
+        self.assertTrue(
+            all(kw[3] == self.test_b_table_name for kw in data['keywords']))
+        shared_files = os.listdir(self.index.storage.shared_path)
+        self.assertTrue(set(data['shared_tables']).issubset(shared_files))
+        expected = self.index.create_index_for_table(
+            self.db_dir, self.test_b_table_name)
+        resolved = get_index_data(index_file)
+        self.assertEqual(
+            sorted(resolved['variables']), sorted(expected['variables']))
+        self.assertEqual(
+            sorted(map(tuple, resolved['keywords']), key=str),
+            sorted(
+                [tuple(kw[:1]) + (list(kw[1]),) + tuple(kw[2:])
+                 for kw in expected['keywords']],
+                key=str))
+        lookup = resolved['keyword_lookup']
+        expected_lookup = expected['keyword_lookup']
+        self.assertEqual(sorted(lookup), sorted(expected_lookup))
+        for object_, names in expected_lookup.items():
+            self.assertEqual(sorted(lookup[object_]), sorted(names))
+            for name, position in names.items():
+                kw = resolved['keywords'][lookup[object_][name]]
+                expected_kw = expected['keywords'][position]
+                self.assertEqual(
+                    (kw[0], kw[2], kw[3]),
+                    (expected_kw[0], expected_kw[2], expected_kw[3]))
+
+    def test_shared_index_with_import_cycle(self):
+        db_dir = os.path.join(env.RESULTS_DIR, 'db_dir_cycle')
+        Scanner().scan(
+            os.path.join(env.TEST_DATA_DIR, 'import_cycle'), 'robot', db_dir)
+        index = Index(db_dir, self.index_dir)
+        tables = {
+            name: rf_table_name(os.path.normpath(os.path.join(
+                env.TEST_DATA_DIR, 'import_cycle', name)))
+            for name in ('a.robot', 'b.robot')
+        }
+        for table in tables.values():
+            index.index_consturctor(table)
+        for name, other in (('a.robot', 'b.robot'), ('b.robot', 'a.robot')):
+            index_file = os.path.join(
+                self.index_dir, 'index-{0}'.format(tables[name]))
+            with open(index_file) as f:
+                data = json.load(f)
+            self.assertNotIn(tables[name], data['shared_tables'])
+            self.assertIn(tables[other], data['shared_tables'])
+            keywords = [kw[0] for kw in get_index_data(index_file)['keywords']]
+            self.assertEqual(keywords.count('Cycle A Keyword'), 1)
+            self.assertEqual(keywords.count('Cycle B Keyword'), 1)
+
     def test_get_kw_arguments(self):
-        kw_args = ['item', 'msg=None']
+        kw_args = ['item', 'msg=None']
         result = self.index.get_kw_arguments(kw_args)
-        expected = ['item', 'msg']
+        expected = ['item', 'msg']
         self.assertEqual(result, expected)
-        kw_args = ['name', '*args']
+        kw_args = ['name', '*args']
         result = self.index.get_kw_arguments(kw_args)
         self.assertEqual(result, kw_args)
         kw_args = []
         result = self.index.get_kw_arguments(kw_args)
         self.assertEqual(result, kw_args)
-        kw_args = ['object=None', '*args', '**kwargs']
+        kw_args = ['object=None', '*args', '**kwargs']
         result = self.index.get_kw_arguments(kw_args)
-        expected = ['object', '*args', '**kwargs']
+        expected = ['object', '*args', '**kwargs']
         self.assertEqual(result, expected)
-        kw_args = ['${kwa1}', '@{list}', '&{kwargs}']
+        kw_args = ['${kwa1}', '@{list}', '&{kwargs}']
         result = self.index.get_kw_arguments(kw_args)
-        expected = ['kwa1', '*list', '**kwargs']
+        expected = ['kwa1', '*list', '**kwargs']
         self.assertEqual(result, expected)
         kw_args = ['${arg1}=${True}', '${arg2}=Text_here', '${arg3}=${False}']
         result = self.index.get_kw_arguments(kw_args)
@@ -300,7 +415,7 @@ class TestIndexing(unittest.TestCase):
         object_name = self.index.get_object_name(self.get_os())
         self.assertEqual(object_name, 'OperatingSystem')
         object_name = self.index.get_object_name(self.get_s2l())
-        self.assertEqual(object_name, 'SeleniumLibrary')
+        self.assertEqual(object_name, 'SeleniumLibrary')
 
     def test_library_with_alias(self):
         data = self.index.create_index_for_table(self.db_dir,
@@ -328,7 +443,7 @@ class TestIndexing(unittest.TestCase):
     @property
     def real_suite_table_name(self):
         return rf_table_name(
-            os.path.normpath(
+            os.path.normpath(
                 os.path.join(
                     self.real_suite_dir,
                     'test',
@@ -340,36 +455,36 @@ class TestIndexing(unittest.TestCase):
     @property
     def resource_b_table_name(self):
         return rf_table_name(
-            os.path.normpath(os.path.join(self.suite_dir, 'resource_b.robot'))
+            os.path.normpath(os.path.join(self.suite_dir, 'resource_b.robot'))
         )
 
     @property
     def common_table_name(self):
         return rf_table_name(
-            os.path.normpath(os.path.join(self.suite_dir, 'common.robot'))
+            os.path.normpath(os.path.join(self.suite_dir, 'common.robot'))
         )
 
     @property
     def test_a_table_name(self):
         return rf_table_name(
-            os.path.normpath(os.path.join(self.suite_dir, 'test_a.robot'))
+            os.path.normpath(os.path.join(self.suite_dir, 'test_a.robot'))
         )
 
     @property
     def test_b_table_name(self):
         return rf_table_name(
-            os.path.normpath(os.path.join(self.suite_dir, 'test_b.robot'))
+            os.path.normpath(os.path.join(self.suite_dir, 'test_b.robot'))
         )
 
     @property
     def resource_a_table_name(self):
-        return rf_table_name(os.path.normpath(
+        return rf_table_name(os.path.normpath(
             os.path.join(self.suite_dir, 'resource_a.robot'))
         )
 
     @property
     def s2l_table_name(self):
-        return lib_table_name('SeleniumLibrary')
+        return lib_table_name('SeleniumLibrary')
 
     @property
     def os_table_name(self):
@@ -493,7 +608,7 @@ class TestIndexing(unittest.TestCase):
         s2l_data = self.get_s2l()
         kw_list = self.index.get_keywords(s2l_data)[0]
         arg_list = self.get_kw_args(s2l_data)
-        object_name = 'SeleniumLibrary'
+        object_name = 'SeleniumLibrary'
         table_name = self.s2l_table_name
         l = []
         for kw, arg in zip(kw_list, arg_list):
@@ -627,10 +742,10 @@ class TestIndexing(unittest.TestCase):
         return l, kw_list, arg_list, object_name, table_name
 
     def get_test_a_kw_index(self, keywordrecord):
-        kw_list = ['Test A Keyword', 'Keyword']
+        kw_list = ['Test A Keyword', 'Keyword']
         arg_list = [None, None]
         table_name = self.test_a_table_name
-        object_name = 'test_a.robot'
+        object_name = 'test_a.robot'
         l = []
         for kw, arg in zip(kw_list, arg_list):
             l.append(
@@ -647,15 +762,15 @@ class TestIndexing(unittest.TestCase):
     def get_test_b_kw_index(self, keywordrecord):
         kw_list = []
         table_name = self.test_b_table_name
-        object_name = 'test_a.robot'
+        object_name = 'test_a.robot'
         l = []
         return l, kw_list, [None], object_name, table_name
 
     def get_resource_a_kw_index(self, keywordrecord):
-        kw_list = ['Resource A Keyword 1', 'resource A Keyword 2']
+        kw_list = ['Resource A Keyword 1', 'resource A Keyword 2']
         arg_list = ['kwa1', None]
         table_name = self.resource_a_table_name
-        object_name = 'resource_a.robot'
+        object_name = 'resource_a.robot'
         l = []
         for kw, arg in zip(kw_list, arg_list):
             l.append(
@@ -671,13 +786,13 @@ class TestIndexing(unittest.TestCase):
 
     def get_resource_b_kw_index(self, keywordrecord):
         kw_list = [
-            'Resource B Keyword 1',
-            'resource B Keyword 2',
-            'Embedding ${arg} To Keyword Name',
-            'Resource B Keyword 3 Many Args']
+            'Resource B Keyword 1',
+            'resource B Keyword 2',
+            'Embedding ${arg} To Keyword Name',
+            'Resource B Keyword 3 Many Args']
         arg_list = ['kwb1', None, 'arg', ['arg1', 'arg2', 'arg3']]
         table_name = self.resource_b_table_name
-        object_name = 'resource_b.robot'
+        object_name = 'resource_b.robot'
         l = []
         for kw, arg in zip(kw_list, arg_list):
             l.append(
@@ -693,12 +808,12 @@ class TestIndexing(unittest.TestCase):
 
     def get_common_kw_index(self, keywordrecord):
         kw_list = [
-            'Common Keyword 2',
-            'common Keyword 1',
-            'Really Long Keyword To Test With Jumping To Keyword Does Not Scroll The Visible Area To A Wrong Place Should There Be More Words'
+            'Common Keyword 2',
+            'common Keyword 1',
+            'Really Long Keyword To Test With Jumping To Keyword Does Not Scroll The Visible Area To A Wrong Place Should There Be More Words'
         ]
         table_name = self.common_table_name
-        object_name = 'common.robot'
+        object_name = 'common.robot'
         l = []
         for kw in kw_list:
             l.append(
@@ -715,7 +830,7 @@ class TestIndexing(unittest.TestCase):
     def get_kw_args(self, data):
         arg_list = []
         kws = data["keywords"]
-        for i in kws:
+        for i in kws:
             args = kws[i]['keyword_arguments']
             for arg in args:
                 if '=' in arg:
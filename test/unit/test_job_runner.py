@@ -0,0 +1,69 @@
+import unittest
+import env
+import threading
+from job_runner import JobRunner
+
+
+class TestJobRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.done = []
+        self.runner = JobRunner(on_done=self.done.append)
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def blocking_job(self):
+        self.started.set()
+        self.assertTrue(self.release.wait(10))
+        return 'blocked'
+
+    def test_jobs_run_in_order(self):
+        result = []
+        self.runner.submit('block', 'Block', self.blocking_job)
+        first = self.runner.submit('a', 'A', result.append, ('a',))
+        second = self.runner.submit('b', 'B', result.append, ('b',))
+        self.release.set()
+        self.assertTrue(second.wait(10))
+        self.assertTrue(first.done.is_set())
+        self.assertEqual(result, ['a', 'b'])
+        self.assertEqual(
+            [job.name for job in self.done], ['Block', 'A', 'B'])
+
+    def test_duplicate_jobs_are_coalesced(self):
+        result = []
+        self.runner.submit('block', 'Block', self.blocking_job)
+        self.assertTrue(self.started.wait(10))
+        first = self.runner.submit('a', 'A', result.append, ('a',))
+        second = self.runner.submit('a', 'A', result.append, ('a',))
+        self.assertIs(first, second)
+        self.assertEqual(self.runner.status()[1], 1)
+        self.release.set()
+        self.assertTrue(first.wait(10))
+        self.assertEqual(result, ['a'])
+
+    def test_result_and_error(self):
+        job = self.runner.submit('sum', 'Sum', sum, ([1, 2],))
+        self.assertTrue(job.wait(10))
+        self.assertEqual(job.result, 3)
+        self.assertIsNone(job.error)
+        job = self.runner.submit('int', 'Int', int, ('not number',))
+        self.assertTrue(job.wait(10))
+        self.assertIsInstance(job.error, ValueError)
+        self.assertIsNone(job.result)
+
+    def test_cancel(self):
+        result = []
+        running = self.runner.submit(
+            'block', 'Block', self.blocking_job, cancel=self.release.set)
+        self.assertTrue(self.started.wait(10))
+        pending = self.runner.submit('a', 'A', result.append, ('a',))
+        self.runner.cancel()
+        self.assertTrue(running.wait(10))
+        self.assertTrue(pending.done.is_set())
+        self.assertTrue(running.cancelled)
+        self.assertTrue(pending.cancelled)
+        self.assertEqual(result, [])
+        self.assertEqual(self.runner.status(), (None, 0))
+        job = self.runner.submit('a', 'A', result.append, ('a',))
+        self.assertTrue(job.wait(10))
+        self.assertEqual(result, ['a'])
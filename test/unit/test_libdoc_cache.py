@@ -0,0 +1,75 @@
+import unittest
+import env
+import os
+import sys
+import shutil
+from time import sleep
+from data_parser.data_parser import DataParser
+from data_parser.libdoc_cache import LibdocCache
+
+
+class TestLibdocCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = os.path.join(env.RESULTS_DIR, 'libdoc_cache')
+        if os.path.exists(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
+        self.library = os.path.join(
+            env.TEST_DATA_DIR, 'suite_tree', 'LibNoClass.py')
+
+    def test_library_is_parsed_once(self):
+        parser = DataParser(libdoc_cache=self.cache_dir)
+        data = parser.parse_library(self.library)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        parser = DataParser(libdoc_cache=self.cache_dir)
+        parser.libdoc = None
+        self.assertEqual(parser.parse_library(self.library), data)
+        with self.assertRaises(AttributeError):
+            parser.parse_library(self.library, ['arg'])
+
+    def test_key(self):
+        cache = LibdocCache(self.cache_dir)
+        key = cache.key('Collections', None)
+        self.assertEqual(key, cache.key('Collections', []))
+        self.assertNotEqual(key, cache.key('Collections', ['1']))
+        self.assertNotEqual(key, cache.key('String', None))
+        self.assertIsNone(cache.key('NotExistingLibrary', None))
+
+    def test_key_of_package_library(self):
+        root = os.path.join(env.RESULTS_DIR, 'libdoc_cache_package')
+        package = os.path.join(root, 'CachedPackageLibrary')
+        if os.path.exists(root):
+            shutil.rmtree(root)
+        os.makedirs(package)
+        with open(os.path.join(package, '__init__.py'), 'w') as f:
+            f.write('from .keywords import *\n')
+        keywords = os.path.join(package, 'keywords.py')
+        with open(keywords, 'w') as f:
+            f.write('def keyword_1():\n    pass\n')
+        sys.path.insert(0, root)
+        try:
+            cache = LibdocCache(self.cache_dir)
+            key = cache.key('CachedPackageLibrary', None)
+            self.assertIsNotNone(key)
+            with open(keywords, 'a') as f:
+                f.write('\n\ndef keyword_2():\n    pass\n')
+            self.assertNotEqual(cache.key('CachedPackageLibrary', None), key)
+        finally:
+            sys.path.remove(root)
+
+    def test_least_recently_used_is_evicted(self):
+        cache = LibdocCache(self.cache_dir, max_size=250)
+        data = {'keywords': 'x' * 100}
+        cache.put('Collections', None, data)
+        sleep(0.01)
+        cache.put('String', None, data)
+        sleep(0.01)
+        self.assertEqual(cache.get('Collections', None), data)
+        sleep(0.01)
+        cache.put('OperatingSystem', None, data)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 3)
+        cache = LibdocCache(self.cache_dir, max_size=250)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+        self.assertIsNone(cache.get('String', None))
+        self.assertEqual(cache.get('Collections', None), data)
+        self.assertEqual(cache.get('OperatingSystem', None), data)
@@ -136,6 +136,20 @@ class TestLibraryParsingQueue(unittest.TestCase):
                 self.assertEqual(self.queue.queue[key], status)
                 self.assertEqual(index, 5)
 
+    def test_queue_is_updated_in_place(self):
+        queue = self.queue.queue
+        for index in range(1000):
+            self.queue.add('resource{0}.robot'.format(index), 'resource', None)
+        self.assertIs(self.queue.queue, queue)
+        self.assertEqual(list(queue)[0], 'resource999.robot')
+        data = self.queue.get()
+        self.assertEqual(data[0], 'resource999.robot')
+        self.assertFalse(data[1]['scanned'])
+        self.queue.set(data[0])
+        self.assertIs(self.queue.queue, queue)
+        self.assertEqual(list(queue)[-1], 'resource999.robot')
+        self.assertEqual(len(queue), 1000)
+
     def add_builtin(self):
         tmp = OrderedDict({})
         tmp['BuiltIn'] = self.join_dict(
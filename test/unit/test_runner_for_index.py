@@ -6,6 +6,10 @@ import re
 from time import sleep
 from data_queue.scanner import Scanner
 from test_runner_for_scanner import run_process
+from index.import_graph import ImportGraph
+from parser_utils.file_formatter import rf_table_name
+from parser_utils.util import get_import_graph_path, get_index_name
+from parser_utils.util import normalise_path
 
 
 class TestRunner(unittest.TestCase):
@@ -93,6 +97,52 @@ class TestRunner(unittest.TestCase):
         self.assertFalse(lines)
         self.assertEqual(len(os.listdir(self.index_path)), 2)
 
+    def test_index_changed(self):
+        p_args = [
+            'python',
+            self.runner,
+            'all',
+            '--db_path',
+            self.db_dir,
+            '--index_path',
+            self.index_path
+        ]
+        run_process(p_args)
+        graph = ImportGraph(get_import_graph_path(self.index_path))
+        self.assertTrue(graph.load())
+        resource_b = rf_table_name(normalise_path(
+            os.path.join(self.workspace, 'resource_b.robot')))
+        expected = graph.dependents([resource_b])
+        self.assertTrue(len(expected) > 1)
+        before = self.index_mtimes()
+        sleep(0.1)
+        p_args = [
+            'python',
+            self.runner,
+            'changed',
+            '--db_path',
+            self.db_dir,
+            '--index_path',
+            self.index_path,
+            '--tables',
+            resource_b
+        ]
+        run_process(p_args)
+        after = self.index_mtimes()
+        self.assertEqual(len(before), len(after))
+        updated = set(
+            f_name for f_name in after if after[f_name] != before[f_name])
+        self.assertEqual(
+            updated,
+            set(get_index_name(table) for table in expected))
+
+    def index_mtimes(self):
+        mtimes = {}
+        for f_name in os.listdir(self.index_path):
+            mtimes[f_name] = os.path.getmtime(
+                os.path.join(self.index_path, f_name))
+        return mtimes
+
     def clean_info_messages(self, log_file):
         f = open(log_file)
         # Strip way S2L info messages
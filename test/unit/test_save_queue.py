@@ -0,0 +1,68 @@
+import unittest
+import env
+from save_queue import SaveQueue
+
+
+class TestSaveQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.scanned = []
+        self.indexed = []
+        self.queue = SaveQueue(self.scan, self.index)
+
+    def scan(self, files):
+        self.scanned.append(files)
+        return [f + '.json' for f in files]
+
+    def index(self, tables):
+        self.indexed.append(tables)
+
+    def test_saves_are_batched(self):
+        self.queue.add('b.robot')
+        self.queue.add('a.robot')
+        self.queue.add('b.robot')
+        self.queue.update()
+        self.assertEqual(self.scanned, [['a.robot', 'b.robot']])
+        self.assertEqual(self.indexed, [['a.robot.json', 'b.robot.json']])
+        self.queue.update()
+        self.assertEqual(len(self.scanned), 1)
+        self.assertEqual(len(self.indexed), 1)
+
+    def test_index_is_skipped_when_save_during_scan(self):
+        def scan(files):
+            if not self.scanned:
+                self.queue.add('b.robot')
+            return self.scan(files)
+        self.queue.scan = scan
+        self.queue.add('a.robot')
+        self.queue.update()
+        self.assertEqual(self.scanned, [['a.robot']])
+        self.assertEqual(self.indexed, [])
+        self.queue.update()
+        self.assertEqual(self.scanned, [['a.robot'], ['b.robot']])
+        self.assertEqual(self.indexed, [['a.robot.json', 'b.robot.json']])
+
+    def test_failed_scan_is_retried(self):
+        def scan(files):
+            raise ValueError('Worker stopped')
+        self.queue.scan = scan
+        self.queue.add('a.robot')
+        with self.assertRaises(ValueError):
+            self.queue.update()
+        self.queue.scan = self.scan
+        self.queue.add('b.robot')
+        self.queue.update()
+        self.assertEqual(self.scanned, [['a.robot', 'b.robot']])
+        self.assertEqual(self.indexed, [['a.robot.json', 'b.robot.json']])
+
+    def test_failed_index_is_retried(self):
+        def index(tables):
+            raise ValueError('Worker stopped')
+        self.queue.index = index
+        self.queue.add('a.robot')
+        with self.assertRaises(ValueError):
+            self.queue.update()
+        self.queue.index = self.index
+        self.queue.update()
+        self.assertEqual(self.scanned, [['a.robot']])
+        self.assertEqual(self.indexed, [['a.robot.json']])
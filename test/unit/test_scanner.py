@@ -1,11 +1,13 @@
 import unittest
 import env
 import os
+import sys
 import shutil
 import hashlib
 from time import sleep
 import json
 from data_queue.scanner import Scanner
+from parser_utils.file_formatter import rf_table_name
 
 
 class TestScanner(unittest.TestCase):
@@ -266,6 +268,181 @@ class TestScanner(unittest.TestCase):
         self.assertTrue(operatingsystem in files)
         self.assertEqual(len(files), 14)
 
+    def test_parallel_scan_creates_same_tables(self):
+        workspace = os.path.join(
+            env.TEST_DATA_DIR,
+            'suite_tree')
+        self.scanner.scan(workspace, 'robot', self.db_dir)
+        serial = self.read_db(self.db_dir)
+        parallel_db_dir = os.path.join(
+            env.RESULTS_DIR,
+            'scanner',
+            'parallel_db_dir'
+        )
+        Scanner().scan(workspace, 'robot', parallel_db_dir, workers=3)
+        parallel = self.read_db(parallel_db_dir)
+        self.assertEqual(sorted(serial), sorted(parallel))
+        for table in serial:
+            self.assertEqual(serial[table], parallel[table])
+
+    def test_incremental_scan(self):
+        workspace = os.path.join(env.RESULTS_DIR, 'scanner', 'workspace')
+        if os.path.exists(workspace):
+            shutil.rmtree(workspace)
+        shutil.copytree(
+            os.path.join(env.TEST_DATA_DIR, 'suite_tree'), workspace)
+        self.scanner.scan(workspace, 'robot', self.db_dir)
+        tables = self.read_db(self.db_dir)
+        mtimes = self.table_mtimes(self.db_dir)
+        resource_a = os.path.join(workspace, 'resource_a.robot')
+        with open(resource_a, 'a') as f:
+            f.write('\nNew Keyword\n    Log    New\n')
+        os.remove(os.path.join(workspace, 'test_b.robot'))
+        changed = Scanner().scan(
+            workspace, 'robot', self.db_dir, incremental=True)
+        new_tables = self.read_db(self.db_dir)
+        new_mtimes = self.table_mtimes(self.db_dir)
+        resource_a_table = self.f_name(
+            {'file_path': os.path.normpath(resource_a)}, '')
+        test_b_table = self.f_name(
+            {'file_path': os.path.join(workspace, 'test_b.robot')}, '')
+        self.assertIn(test_b_table, tables)
+        self.assertNotIn(test_b_table, new_tables)
+        self.assertIn(test_b_table, changed)
+        self.assertIn(resource_a_table, changed)
+        self.assertNotIn(self.f_name(
+            {'file_path': os.path.join(workspace, 'test_a.robot')}, ''),
+            changed)
+        self.assertIn('new_keyword', new_tables[resource_a_table]['keywords'])
+        for table in new_tables:
+            if table == resource_a_table:
+                continue
+            self.assertEqual(tables[table], new_tables[table])
+            self.assertEqual(mtimes[table], new_mtimes[table])
+
+    def test_incremental_scan_after_scan_files(self):
+        workspace = os.path.join(env.RESULTS_DIR, 'scanner', 'workspace')
+        if os.path.exists(workspace):
+            shutil.rmtree(workspace)
+        shutil.copytree(
+            os.path.join(env.TEST_DATA_DIR, 'suite_tree'), workspace)
+        self.scanner.scan(workspace, 'robot', self.db_dir)
+        resource_a = os.path.join(workspace, 'resource_a.robot')
+        with open(resource_a, 'a') as f:
+            f.write('\nNew Keyword\n    Log    New\n')
+        tables = Scanner().scan_files([resource_a], self.db_dir)
+        self.assertEqual(tables, [rf_table_name(resource_a)])
+        changed = Scanner().scan(
+            workspace, 'robot', self.db_dir, incremental=True)
+        self.assertEqual(changed, set())
+
+    def test_incremental_scan_with_package_library(self):
+        workspace = os.path.join(env.RESULTS_DIR, 'scanner', 'package')
+        if os.path.exists(workspace):
+            shutil.rmtree(workspace)
+        package = os.path.join(workspace, 'ScannedPackageLibrary')
+        os.makedirs(package)
+        with open(os.path.join(package, '__init__.py'), 'w') as f:
+            f.write('from .keywords import *\n')
+        keywords = os.path.join(package, 'keywords.py')
+        with open(keywords, 'w') as f:
+            f.write('def keyword_1():\n    pass\n')
+        with open(os.path.join(workspace, 'test.robot'), 'w') as f:
+            f.write('*** Settings ***\nLibrary    ScannedPackageLibrary\n')
+        sys.path.insert(0, workspace)
+        try:
+            Scanner().scan(workspace, 'robot', self.db_dir)
+            changed = Scanner().scan(
+                workspace, 'robot', self.db_dir, incremental=True)
+            self.assertEqual(changed, set())
+            with open(keywords, 'a') as f:
+                f.write('\n\ndef keyword_2():\n    pass\n')
+            for name in ('ScannedPackageLibrary',
+                         'ScannedPackageLibrary.keywords'):
+                sys.modules.pop(name, None)
+            changed = Scanner().scan(
+                workspace, 'robot', self.db_dir, incremental=True)
+            self.assertEqual(len(changed), 1)
+            table = self.read_db(self.db_dir)[changed.pop()]
+            self.assertIn('keyword_2', table['keywords'])
+            with open(keywords, 'a') as f:
+                f.write('\n\ndef keyword_3():\n    pass\n')
+            changed = Scanner().scan_changed(
+                [keywords], workspace, 'robot', self.db_dir)
+            self.assertEqual(len(changed), 1)
+        finally:
+            sys.path.remove(workspace)
+
+    def test_scan_changed(self):
+        workspace = os.path.join(env.RESULTS_DIR, 'scanner', 'workspace')
+        if os.path.exists(workspace):
+            shutil.rmtree(workspace)
+        shutil.copytree(
+            os.path.join(env.TEST_DATA_DIR, 'suite_tree'), workspace)
+        self.scanner.scan(workspace, 'robot', self.db_dir)
+        mtimes = self.table_mtimes(self.db_dir)
+        resource_a = os.path.join(workspace, 'resource_a.robot')
+        with open(resource_a, 'a') as f:
+            f.write('\nNew Keyword\n    Log    New\n')
+        test_b = os.path.join(workspace, 'test_b.robot')
+        os.remove(test_b)
+        test_c = os.path.join(workspace, 'test_c.robot')
+        with open(test_c, 'w') as f:
+            f.write('*** Test Cases ***\nTest C\n    Log    C\n')
+        not_used = os.path.join(workspace, 'not_used.py')
+        with open(not_used, 'w') as f:
+            f.write('VAR = 1\n')
+        changed = Scanner().scan_changed(
+            [resource_a, test_b, test_c, not_used], workspace, 'robot',
+            self.db_dir)
+        self.assertEqual(
+            changed,
+            set(rf_table_name(f) for f in (resource_a, test_b, test_c)))
+        tables = self.read_db(self.db_dir)
+        self.assertIn(
+            'new_keyword', tables[rf_table_name(resource_a)]['keywords'])
+        self.assertNotIn(rf_table_name(test_b), tables)
+        for table, mtime in self.table_mtimes(self.db_dir).items():
+            if table not in changed:
+                self.assertEqual(mtimes[table], mtime)
+        library = os.path.join(workspace, 'LibNoClass.py')
+        with open(library, 'a') as f:
+            f.write('\n\ndef library_keyword_3():\n    pass\n')
+        # Watch imports the libraries again after a change
+        sys.modules.pop('LibNoClass', None)
+        changed = Scanner().scan_changed(
+            [library], workspace, 'robot', self.db_dir)
+        self.assertEqual(len(changed), 1)
+        table = self.read_db(self.db_dir)[changed.pop()]
+        self.assertIn('library_keyword_3', table['keywords'])
+
+    def test_lazy_scan(self):
+        workspace = os.path.join(env.TEST_DATA_DIR, 'suite_tree')
+        full_db_dir = os.path.join(env.RESULTS_DIR, 'scanner', 'full_db_dir')
+        if os.path.exists(full_db_dir):
+            shutil.rmtree(full_db_dir)
+        Scanner().scan(workspace, 'robot', full_db_dir)
+        self.scanner.scan(workspace, 'robot', self.db_dir, lazy=True)
+        tables = self.read_db(self.db_dir)
+        full_tables = self.read_db(full_db_dir)
+        self.assertEqual(sorted(tables), sorted(full_tables))
+        resource_a = rf_table_name(
+            os.path.normpath(os.path.join(workspace, 'resource_a.robot')))
+        self.assertTrue(tables[resource_a]['partial'])
+        self.assertEqual(
+            sorted(tables[resource_a]['keywords']),
+            sorted(full_tables[resource_a]['keywords']))
+        self.assertEqual(
+            tables[resource_a]['libraries'],
+            full_tables[resource_a]['libraries'])
+        self.assertEqual(
+            tables[resource_a]['variables'],
+            full_tables[resource_a]['variables'])
+        completed = Scanner().complete_tables(self.db_dir)
+        self.assertIn(resource_a, completed)
+        self.assertEqual(self.read_db(self.db_dir), full_tables)
+        self.assertEqual(Scanner().complete_tables(self.db_dir), [])
+
     def test_single_file_scan(self):
         self.assertEqual(len(os.listdir(self.db_dir)), 0)
         self.scanner.scan_single_file(self.real_suite_robot_path, self.db_dir)
@@ -278,6 +455,15 @@ class TestScanner(unittest.TestCase):
         )
         self.assertEqual(len(os.listdir(self.db_dir)), 2)
 
+    def test_scan_files(self):
+        tables = self.scanner.scan_files(
+            [self.real_suite_robot_path, self.real_suite_resource_robot_path],
+            self.db_dir
+        )
+        self.assertEqual(sorted(tables), sorted(os.listdir(self.db_dir)))
+        self.assertEqual(
+            tables[0], rf_table_name(self.real_suite_robot_path))
+
     def test_add_xml_library(self):
         self.assertEqual(len(self.scanner.queue.queue), 0)
         self.scanner.add_xml_libraries(self.xml_libs)
@@ -333,6 +519,19 @@ class TestScanner(unittest.TestCase):
         self.scanner.queue.add('some.robot', None, [])
         self.scanner.queue.add('resource.robot', 'resource', [])
 
+    def read_db(self, db_dir):
+        tables = {}
+        for table in os.listdir(db_dir):
+            with open(os.path.join(db_dir, table)) as f:
+                tables[table] = json.load(f)
+        return tables
+
+    def table_mtimes(self, db_dir):
+        mtimes = {}
+        for table in os.listdir(db_dir):
+            mtimes[table] = os.stat(os.path.join(db_dir, table)).st_mtime_ns
+        return mtimes
+
     def f_name(self, data, db_dir):
         file_name = '{realname}-{md5}.json'.format(
             realname=os.path.basename(data['file_path']),
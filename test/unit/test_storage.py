@@ -0,0 +1,215 @@
+import unittest
+import env
+import os
+import shutil
+from data_queue.scanner import Scanner
+from index.index import Index
+from parser_utils.file_formatter import rf_table_name
+from parser_utils.util import get_index_name
+from storage.storage import get_storage, is_sqlite_path, is_ndjson_path
+from storage.json_storage import JsonStorage
+from storage.ndjson_storage import NdjsonStorage
+from storage.sqlite_storage import SqliteStorage
+from utils.util import get_data_from_json, get_index_data, index_exists
+from utils.util import find_keyword
+from workspace_objects import WorkSpaceObjects
+from run_index import find_importers
+from db_json_settings import DBJsonSetting
+
+
+class TestStorage(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.suite_dir = os.path.join(env.TEST_DATA_DIR, 'suite_tree')
+        cls.db_dir = os.path.join(env.RESULTS_DIR, 'storage_db_dir')
+        cls.index_dir = os.path.join(env.RESULTS_DIR, 'storage_index_dir')
+        cls.db_file = os.path.join(env.RESULTS_DIR, 'storage.sqlite')
+        cls.ndjson_file = os.path.join(env.RESULTS_DIR, 'storage.ndjson')
+        cls.ndjson_index_dir = os.path.join(
+            env.RESULTS_DIR, 'storage_ndjson_index_dir')
+        for path in (cls.db_dir, cls.index_dir, cls.ndjson_index_dir):
+            if os.path.exists(path):
+                shutil.rmtree(path)
+        for path in (cls.db_file, cls.ndjson_file,
+                     '{0}.offsets.json'.format(cls.ndjson_file)):
+            if os.path.exists(path):
+                os.remove(path)
+        scanner = Scanner()
+        scanner.scan(cls.suite_dir, 'robot', cls.db_dir)
+        scanner = Scanner()
+        scanner.scan(cls.suite_dir, 'robot', cls.db_file)
+        scanner = Scanner()
+        scanner.scan(cls.suite_dir, 'robot', cls.ndjson_file)
+
+    def test_get_storage(self):
+        self.assertTrue(is_sqlite_path(self.db_file))
+        self.assertFalse(is_sqlite_path(self.db_dir))
+        self.assertIsInstance(get_storage(self.db_dir), JsonStorage)
+        storage = get_storage(self.db_file)
+        self.assertIsInstance(storage, SqliteStorage)
+        storage.close()
+        self.assertTrue(is_ndjson_path(self.ndjson_file))
+        self.assertIsInstance(get_storage(self.ndjson_file), NdjsonStorage)
+
+    def test_tables_are_same(self):
+        json_storage = get_storage(self.db_dir)
+        sqlite_storage = get_storage(self.db_file)
+        try:
+            self.assertEqual(
+                sorted(sqlite_storage.table_names()),
+                sorted(json_storage.table_names()))
+            for table in json_storage.table_names():
+                self.assertEqual(
+                    sqlite_storage.read_table(table),
+                    json_storage.read_table(table))
+        finally:
+            sqlite_storage.close()
+        table = self.common_table_name
+        self.assertEqual(
+            get_data_from_json(os.path.join(self.db_file, table)),
+            get_data_from_json(os.path.join(self.db_dir, table)))
+
+    def test_ndjson_tables_are_same(self):
+        json_storage = get_storage(self.db_dir)
+        ndjson_storage = get_storage(self.ndjson_file)
+        try:
+            self.assertEqual(
+                sorted(ndjson_storage.table_names()),
+                sorted(json_storage.table_names()))
+            for table in json_storage.table_names():
+                self.assertEqual(
+                    ndjson_storage.read_table(table),
+                    json_storage.read_table(table))
+            self.assertEqual(
+                len(list(ndjson_storage.read_tables())),
+                len(json_storage.table_names()))
+        finally:
+            ndjson_storage.close()
+        table = self.common_table_name
+        self.assertEqual(
+            get_data_from_json(os.path.join(self.ndjson_file, table)),
+            get_data_from_json(os.path.join(self.db_dir, table)))
+        table = self.test_b_table_name
+        Index(self.ndjson_file, self.ndjson_index_dir).index_consturctor(
+            table)
+        self.assertTrue(index_exists(
+            os.path.join(self.ndjson_index_dir, get_index_name(table))))
+
+    def test_ndjson_storage(self):
+        ndjson_file = os.path.join(env.RESULTS_DIR, 'ndjson', 'tables.ndjson')
+        if os.path.exists(os.path.dirname(ndjson_file)):
+            shutil.rmtree(os.path.dirname(ndjson_file))
+        storage = NdjsonStorage(ndjson_file)
+        with storage.batch():
+            storage.write_table('a.json', {'name': 'a', 'version': 1})
+            storage.write_table('b.json', {'name': 'b'})
+            storage.write_table('a.json', {'name': 'a', 'version': 2})
+            self.assertEqual(storage.read_table('a.json')['version'], 2)
+        storage.remove_table('b.json')
+        storage.close()
+        os.remove('{0}.offsets.json'.format(ndjson_file))
+        storage = NdjsonStorage(ndjson_file)
+        self.assertEqual(storage.table_names(), ['a.json'])
+        self.assertEqual(storage.read_table('a.json')['version'], 2)
+        size = os.path.getsize(ndjson_file)
+        storage.compact()
+        self.assertLess(os.path.getsize(ndjson_file), size)
+        self.assertEqual(storage.read_table('a.json')['version'], 2)
+        storage.close()
+        storage = NdjsonStorage(ndjson_file)
+        self.assertEqual(storage.read_table('a.json')['version'], 2)
+        storage.clear_tables()
+        self.assertEqual(storage.table_names(), [])
+        self.assertFalse(os.path.exists(ndjson_file))
+
+    def test_find_keyword(self):
+        storage = get_storage(self.db_file)
+        try:
+            self.assertEqual(
+                storage.find_keyword('common_keyword 1'),
+                [self.common_table_name])
+            self.assertEqual(
+                storage.find_keyword(
+                    'Common Keyword 1',
+                    [self.test_b_table_name, self.common_table_name]),
+                [self.common_table_name])
+            self.assertEqual(
+                storage.find_keyword(
+                    'Common Keyword 1', [self.test_b_table_name]), [])
+            self.assertIn(
+                self.test_b_table_name,
+                storage.find_importers(self.common_table_name))
+        finally:
+            storage.close()
+
+    def test_index_is_same(self):
+        table = self.test_b_table_name
+        Index(self.db_dir, self.index_dir).index_consturctor(table)
+        Index(self.db_file, self.db_file).index_consturctor(table)
+        json_index = os.path.join(self.index_dir, get_index_name(table))
+        sqlite_index = os.path.join(self.db_file, get_index_name(table))
+        self.assertTrue(index_exists(sqlite_index))
+        self.assertFalse(index_exists(
+            os.path.join(self.db_file, get_index_name('not_there'))))
+        json_data = get_index_data(json_index)
+        sqlite_data = get_index_data(sqlite_index)
+        self.assertEqual(
+            sorted(sqlite_data['variables']), sorted(json_data['variables']))
+        self.assertEqual(
+            sorted(sqlite_data['keywords'], key=str),
+            sorted(json_data['keywords'], key=str))
+
+    def test_find_importers(self):
+        importers = find_importers(self.db_file, [self.common_table_name])
+        self.assertIn(self.common_table_name, importers)
+        self.assertIn(self.test_b_table_name, importers)
+
+    def test_find_keyword_from_index(self):
+        table = self.test_b_table_name
+        Index(self.db_dir, self.index_dir).index_consturctor(table)
+        Index(self.db_file, self.db_file).index_consturctor(table)
+        json_index = os.path.join(self.index_dir, get_index_name(table))
+        sqlite_index = os.path.join(self.db_file, get_index_name(table))
+        searches = [
+            (None, 'Common Keyword 1'),
+            ('common', 'common keyword 2'),
+            ('BuiltIn', 'Log'),
+            ('test_b', 'Common Keyword 1'),
+            (None, 'Not There')
+        ]
+        for object_name, keyword in searches:
+            self.assertEqual(
+                find_keyword(sqlite_index, object_name, keyword),
+                find_keyword(json_index, object_name, keyword),
+                (object_name, keyword))
+        self.assertEqual(
+            find_keyword(sqlite_index, 'common', 'common keyword 2')[3],
+            self.common_table_name)
+
+    def test_workspace_objects(self):
+        import_types = (
+            DBJsonSetting.library,
+            DBJsonSetting.resource_file,
+            DBJsonSetting.variable_file
+        )
+        for import_type in import_types:
+            json_imports = WorkSpaceObjects(self.db_dir).get_imports(
+                import_type)
+            self.assertTrue(json_imports, import_type)
+            self.assertEqual(
+                sorted(WorkSpaceObjects(self.db_file).get_imports(
+                    import_type)),
+                sorted(json_imports))
+
+    @property
+    def common_table_name(self):
+        return rf_table_name(
+            os.path.normpath(os.path.join(self.suite_dir, 'common.robot'))
+        )
+
+    @property
+    def test_b_table_name(self):
+        return rf_table_name(
+            os.path.normpath(os.path.join(self.suite_dir, 'test_b.robot'))
+        )
@@ -0,0 +1,47 @@
+import unittest
+import env
+from index.table_cache import TableCache, estimate_size
+
+
+class TestTableCache(unittest.TestCase):
+
+    def test_estimate_size(self):
+        self.assertEqual(estimate_size('abc'), 4)
+        self.assertEqual(estimate_size(['ab', ('c',)]), 7)
+        self.assertEqual(estimate_size({'a': None}), 4)
+
+    def test_least_recently_used_is_removed(self):
+        cache = TableCache(max_size=10)
+        cache['a'] = 'xxx'
+        cache['b'] = 'xxx'
+        self.assertEqual(cache['a'], 'xxx')
+        cache['c'] = 'xxx'
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(cache.size, 8)
+
+    def test_replace_and_delete(self):
+        cache = TableCache(max_size=10)
+        cache['a'] = 'xxx'
+        cache['a'] = 'x'
+        self.assertEqual(cache.size, 2)
+        del cache['a']
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.size, 0)
+
+    def test_too_big_value_is_not_cached(self):
+        cache = TableCache(max_size=10)
+        cache['a'] = 'x'
+        cache['b'] = 'x' * 10
+        self.assertNotIn('b', cache)
+        self.assertIn('a', cache)
+
+    def test_get_counts_hits_and_misses(self):
+        cache = TableCache()
+        self.assertIsNone(cache.get('a'))
+        cache['a'] = 'x'
+        self.assertEqual(cache.get('a'), 'x')
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.clear()
+        self.assertEqual((len(cache), cache.size), (0, 0))
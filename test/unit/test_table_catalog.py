@@ -0,0 +1,36 @@
+import unittest
+import env
+import os
+from index.table_catalog import TableCatalog, table_prefix
+
+
+class TestTableCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = TableCatalog([
+            'common-2.json',
+            'BuiltIn-1.json',
+            'common_keywords-3.json',
+            'common-1.json',
+            'test_a-4.json'
+        ])
+
+    def test_table_prefix(self):
+        self.assertEqual(table_prefix('common-1-2.json'), 'common')
+        self.assertEqual(
+            table_prefix(os.path.join('db', 'common-1.json')), 'common')
+
+    def test_builtin(self):
+        self.assertEqual(self.catalog.builtin, 'BuiltIn-1.json')
+        self.assertIsNone(TableCatalog(['common-1.json']).builtin)
+
+    def test_find_similar(self):
+        self.assertEqual(
+            self.catalog.find_similar(os.path.join('db', 'common-9.json')),
+            'common-2.json')
+        self.assertEqual(
+            self.catalog.find_similar('common_key-9.json'),
+            'common_keywords-3.json')
+        self.assertEqual(
+            self.catalog.find_similar('test-9.json'), 'test_a-4.json')
+        self.assertIsNone(self.catalog.find_similar('other-1.json'))
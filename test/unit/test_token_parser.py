@@ -0,0 +1,111 @@
+import unittest
+import env
+import os
+import shutil
+from robot.api.parsing import get_resource_model, get_init_model
+from parser_utils.rf4_parser import SampleVisitor, HeaderVisitor
+from parser_utils.token_parser import TokenExtractor, split_line
+
+ATTRIBUTES = (
+    'keywords',
+    'variables',
+    'libraries_import',
+    'resources_import',
+    'variables_import'
+)
+EDGE_CASES = """\
+Data before sections
+*** Settings ***
+Documentation    First line
+...    second line\\
+...    third    cell
+Documentation    Ignored
+Library    Collections
+Library    My.py    arg1    arg2    WITH NAME    Alias
+Library    Other    with name    x
+Library    WITH NAME    Name
+Library
+Resource    one.robot
+Resource    two.robot    three.robot
+Variables    vars.py    a    b
+| Library | Pipe | a |
+*** Variables ***
+${A}    1
+@{B}=    1    2
+...    3
+*** Test Cases ***
+Test
+    [Tags]    not    used
+    Log    1
+*** Keywords ***
+    Indented
+Kw One
+    [Arguments]    ${a}    ${b}=2
+    [Documentation]    doc    # comment
+    ...    more\\\\
+    ...    end\\n
+    ...
+    [Documentation]    ignored
+    No Operation
+Kw Two    [Tags]    t
+    Log    x
+    ...    y
+Kw Three
+...    [Documentation]    part of the name
+| Pipe Kw | [Documentation] | piped doc |
+|         | Log | x |
+| Pipe Kw 2 |  | [Tags] | not a setting |
+*** Comments ***
+Not Kw
+*** keyword ***
+Kw   Four
+\t[tags ]\ttab
+"""
+
+
+class TestTokenParser(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = os.path.join(env.RESULTS_DIR, 'token_parser')
+        if os.path.exists(self.data_dir):
+            shutil.rmtree(self.data_dir)
+        os.makedirs(self.data_dir)
+
+    def assert_same_as_model(self, file_path):
+        if '__init__.' in file_path:
+            get_model = get_init_model
+        else:
+            get_model = get_resource_model
+        for details in (True, False):
+            visitor = SampleVisitor() if details else HeaderVisitor()
+            visitor.visit(get_model(file_path, data_only=not details))
+            extractor = TokenExtractor(details).extract(file_path)
+            for attribute in ATTRIBUTES:
+                self.assertEqual(
+                    getattr(extractor, attribute),
+                    getattr(visitor, attribute),
+                    '{0} differs in {1}'.format(attribute, file_path))
+
+    def test_test_data(self):
+        files = []
+        for folder, dirs, file_names in os.walk(env.TEST_DATA_DIR):
+            for file_name in file_names:
+                if file_name.endswith(TokenExtractor.extensions):
+                    files.append(os.path.join(folder, file_name))
+        self.assertTrue(files)
+        for file_path in files:
+            self.assert_same_as_model(file_path)
+
+    def test_edge_cases(self):
+        for file_name in ('edge.robot', 'edge.resource', '__init__.robot'):
+            file_path = os.path.join(self.data_dir, file_name)
+            with open(file_path, 'w') as f:
+                f.write(EDGE_CASES)
+            self.assert_same_as_model(file_path)
+
+    def test_split_line(self):
+        self.assertEqual(split_line('a    b\tc  # d'), ['a', 'b', 'c'])
+        self.assertEqual(split_line('    a    '), ['', 'a'])
+        self.assertEqual(split_line('| a | b |  |'), ['a', 'b'])
+        self.assertEqual(split_line('|   | a |'), ['', 'a'])
+        self.assertEqual(split_line('|a | b'), ['|a | b'])
@@ -1,5 +1,7 @@
 import unittest
 from utils.util import kw_equals_kw_candite
+from parser_utils.util import get_keyword_lookup, get_keyword_key
+from utils.keyword_matcher import KeywordMatcher
 
 
 class TestUtil(unittest.TestCase):
@@ -30,3 +32,48 @@ class TestUtil(unittest.TestCase):
         kw1 = 'embedding_arg_to_keyword_name'
         kw2 = 'Embedding ${arg} To Keyword Name'
         self.assertTrue(kw_equals_kw_candite(kw1, kw2))
+
+    def test_get_keyword_lookup(self):
+        keywords = [
+            ['My Keyword', [], 'Lib', 'lib-table', 'Alias'],
+            ['Embedded ${arg}', [], 'Lib', 'lib-table', 'Alias'],
+            ['my_keyword', [], 'resource', 'resource-table', None],
+            ['Other', [], 'resource', 'resource-table', None]
+        ]
+        self.assertEqual(
+            get_keyword_lookup(keywords),
+            {
+                '': {'mykeyword': 0, 'other': 3},
+                'Lib': {'mykeyword': 0},
+                'Alias': {'mykeyword': 0},
+                'resource': {'mykeyword': 2, 'other': 3}
+            }
+        )
+        lookup = get_keyword_lookup(keywords[2:], offset=5)
+        self.assertEqual(lookup['resource'], {'mykeyword': 5, 'other': 6})
+        self.assertEqual(get_keyword_key('My Keyword'), 'my_keyword')
+
+    def test_keyword_matcher(self):
+        names = [
+            'My Long Keyword',
+            'Embedding ${arg} To Keyword Name',
+            '.my_LONG_keyword',
+            'Other ${a} And ${b}',
+            'Not Same'
+        ]
+        matcher = KeywordMatcher(names)
+        self.assertEqual(matcher.find('MY_LONG keyword'), [0, 2])
+        self.assertEqual(
+            matcher.find('EMBEDDING_ARG_TO_KEYWORD_NAME'), [1])
+        self.assertEqual(matcher.find('Other 1 And 2'), [3])
+        self.assertEqual(matcher.find('Not There'), [])
+        self.assertEqual(matcher.find_first('not same'), 'Not Same')
+        self.assertEqual(matcher.find_first('Not There'), None)
+        for name in names:
+            for keyword in ['My Long Keyword', 'Embedding 1 To Keyword Name',
+                            'Other x And y', 'not_same']:
+                self.assertEqual(
+                    bool(kw_equals_kw_candite(keyword, name)),
+                    names.index(name) in matcher.find(keyword),
+                    (keyword, name)
+                )
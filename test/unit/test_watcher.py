@@ -0,0 +1,83 @@
+import unittest
+import env
+import os
+import sys
+import shutil
+import threading
+from data_queue.watcher import PollingWatcher, InotifyWatcher
+from parser_utils.file_formatter import rf_table_name
+from parser_utils.util import get_index_name
+from run_scanner import watch
+
+
+class FakeWatcher(object):
+
+    def __init__(self, changes, stop):
+        self.changes = list(changes)
+        self.stop = stop
+        self.closed = False
+
+    def wait(self, timeout=None):
+        if self.changes:
+            return self.changes.pop(0)
+        self.stop.set()
+        return set()
+
+    def close(self):
+        self.closed = True
+
+
+class TestWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.workspace = os.path.join(env.RESULTS_DIR, 'watcher', 'workspace')
+        self.db_dir = os.path.join(env.RESULTS_DIR, 'watcher', 'db_dir')
+        self.index_dir = os.path.join(env.RESULTS_DIR, 'watcher', 'index_dir')
+        if os.path.exists(os.path.dirname(self.workspace)):
+            shutil.rmtree(os.path.dirname(self.workspace))
+        os.makedirs(self.workspace)
+
+    def write(self, *parts):
+        file_path = os.path.join(self.workspace, *parts)
+        if not os.path.exists(os.path.dirname(file_path)):
+            os.makedirs(os.path.dirname(file_path))
+        with open(file_path, 'a') as f:
+            f.write('*** Keywords ***\nMy Keyword\n    Log    1\n')
+        return file_path
+
+    def assert_changes(self, watcher):
+        self.assertEqual(watcher.wait(0), set())
+        robot = self.write('a.robot')
+        self.write('a.txt')
+        self.assertEqual(watcher.wait(2), set([robot]))
+        robot = self.write('folder', 'b.robot')
+        self.assertEqual(watcher.wait(2), set([robot]))
+        os.remove(robot)
+        self.assertEqual(watcher.wait(2), set([robot]))
+
+    def test_polling_watcher(self):
+        watcher = PollingWatcher([(self.workspace, ['robot'])], 0.05)
+        self.assert_changes(watcher)
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'Needs inotify')
+    def test_inotify_watcher(self):
+        watcher = InotifyWatcher([(self.workspace, ['robot'])])
+        try:
+            self.assert_changes(watcher)
+        finally:
+            watcher.close()
+
+    def test_watch(self):
+        shutil.rmtree(self.workspace)
+        shutil.copytree(
+            os.path.join(env.TEST_DATA_DIR, 'suite_tree'), self.workspace)
+        resource_a = os.path.join(self.workspace, 'resource_a.robot')
+        stop = threading.Event()
+        watcher = FakeWatcher([set([resource_a])], stop)
+        watch(
+            self.workspace, 'robot', self.db_dir, [], None, None,
+            index_path=self.index_dir, watcher=watcher, stop=stop)
+        self.assertTrue(watcher.closed)
+        table = rf_table_name(resource_a)
+        self.assertIn(table, os.listdir(self.db_dir))
+        self.assertIn(get_index_name(table), os.listdir(self.index_dir))
@@ -0,0 +1,132 @@
+import unittest
+import env
+import os
+import sys
+import json
+import shutil
+from io import StringIO
+from data_queue.scanner import Scanner
+from index import index
+from index.import_graph import ImportGraph
+from run_index import load_import_graph, update_import_graph
+from run_scanner import get_scanner
+from run_worker import Worker, METHOD_NOT_FOUND, INVALID_PARAMS
+from worker_client import WorkerClient
+from parser_utils.file_formatter import rf_table_name
+from parser_utils.util import get_index_name, get_import_graph_path
+
+
+class TestWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.db_dir = os.path.join(env.RESULTS_DIR, 'worker_db_dir')
+        self.index_dir = os.path.join(env.RESULTS_DIR, 'worker_index_dir')
+        for folder in (self.db_dir, self.index_dir):
+            if os.path.exists(folder):
+                shutil.rmtree(folder)
+        self.test_a = os.path.normpath(
+            os.path.join(env.TEST_DATA_DIR, 'suite_tree', 'test_a.robot'))
+
+    def test_handle(self):
+        worker = Worker(None, None)
+        response = worker.handle(
+            '{"jsonrpc": "2.0", "id": 1, "method": "ping"}')
+        self.assertEqual(
+            response, {'jsonrpc': '2.0', 'id': 1, 'result': 'pong'})
+        response = worker.handle('{"jsonrpc": "2.0", "method": "ping"}')
+        self.assertEqual(response, None)
+        response = worker.handle(
+            '{"jsonrpc": "2.0", "id": 2, "method": "not_there"}')
+        self.assertEqual(response['error']['code'], METHOD_NOT_FOUND)
+        response = worker.handle(json.dumps({
+            'jsonrpc': '2.0',
+            'id': 3,
+            'method': 'scan_single',
+            'params': {'not_there': 1}
+        }))
+        self.assertEqual(response['error']['code'], INVALID_PARAMS)
+
+    def test_serve(self):
+        requests = StringIO(
+            '{"jsonrpc": "2.0", "id": 1, "method": "ping"}\n'
+            '{"jsonrpc": "2.0", "id": 2, "method": "shutdown"}\n'
+            '{"jsonrpc": "2.0", "id": 3, "method": "ping"}\n'
+        )
+        responses = StringIO()
+        Worker(requests, responses).serve()
+        ids = [
+            json.loads(line)['id']
+            for line in responses.getvalue().splitlines()
+        ]
+        self.assertEqual(ids, [1, 2])
+
+    def test_index_is_released_after_job(self):
+        Scanner().scan_single_file(self.test_a, self.db_dir)
+        worker = Worker(None, None)
+        worker.run_job(index.index_a_table, {'params': (
+            self.db_dir, rf_table_name(self.test_a), self.index_dir, None)})
+        self.assertIsNone(index._WORKER_INDEX)
+
+    def test_parser_is_kept_between_jobs(self):
+        path_file = os.path.join(env.RESULTS_DIR, 'worker_path_file.robot')
+        with open(path_file, 'w') as f:
+            f.write('*** Variables ***\n${A}    a\n')
+        parser = get_scanner(path_file, None, None).parser
+        self.assertIs(get_scanner(path_file, None, None).parser, parser)
+        self.assertIsNot(get_scanner(None, None, None).parser, parser)
+        with open(path_file, 'a') as f:
+            f.write('${B}    b\n')
+        self.assertIsNot(get_scanner(path_file, None, None).parser, parser)
+
+    def test_import_graph_is_kept_between_jobs(self):
+        graph_path = get_import_graph_path(self.index_dir)
+        if os.path.exists(graph_path):
+            os.remove(graph_path)
+        self.assertIsNone(load_import_graph(self.index_dir))
+        graph = ImportGraph(graph_path)
+        update_import_graph(graph, [({'a': ['b']}, [])])
+        self.assertIs(load_import_graph(self.index_dir), graph)
+        update_import_graph(graph, [])
+        with open(graph_path, 'w') as f:
+            json.dump({'imports': {'a': ['c']}}, f)
+        loaded = load_import_graph(self.index_dir)
+        self.assertIsNot(loaded, graph)
+        self.assertEqual(loaded.imports, {'a': {'c'}})
+
+    def test_worker_client(self):
+        client = WorkerClient(
+            sys.executable,
+            os.path.join(env.SRC_DIR, 'run_worker.py'),
+            os.path.join(env.RESULTS_DIR, 'worker.log')
+        )
+        try:
+            self.assertEqual(client.call('ping'), 'pong')
+            pid = client.process.pid
+            client.call(
+                'scan_single',
+                file_path=self.test_a,
+                db_path=self.db_dir,
+                libs_in_xml=None,
+                path_file=None,
+                module_search_path=[]
+            )
+            table = rf_table_name(self.test_a)
+            self.assertTrue(
+                os.path.isfile(os.path.join(self.db_dir, table)))
+            client.call(
+                'index_single',
+                db_path=self.db_dir,
+                db_table=table,
+                index_path=self.index_dir,
+                module_search_path=[],
+                libs_in_xml=None
+            )
+            self.assertTrue(os.path.isfile(
+                os.path.join(self.index_dir, get_index_name(table))))
+            self.assertEqual(client.process.pid, pid)
+            with self.assertRaises(ValueError):
+                client.call('not_there')
+            self.assertEqual(client.call('ping'), 'pong')
+        finally:
+            client.stop()
+        self.assertFalse(client.is_running())